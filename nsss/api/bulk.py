@@ -1,11 +1,14 @@
-import json
+import logging
+from collections import deque
 from collections.abc import (
     Callable,
     Hashable,
+    Iterable,
     Iterator,
     Mapping,
     Sequence,
 )
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import (
     Any,
     Literal,
@@ -16,11 +19,36 @@ from typing import (
 
 from httpx import Client
 
-from nsss.utils import CallableSF, JsonType, Proxies, SFOperation, to_url_mount
+from nsss.utils import (
+    CallableSF,
+    JsonType,
+    LazyResponse,
+    Proxies,
+    SFOperation,
+    iter_json_array,
+    json_dumps,
+    to_mount,
+)
+from nsss.utils.base import DEFAULT_LIMITS, DEFAULT_TIMEOUT
 
 K = TypeVar("K", bound=Hashable)
 V = TypeVar("V", bound=Any)
 
+DEFAULT_RESULT_CONCURRENCY = 8
+
+# Endpoint templates, bound once so polling loops skip re-parsing them
+_EP_JOB = "job/{}".format
+_EP_BATCH = "job/{}/batch".format
+_EP_BATCH_ID = "job/{}/batch/{}".format
+_EP_RESULT = "job/{}/batch/{}/result".format
+
+_CLOSE_BODY = b'{"state":"Closed"}'
+
+# Operations whose batch body is a raw SOQL string and whose results are paginated
+_QUERY_OPS = frozenset(("query", "queryAll"))
+
+logger = logging.getLogger(__name__)
+
 
 class BulkSFHandler:
     """Bulk API handler for Salesforce
@@ -34,6 +62,7 @@ class BulkSFHandler:
         bulk_url: str,
         proxies: Proxies | None = None,
         session: Client | None = None,
+        on_write: Callable[[], None] | None = None,
     ):
         """
         Initialize the instance with the given parameters
@@ -44,8 +73,29 @@ class BulkSFHandler:
             * proxies: The optional map of scheme to proxy server
             * session: Custom httpx.Client instance to use for requests.
                 This enables the use of httpx features not otherwise exposed by the library.
+                It is used as is, so `proxies` must already be mounted on it.
+            * on_write: Called whenever records are submitted for a write,\
+                e.g. to drop cached query results
+
+        NOTE: The default client keeps HTTP/2 connections alive between calls,
+            reuse the handler for as long as possible to amortize the handshakes.
         """
-        self.client = session or Client(follow_redirects=True)
+        if session is not None and proxies:
+            logger.warning(
+                "Ignoring proxies as a session was provided, mount them on the session instead."
+            )
+        self._owns_session = session is None
+        self.client = session or Client(
+            http2=True,
+            follow_redirects=True,
+            limits=DEFAULT_LIMITS,
+            timeout=DEFAULT_TIMEOUT,
+            mounts=(
+                to_mount(proxies, http2=True, limits=DEFAULT_LIMITS)
+                if proxies
+                else None
+            ),
+        )
         self.client.headers.update(
             {
                 "Content-Type": "application/json",
@@ -53,30 +103,53 @@ class BulkSFHandler:
                 "X-PrettyPrint": "1",
             }
         )
-        if proxies:
-            _proxies = to_url_mount(proxies)
-            self.client._mounts.update(  # pyright: ignore[reportPrivateUsage]
-                {
-                    key: _proxies[key]
-                    for key in (_proxies.keys() - self.client._mounts.keys())  # pyright: ignore[reportPrivateUsage]
-                }
-            )
 
         self.client.base_url = self.client.base_url or bulk_url
+        self._types: dict[str, BulkSFType] = {}
+        self._on_write = on_write
+
+    def close(self) -> None:
+        """Close the client created by the handler and release its pooled connections"""
+        if self._owns_session:
+            self.client.close()
+
+    def __enter__(self) -> "BulkSFHandler":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
 
     def __getattr__(self, name: str) -> "BulkSFType":
-        return BulkSFType(self.client, object_name=name)
+        if name.startswith("_"):
+            # Private and dunder lookups (copy, pickle, ...) are never SObjects
+            raise AttributeError(name)
+
+        type_ = self._types.get(name)
+        if type_ is None:
+            type_ = self._types[name] = BulkSFType(
+                self.client, object_name=name, on_write=self._on_write
+            )
+        return type_
 
 
 class BulkSFType(CallableSF):
     """Interface to Bulk/Async API functions for Salesforce"""
 
+    __slots__ = (
+        "object_name",
+        "client",
+        "parse_float",
+        "object_pairs_hook",
+        "on_write",
+    )
+
     def __init__(
         self,
         client: Client,
         object_name: str,
         parse_float: Callable[[str], Any] | None = None,
-        object_pairs_hook: Callable[[Sequence[tuple[K, V]]], Mapping[K, V]] = dict[K, V],
+        object_pairs_hook: Callable[[Sequence[tuple[K, V]]], Mapping[K, V]] | None = None,
+        on_write: Callable[[], None] | None = None,
     ) -> None:  # fmt:skip
         """
         Builds the instance with the client data
@@ -87,9 +160,14 @@ class BulkSFType(CallableSF):
         Arguments:
             * client: The httpx.Client instance to use for requests
             * object_name: The name of the object to interact with
+            * parse_float: Function to parse float values with
+            * object_pairs_hook: Function to parse ordered list of pairs in json.\
+                Leave unset to build plain dicts on the fast path
+            * on_write: Called whenever a batch of records is submitted for a write
         """
         self.object_name = object_name
         self.client = client
+        self.on_write = on_write
 
         self.parse_float = parse_float
         self.object_pairs_hook = object_pairs_hook  # type: ignore
@@ -100,7 +178,7 @@ class BulkSFType(CallableSF):
         operation: Literal["upsert"],
         use_serial: bool,
         external_id_field: str,
-    ) -> JsonType:
+    ) -> LazyResponse:
         """
         Create a new job to upsert records
         ---
@@ -117,7 +195,7 @@ class BulkSFType(CallableSF):
         operation: Literal["delete", "hardDelete", "insert", "query", "queryAll", "update"],
         use_serial: bool,
         external_id_field: None = None,
-    ) -> JsonType:  # fmt:skip
+    ) -> LazyResponse:  # fmt:skip
         """
         Create a new job to perform the given operation
         ---
@@ -133,7 +211,7 @@ class BulkSFType(CallableSF):
         operation: SFOperation,
         use_serial: bool,
         external_id_field: str | None = None,
-    ) -> JsonType:
+    ) -> LazyResponse:
         """
         Create a new job to perform the given operation
         ---
@@ -147,23 +225,19 @@ class BulkSFType(CallableSF):
         payload: dict[str, str | bool | None] = {
             "operation": operation,
             "object": self.object_name,
-            "concurrencyMode": bool(use_serial),
+            "concurrencyMode": "Serial" if use_serial else "Parallel",
             "contentType": "JSON",
         }
 
         if operation == "upsert":
             payload["externalIdFieldName"] = external_id_field
 
-        return (
-            self.call_salesforce(
-                method="POST", endpoint="job", data=json.dumps(payload, allow_nan=False)
-            )
-        ).json(
-            object_pairs_hook=self.object_pairs_hook,
-            parse_float=self.parse_float,
+        response = self.call_salesforce(
+            method="POST", endpoint="job", content=json_dumps(payload)
         )
+        return LazyResponse(response.content, self.parse_float, self.object_pairs_hook)
 
-    def _close_job(self, job_id: str) -> JsonType:
+    def _close_job(self, job_id: str) -> LazyResponse:
         """
         Close the bulk job with the given ID
         ---
@@ -172,18 +246,14 @@ class BulkSFType(CallableSF):
             * job_id: The ID of the job to close
         """
 
-        return (
-            self.call_salesforce(
-                method="POST",
-                endpoint=f"job/{job_id}",
-                data=json.dumps({"state": "Closed"}),
-            )
-        ).json(
-            object_pairs_hook=self.object_pairs_hook,
-            parse_float=self.parse_float,
+        response = self.call_salesforce(
+            method="POST",
+            endpoint=_EP_JOB(job_id),
+            content=_CLOSE_BODY,
         )
+        return LazyResponse(response.content, self.parse_float, self.object_pairs_hook)
 
-    def _get_job(self, job_id: str) -> JsonType:
+    def _get_job(self, job_id: str) -> LazyResponse:
         """
         Get the bulk job with the given ID
         ---
@@ -192,18 +262,39 @@ class BulkSFType(CallableSF):
             * job_id: The ID of the job to get
         """
 
-        return (
-            self.call_salesforce(
-                method="GET",
-                endpoint=f"job/{job_id}",
-            )
-        ).json(
-            object_pairs_hook=self.object_pairs_hook,
-            parse_float=self.parse_float,
+        response = self.call_salesforce(
+            method="GET",
+            endpoint=_EP_JOB(job_id),
         )
+        return LazyResponse(response.content, self.parse_float, self.object_pairs_hook)
+
+    def get_jobs(
+        self, job_ids: Iterable[str], concurrency: int = DEFAULT_RESULT_CONCURRENCY
+    ) -> list[LazyResponse]:
+        """
+        Get several bulk jobs at once
+        ---
+
+        Arguments:
+            * job_ids: The IDs of the jobs to get
+            * concurrency: The maximum number of jobs fetched at once
+
+        NOTE: The jobs are returned in the same order as `job_ids`
+        """
+
+        job_ids_ = list(job_ids)
+        if len(job_ids_) <= 1:
+            return [self._get_job(job_id) for job_id in job_ids_]
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(concurrency, len(job_ids_)))
+        ) as pool:
+            return list(pool.map(self._get_job, job_ids_))
 
     def _add_batch(
-        self, job_id: str, data: list[Mapping[str, Any]], operation: SFOperation
+        self,
+        job_id: str,
+        data: list[Mapping[str, Any]] | bytes | str,
+        operation: SFOperation,
     ):
         """
         Add a set of data as a batch to an existing job.
@@ -211,30 +302,29 @@ class BulkSFType(CallableSF):
 
         Arguments:
             * job_id: The ID of the job to add the batch to (required)
-            * data: The data to add as a batch
+            * data: The data to add as a batch.\
+                Already serialized JSON (bytes or str) is sent as is
             * operation: The operation to perform on the batch
 
         NOTE: Separating this out in case of later implementations involving multiple batches
         """
 
         data_ = (
-            json.dumps(data, allow_nan=False)
-            if operation not in ("query", "queryAll")
-            else data
+            data
+            if isinstance(data, (bytes, str)) or operation in _QUERY_OPS
+            else json_dumps(data)
         )
 
-        return (
-            self.call_salesforce(
-                method="POST",
-                endpoint=f"job/{job_id}/batch",
-                data=data_,
-            )
-        ).json(
-            object_pairs_hook=self.object_pairs_hook,
-            parse_float=self.parse_float,
+        batch = self.call_salesforce_json(
+            method="POST",
+            endpoint=_EP_BATCH(job_id),
+            content=data_,
         )
+        if self.on_write is not None and operation not in _QUERY_OPS:
+            self.on_write()
+        return batch
 
-    def _get_batch(self, job_id: str, batch_id: str) -> JsonType:
+    def _get_batch(self, job_id: str, batch_id: str) -> LazyResponse:
         """
         Get the batch with the given ID from the job with the given ID
         ---
@@ -244,27 +334,42 @@ class BulkSFType(CallableSF):
             * batch_id: The ID of the batch to get
         """
 
-        return (
-            self.call_salesforce(
-                method="GET",
-                endpoint=f"job/{job_id}/batch/{batch_id}",
-            )
-        ).json(
-            object_pairs_hook=self.object_pairs_hook,
-            parse_float=self.parse_float,
+        response = self.call_salesforce(
+            method="GET",
+            endpoint=_EP_BATCH_ID(job_id, batch_id),
         )
+        return LazyResponse(response.content, self.parse_float, self.object_pairs_hook)
 
-    def _get_batch_results(
-        self, job_id: str, batch_id: str, operation: SFOperation
-    ) -> Iterator[JsonType]:
+    def get_batches(
+        self,
+        pairs: Iterable[tuple[str, str]],
+        concurrency: int = DEFAULT_RESULT_CONCURRENCY,
+    ) -> list[LazyResponse]:
         """
-        Retrieve a set of results from a completed job
-        Wrapper for the async method `__get_batch_results(...)`
+        Get several batches at once
+        ---
+
+        Arguments:
+            * pairs: The (job ID, batch ID) pairs of the batches to get
+            * concurrency: The maximum number of batches fetched at once
+
+        NOTE: The batches are returned in the same order as `pairs`
         """
-        return self.__get_batch_results(job_id, batch_id, operation)  # type: ignore
 
-    def __get_batch_results(
-        self, job_id: str, batch_id: str, operation: SFOperation
+        pairs_ = list(pairs)
+        if len(pairs_) <= 1:
+            return [self._get_batch(*pair) for pair in pairs_]
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(concurrency, len(pairs_)))
+        ) as pool:
+            return list(pool.map(self._get_batch, *zip(*pairs_)))
+
+    def get_batch_results(
+        self,
+        job_id: str,
+        batch_id: str,
+        operation: SFOperation,
+        concurrency: int = DEFAULT_RESULT_CONCURRENCY,
     ) -> Iterator[JsonType]:
         """
         Retrieve a set of results from a completed job
@@ -273,29 +378,78 @@ class BulkSFType(CallableSF):
             * job_id: The ID of the job to get the results from
             * batch_id: The ID of the batch to get the results from
             * operation: The operation to perform on the batch
+            * concurrency: The maximum number of query result sets fetched at once
+
+        NOTE: Query result sets are fetched ahead in parallel but yielded in order
         """
 
-        endpoint = f"job/{job_id}/batch/{batch_id}/result"
+        endpoint = _EP_RESULT(job_id, batch_id)
 
-        response = self.call_salesforce(
+        result = self.call_salesforce_json(
             method="GET",
             endpoint=endpoint,
         )
-        result = response.json(
-            object_pairs_hook=self.object_pairs_hook,
-            parse_float=self.parse_float,
-        )
 
-        if operation not in ("query", "queryAll"):
+        if operation not in _QUERY_OPS:
             yield cast(JsonType, result)
-        else:
-            for batch in cast(Iterator[str], result):
-                batch_query_response = self.call_salesforce(
-                    method="GET",
-                    endpoint=f"{endpoint}/{batch}",
+            return
+
+        batches = cast(list[str], result)
+        workers = max(1, min(concurrency, len(batches)))
+        pool = ThreadPoolExecutor(max_workers=workers)
+        pending: deque[Future[JsonType]] = deque()
+        try:
+            for batch in batches:
+                pending.append(
+                    pool.submit(self._get_batch_result, f"{endpoint}/{batch}")
                 )
-                batch_query_result = batch_query_response.json(
-                    object_pairs_hook=self.object_pairs_hook,
-                    parse_float=self.parse_float,
+                if len(pending) >= workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def stream_batch_results(
+        self, job_id: str, batch_id: str, operation: SFOperation
+    ) -> Iterator[JsonType]:
+        """
+        Retrieve the results from a completed job one record at a time
+        ---
+        Arguments:
+            * job_id: The ID of the job to get the results from
+            * batch_id: The ID of the batch to get the results from
+            * operation: The operation to perform on the batch
+
+        NOTE: Unlike `get_batch_results(...)` the result sets are never loaded\
+            in full, keeping memory usage independent of their size
+        """
+
+        endpoint = _EP_RESULT(job_id, batch_id)
+        endpoints = (
+            [
+                f"{endpoint}/{batch}"
+                for batch in cast(list[str], self._get_batch_result(endpoint))
+            ]
+            if operation in _QUERY_OPS
+            else [endpoint]
+        )
+
+        for endpoint_ in endpoints:
+            with self.stream_salesforce(method="GET", endpoint=endpoint_) as response:
+                yield from iter_json_array(
+                    response.iter_bytes(), self.parse_float, self.object_pairs_hook
                 )
-                yield batch_query_result
+
+    def _get_batch_result(self, endpoint: str) -> JsonType:
+        """
+        Retrieve a single query result set
+        ---
+        Arguments:
+            * endpoint: The endpoint of the result set to get
+        """
+
+        return self.call_salesforce_json(
+            method="GET",
+            endpoint=endpoint,
+        )
@@ -1,6 +1,17 @@
-from concurrent.futures import ThreadPoolExecutor
-from functools import partial
-import json
+import logging
+import mmap
+import os
+import zlib
+from random import uniform
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait as wait_futures,
+)
+from contextlib import nullcontext
+from functools import lru_cache, partial
+from queue import Queue
 from collections.abc import (
     Callable,
     Hashable,
@@ -10,10 +21,13 @@ from collections.abc import (
 )
 
 import re
+from threading import Event, Lock, Thread
+from time import monotonic, sleep
 from typing import (
     Any,
     AnyStr,
     Literal,
+    NamedTuple,
     NotRequired,
     TypeVar,
     TypedDict,
@@ -21,31 +35,86 @@ from typing import (
     overload,
 )
 
-from httpx import Client, Headers
+from httpx import Client, Headers, HTTPTransport, Timeout
 from more_itertools import chunked
+from starlette.status import (
+    HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+    HTTP_429_TOO_MANY_REQUESTS,
+)
 
 from nsss.utils import (
     CallableSF,
-    JsonType,
     Proxies,
     SFOperation,
-    to_url_mount,
+    json_dumps,
+    to_mount,
     LineEnding,
 )
-from nsss.utils.base import ColumnDelimiter, JobState
+from nsss.utils.base import DEFAULT_LIMITS, ColumnDelimiter, JobState
 from nsss.utils.exceptions import (
     SalesforceBulkV2ExtractError,
     SalesforceBulkV2LoadError,
+    SalesforceError,
+    SalesforceGeneralError,
     SalesforceOperationError,
 )
 
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+except ImportError:  # pragma: no cover - optional speedup
+    pa = None
+
+logger = logging.getLogger(__name__)
+
 K = TypeVar("K", bound=Hashable)
 V = TypeVar("V", bound=Any)
 
-DEFAULT_WAIT_TIMEOUT_SECONDS = 24 * 60 * 60  # 24 hours
-MAX_CHECK_INTERVAL_SECONDS = 2  # 2 seconds
+
+def _env_seconds(name: str, default: float) -> float:
+    """A positive number of seconds read from the environment variable `name`.
+    Malformed values are logged and replaced by `default`, so they never break the import
+    """
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    try:
+        seconds = float(value)
+    except ValueError:
+        seconds = 0.0
+    if not seconds > 0:
+        logger.warning("Ignoring %s=%r, using %s seconds", name, value, default)
+        return default
+    return seconds
+
+
+DEFAULT_WAIT_TIMEOUT_SECONDS = _env_seconds(
+    "SF_BULK2_TIMEOUT", 24 * 60 * 60
+)  # 24 hours
+MAX_CHECK_INTERVAL_SECONDS = _env_seconds("SF_BULK2_POLL_INTERVAL_MAX", 2)  # 2 seconds
+MIN_CHECK_INTERVAL_SECONDS = 0.1
+_FAILED_JOB_STATES: frozenset[JobState] = frozenset(("Failed", "Aborted"))
 JSON_CONTENT_TYPE = "application/json"
 CSV_CONTENT_TYPE = "text/csv; charset=UTF-8"
+# Built once for every request/response content type pair, see `_get_headers`
+_HEADERS = {
+    (request_ct, response_ct): Headers(
+        {"Content-Type": request_ct, "Accept": response_ct}
+    )
+    for request_ct in (JSON_CONTENT_TYPE, CSV_CONTENT_TYPE)
+    for response_ct in (JSON_CONTENT_TYPE, CSV_CONTENT_TYPE)
+}
+# Level 1 keeps compression well ahead of the upload bandwidth
+_GZIP_CSV_HEADERS = Headers(
+    {
+        "Content-Type": CSV_CONTENT_TYPE,
+        "Accept": JSON_CONTENT_TYPE,
+        "Content-Encoding": "gzip",
+    }
+)
+# Job state changes, encoded once
+_UPLOAD_COMPLETE_BODY = b'{"state":"UploadComplete"}'
+_ABORTED_BODY = b'{"state":"Aborted"}'
 
 # https://developer.salesforce.com/docs/atlas.en-us.242.0
 # .salesforce_app_limits_cheatsheet.meta/salesforce_app_limits_cheatsheet
@@ -55,6 +124,17 @@ CSV_CONTENT_TYPE = "text/csv; charset=UTF-8"
 MAX_INGEST_JOB_FILE_SIZE = 100 * 1024 * 1024  # 100 MiB
 MAX_INGEST_JOB_PARALLELISM = 10  # TODO: ? Salesforce limits
 DEFAULT_QUERY_PAGE_SIZE = 50000
+_COUNT_CHUNK_SIZE = 1024 * 1024  # 1 MiB
+_DOWNLOAD_CHUNK_SIZE = 64 * 1024  # 64 KiB
+_UPLOAD_CHUNK_SIZE = 64 * 1024  # 64 KiB
+_CSV_CTRL_RE = re.compile(rb'(")|\n')
+# Query result pages can take a while to be produced server side
+DEFAULT_BULK2_TIMEOUT = Timeout(30.0, connect=10.0, read=120.0)
+DEFAULT_CONNECT_RETRIES = 3
+# Requests refused for exceeding the org's API limits are retried with backoff
+DEFAULT_RATE_LIMIT_ATTEMPTS = 3
+_RATE_LIMIT_MARKERS = (b"REQUEST_LIMIT_EXCEEDED", b"rate limit")
+ARROW_CSV_MIN_RECORDS = 1024  # below this, pyarrow setup outweighs DictWriter
 
 _delimiter_char = {
     ColumnDelimiter.BACKQUOTE: "`",
@@ -70,6 +150,119 @@ _line_ending_char = {
 }
 
 
+class _CsvFormat(NamedTuple):
+    delimiter: str
+    eol: str
+
+
+@lru_cache(maxsize=16)
+def _csv_format(
+    column_delimiter: ColumnDelimiter, line_ending: LineEnding
+) -> _CsvFormat:
+    """Resolve the CSV dialect characters once per delimiter and line ending pair"""
+    return _CsvFormat(_delimiter_char[column_delimiter], _line_ending_char[line_ending])
+
+
+@lru_cache(maxsize=64)
+def _ingest_job_body(
+    object_name: str,
+    operation: SFOperation,
+    column_delimiter: ColumnDelimiter,
+    line_ending: LineEnding,
+    external_id_field: str | None,
+) -> bytes:
+    """Serialized ingest job definition, shared by every chunk of an upload"""
+    payload: dict[str, Any] = {
+        "object": object_name,
+        "contentType": "CSV",
+        "operation": operation,
+        "columnDelimiter": column_delimiter,
+        "lineEnding": line_ending,
+    }
+    if external_id_field:
+        payload["externalIdFieldName"] = external_id_field
+    return json_dumps(payload)
+
+
+def _poll_delay(wait: float, attempt: int) -> float:
+    """Seconds to sleep before the next job status check
+
+    Grows by half per `attempt` from `wait`, with a +/-20% jitter so that\
+        clients polling in lockstep spread out, and is capped at `MAX_CHECK_INTERVAL_SECONDS`
+    """
+    delay = max(MIN_CHECK_INTERVAL_SECONDS, wait) * 1.5**attempt
+    return min(MAX_CHECK_INTERVAL_SECONDS, delay * uniform(0.8, 1.2))
+
+
+def _iter_record_ends(buffer: bytes | mmap.mmap, start: int) -> Iterator[int]:
+    """Offsets just past each CSV record from `start`, the last one being `len(buffer)`
+
+    Newlines within quoted fields do not end a record. Unquoted data is scanned with\
+        `find`, otherwise `_CSV_CTRL_RE` finds quotes and newlines in a single pass.
+    """
+    size = len(buffer)
+    if buffer.find(b'"', start) == -1:
+        while start < size:
+            start = buffer.find(b"\n", start) + 1 or size
+            yield start
+        return
+
+    quoted = False
+    for match in _CSV_CTRL_RE.finditer(buffer, start):
+        if match.lastindex:
+            quoted = not quoted  # An escaped quote toggles twice
+        elif not quoted:
+            start = match.end()
+            yield start
+    if start < size:
+        yield size
+
+
+def _iter_gzip(content: bytes) -> Iterator[bytes]:
+    """Gzip `content` block by block, so the compressed body is streamed\
+        rather than held in memory next to the data
+    """
+    compressor = zlib.compressobj(1, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    view = memoryview(content)
+    for start in range(0, len(view), _UPLOAD_CHUNK_SIZE):
+        if block := compressor.compress(view[start : start + _UPLOAD_CHUNK_SIZE]):
+            yield block
+    yield compressor.flush()
+
+
+def _is_rate_limited(exc: SalesforceError) -> bool:
+    """Whether Salesforce refused the request for exceeding its API limits"""
+    if exc.status == HTTP_429_TOO_MANY_REQUESTS:
+        return True
+    content = exc.content.lower() if isinstance(exc.content, bytes) else b""
+    return any(marker.lower() in content for marker in _RATE_LIMIT_MARKERS)
+
+
+def _retry[T](
+    fn: Callable[[], T],
+    *,
+    max_attempts: int = DEFAULT_RATE_LIMIT_ATTEMPTS,
+    base: float = 1.0,
+    cap: float = 30.0,
+) -> T:
+    """Call `fn`, sleeping `min(cap, base * 2**attempt)` after each rate-limited try
+
+    Any other error, or the last rate-limited one, is raised as is.
+    """
+    for attempt in range(max_attempts - 1):
+        try:
+            return fn()
+        except SalesforceError as exc:
+            if not _is_rate_limited(exc):
+                raise
+            delay = min(cap, base * 2**attempt)
+            logger.warning(
+                "Salesforce API limit reached, retrying in %.1f seconds", delay
+            )
+            sleep(delay)
+    return fn()
+
+
 class BulkQueryResult(TypedDict):
     locator: str
     number_of_records: int
@@ -77,6 +270,19 @@ class BulkQueryResult(TypedDict):
     file: NotRequired[str]
 
 
+class BulkDownloadResult(TypedDict):
+    locator: str
+    number_of_records: int
+    file: str
+
+
+class BulkUploadResult(TypedDict):
+    numberRecordsFailed: NotRequired[int]
+    numberRecordsProcessed: NotRequired[int]
+    numberRecordsTotal: int
+    job_id: str
+
+
 class Bulk2SFHandler:
     """Bulk 2.0 API request handler
     Intermediate class which allows us to use commands,
@@ -91,6 +297,7 @@ class Bulk2SFHandler:
         bulk2_url: str,
         proxies: Proxies | None = None,
         session: Client | None = None,
+        on_write: Callable[[], None] | None = None,
     ):
         """Initialize the instance with the given parameters.
 
@@ -100,8 +307,36 @@ class Bulk2SFHandler:
             * proxies: The optional map of scheme to proxy server
             * session: Custom httpx.Client instance to use for requests.
                 This enables the use of httpx features not otherwise exposed by the library.
+                It is used as is, so `proxies` must already be mounted on it.
+            * on_write: Called whenever records are submitted for a write and once\
+                awaited write jobs complete, e.g. to drop cached query results
+
+        NOTE: The default client multiplexes job polls and uploads over shared HTTP/2\
+            connections, retrying requests that fail to connect
         """
-        self.client = session or Client(follow_redirects=True)
+        if session is not None and proxies:
+            logger.warning(
+                "Ignoring proxies as a session was provided, mount them on the session instead."
+            )
+        # A client passed in belongs to the caller, it is never closed here
+        self._owns_session = session is None
+        self.client = session or Client(
+            follow_redirects=True,
+            timeout=DEFAULT_BULK2_TIMEOUT,
+            transport=HTTPTransport(
+                http2=True, limits=DEFAULT_LIMITS, retries=DEFAULT_CONNECT_RETRIES
+            ),
+            mounts=(
+                to_mount(
+                    proxies,
+                    http2=True,
+                    limits=DEFAULT_LIMITS,
+                    retries=DEFAULT_CONNECT_RETRIES,
+                )
+                if proxies
+                else None
+            ),
+        )
         self.client.headers.update(
             {
                 "Content-Type": JSON_CONTENT_TYPE,
@@ -109,19 +344,38 @@ class Bulk2SFHandler:
                 "X-PrettyPrint": "1",
             }
         )
-        if proxies:
-            _proxies = to_url_mount(proxies)
-            self.client._mounts.update(  # pyright: ignore[reportPrivateUsage]
-                {
-                    key: _proxies[key]
-                    for key in (_proxies.keys() - self.client._mounts.keys())  # pyright: ignore[reportPrivateUsage]
-                }
-            )
 
         self.client.base_url = self.client.base_url or bulk2_url
+        self._types: dict[str, Bulk2SFType] = {}
+        self._on_write = on_write
+        # Set once the host answers a compressed upload with 415 Unsupported Media Type
+        self._gzip_refused = Event()
+
+    def close(self) -> None:
+        """Close the client created by the handler and release its pooled connections"""
+        if self._owns_session:
+            self.client.close()
+
+    def __enter__(self) -> "Bulk2SFHandler":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
 
     def __getattr__(self, name: str) -> "Bulk2SFType":
-        return Bulk2SFType(self.client, object_name=name)
+        if name.startswith("_"):
+            # Private and dunder lookups (copy, pickle, ...) are never SObjects
+            raise AttributeError(name)
+
+        type_ = self._types.get(name)
+        if type_ is None:
+            type_ = self._types[name] = Bulk2SFType(
+                self.client,
+                object_name=name,
+                on_write=self._on_write,
+                gzip_refused=self._gzip_refused,
+            )
+        return type_
 
 
 class Bulk2SFType(CallableSF):
@@ -132,7 +386,9 @@ class Bulk2SFType(CallableSF):
         client: Client,
         object_name: str,
         parse_float: Callable[[str], Any] | None = None,
-        object_pairs_hook: Callable[[Sequence[tuple[K, V]]], Mapping[K, V]] = dict[K, V],
+        object_pairs_hook: Callable[[Sequence[tuple[K, V]]], Mapping[K, V]] | None = None,
+        on_write: Callable[[], None] | None = None,
+        gzip_refused: Event | None = None,
     ) -> None:  # fmt:skip
         """
         Builds the instance with the client data
@@ -143,9 +399,17 @@ class Bulk2SFType(CallableSF):
         Arguments:
             * client: The httpx.Client instance to use for requests
             * object_name: The name of the object to interact with
+            * parse_float: Function to parse float values with
+            * object_pairs_hook: Function to parse ordered list of pairs in json.\
+                Leave unset to build plain dicts on the fast path
+            * on_write: Called whenever a write job is closed and once an awaited one completes
+            * gzip_refused: Set once the host refuses compressed uploads,\
+                shared by the types of a handler as they share its client
         """
         self.object_name = object_name
         self.client = client
+        self.on_write = on_write
+        self.gzip_refused = gzip_refused if gzip_refused is not None else Event()
 
         self.parse_float = parse_float
         self.object_pairs_hook = object_pairs_hook  # type: ignore
@@ -160,21 +424,19 @@ class Bulk2SFType(CallableSF):
         column_delimiter: ColumnDelimiter = ColumnDelimiter.COMMA,
         line_ending: LineEnding = "LF",
         wait: int = 5,
+        await_completion: bool = True,
     ):
         """Insert records"""
         return self._upload_file(
             "insert",
             csv_file=csv_file,
-            records=self._convert_dict_to_csv(
-                records,  # type: ignore
-                column_delimiter=column_delimiter,
-                line_ending=line_ending,
-            ),
+            records=records,
             batch_size=batch_size,
             column_delimiter=column_delimiter,
             line_ending=line_ending,
             concurrency=concurrency,
             wait=wait,
+            await_completion=await_completion,
         )
 
     create = insert
@@ -258,23 +520,23 @@ class Bulk2SFType(CallableSF):
         csv_file: str | None = None,
         records: list[dict[str, str]] | None = None,
         batch_size: int | None = None,
+        concurrency: int = 1,
         column_delimiter: ColumnDelimiter = ColumnDelimiter.COMMA,
         line_ending: LineEnding = "LF",
         wait: int = 5,
-    ) -> list[dict[str, int]]:
+        await_completion: bool = True,
+    ) -> list[BulkUploadResult]:
         """Update records"""
         return self._upload_file(
             "update",
             csv_file=csv_file,
-            records=self._convert_dict_to_csv(
-                records,  # type: ignore
-                column_delimiter=column_delimiter,
-                line_ending=line_ending,
-            ),
+            records=records,
             batch_size=batch_size,
+            concurrency=concurrency,
             column_delimiter=column_delimiter,
             line_ending=line_ending,
             wait=wait,
+            await_completion=await_completion,
         )
 
     def upsert(
@@ -284,24 +546,24 @@ class Bulk2SFType(CallableSF):
         records: list[dict[str, str]] | None = None,
         external_id_field: str = "Id",
         batch_size: int | None = None,
+        concurrency: int = 1,
         column_delimiter: ColumnDelimiter = ColumnDelimiter.COMMA,
         line_ending: LineEnding = "LF",
         wait: int = 5,
+        await_completion: bool = True,
     ):
         """Upsert records based on a unique identifier"""
         return self._upload_file(
             "upsert",
             csv_file=csv_file,
-            records=self._convert_dict_to_csv(
-                records,  # type: ignore
-                column_delimiter=column_delimiter,
-                line_ending=line_ending,
-            ),
+            records=records,
             batch_size=batch_size,
+            concurrency=concurrency,
             column_delimiter=column_delimiter,
             line_ending=line_ending,
             external_id_field=external_id_field,
             wait=wait,
+            await_completion=await_completion,
         )
 
     def soft_delete(
@@ -310,25 +572,25 @@ class Bulk2SFType(CallableSF):
         csv_file: str | None = None,
         records: list[dict[str, str]] | None = None,
         batch_size: int | None = None,
+        concurrency: int = 1,
         column_delimiter: ColumnDelimiter = ColumnDelimiter.COMMA,
         line_ending: LineEnding = "LF",
         external_id_field: str | None = None,
         wait: int = 5,
+        await_completion: bool = True,
     ):
         """Soft delete records"""
         return self._upload_file(
             "delete",
             csv_file=csv_file,
-            records=self._convert_dict_to_csv(
-                records,  # type: ignore
-                column_delimiter=column_delimiter,
-                line_ending=line_ending,
-            ),
+            records=records,
             batch_size=batch_size,
+            concurrency=concurrency,
             column_delimiter=column_delimiter,
             line_ending=line_ending,
             external_id_field=external_id_field,
             wait=wait,
+            await_completion=await_completion,
         )
 
     delete = soft_delete
@@ -339,23 +601,23 @@ class Bulk2SFType(CallableSF):
         csv_file: str | None = None,
         records: list[dict[str, str]] | None = None,
         batch_size: int | None = None,
+        concurrency: int = 1,
         column_delimiter: ColumnDelimiter = ColumnDelimiter.COMMA,
         line_ending: LineEnding = "LF",
         wait: int = 5,
+        await_completion: bool = True,
     ):
         """Hard delete records"""
         return self._upload_file(
             "hardDelete",
             csv_file=csv_file,
-            records=self._convert_dict_to_csv(
-                records,  # type: ignore
-                column_delimiter=column_delimiter,
-                line_ending=line_ending,
-            ),
+            records=records,
             batch_size=batch_size,
+            concurrency=concurrency,
             column_delimiter=column_delimiter,
             line_ending=line_ending,
             wait=wait,
+            await_completion=await_completion,
         )
 
     def download(
@@ -367,16 +629,18 @@ class Bulk2SFType(CallableSF):
         column_delimiter: ColumnDelimiter = ColumnDelimiter.COMMA,
         line_ending: LineEnding = "LF",
         wait: int = 5,
-    ):
+    ) -> list[BulkDownloadResult]:
         """
         Bulk 2.0 query stream to file, avoiding high memory usage
 
         Args:
             * query: The SOQL query to be performed
             * path: The path to save the file
-        """
-        import os
+            * max_records: The maximum number of records per file
 
+        NOTE: Every page of results is streamed into its own `{job_id}_{page}.csv` file,\
+            the next page is requested while the current one is still being written
+        """
         if not os.path.exists(path):
             raise SalesforceBulkV2LoadError(f"Path not found: {path}")
 
@@ -389,27 +653,77 @@ class Bulk2SFType(CallableSF):
         job_id = res["id"]
         self.wait_for_job(job_id, True, wait)
 
-        results = []
-        locator = "INIT"
-        while locator:
-            if locator == "INIT":
-                locator = ""
+        pages: list[Future[BulkDownloadResult]] = []
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            locator = ""
+            while True:
+                next_locator: Queue[str] = Queue(maxsize=1)
+                pages.append(
+                    pool.submit(
+                        self._download_query_results,
+                        job_id,
+                        os.path.join(path, f"{job_id}_{len(pages)}.csv"),
+                        next_locator,
+                        locator,
+                        max_records,
+                    )
+                )
+                # Empty on the last page, and when the page failed before its headers
+                locator = next_locator.get()
+                if not locator:
+                    break
+        return [page.result() for page in pages]
 
-            endpoint = f"{self._get_endpoint(job_id, True)}/results"
-            params = {
-                "maxRecords": max_records,
-                "locator": locator,
-            }
+    def _download_query_results(
+        self,
+        job_id: str,
+        filename: str,
+        next_locator: "Queue[str]",
+        locator: str = "",
+        max_records: int = DEFAULT_QUERY_PAGE_SIZE,
+    ) -> BulkDownloadResult:
+        """Stream one page of results for a query job into `filename`
 
-            locator = result["locator"]
-            results.apend(result)
+        The locator of the following page is put on `next_locator`\
+            as soon as the response headers arrive, an empty one if the request fails first
+        """
+        endpoint = f"{Bulk2SFType._get_endpoint(job_id, True)}/results"
+
+        params: dict[str, str | int] = {"maxRecords": max_records}
+        if locator and locator != "null":
+            params["locator"] = locator
+
+        headers = Bulk2SFType._get_headers(JSON_CONTENT_TYPE, CSV_CONTENT_TYPE)
+        published = False
+        try:
+            with self.stream_salesforce(
+                "GET", endpoint, params=params, headers=headers
+            ) as result:
+                locator = result.headers.get("Sforce-Locator", "null")
+                if locator == "null":
+                    locator = ""
+                next_locator.put(locator)
+                published = True
+
+                with open(filename, mode="wb") as bos:
+                    for chunk in result.iter_bytes(_DOWNLOAD_CHUNK_SIZE):
+                        bos.write(self._filter_null_bytes(chunk))
+        finally:
+            if not published:
+                # The error is raised by the result of this page
+                next_locator.put("")
+
+        return {
+            "locator": locator,
+            "number_of_records": int(result.headers.get("Sforce-NumberOfRecords", 0)),
+            "file": filename,
+        }
 
     @overload
     @staticmethod
     def _count_csv(
         *,
         filename: str | None = None,
-        line_ending: LineEnding = "LF",
         skip_header: bool = False,
     ) -> int: ...
 
@@ -418,7 +732,6 @@ class Bulk2SFType(CallableSF):
     def _count_csv(
         *,
         data: str | None = None,
-        line_ending: LineEnding = "LF",
         skip_header: bool = False,
     ) -> int: ...
 
@@ -427,16 +740,22 @@ class Bulk2SFType(CallableSF):
         *,
         filename: str | None = None,
         data: str | None = None,
-        line_ending: LineEnding = "LF",
         skip_header: bool = False,
     ) -> int:
         """Count the number of records in a CSV file."""
         if filename:
-            with open(filename, encoding="utf-8", mode="r") as bis:
-                count = sum(1 for _ in bis)
+            count = 0
+            last = b"\n"
+            with open(filename, mode="rb") as bis:
+                while chunk := bis.read(_COUNT_CHUNK_SIZE):
+                    # "\n" ends both LF and CRLF lines, so chunk borders never split it
+                    count += chunk.count(b"\n")
+                    last = chunk[-1:]
+            if last != b"\n":
+                count += 1
         elif data:
-            pat = _line_ending_char[line_ending]
-            count = data.count(pat)
+            # "\n" ends both LF and CRLF lines, and single character counts take the fast path
+            count = data.count("\n")
         else:
             raise ValueError("Either filename or data must be provided")
 
@@ -450,7 +769,7 @@ class Bulk2SFType(CallableSF):
         *,
         filename: str | None = None,
         max_records: int | None = None,
-    ) -> Iterator[tuple[int, str]]: ...
+    ) -> Iterator[tuple[int, bytes]]: ...
 
     @overload
     @staticmethod
@@ -458,7 +777,7 @@ class Bulk2SFType(CallableSF):
         *,
         records: str | None = None,
         max_records: int | None = None,
-    ) -> Iterator[tuple[int, str]]: ...
+    ) -> Iterator[tuple[int, bytes]]: ...
 
     @staticmethod
     def _split_csv(
@@ -466,56 +785,87 @@ class Bulk2SFType(CallableSF):
         filename: str | None = None,
         records: str | None = None,
         max_records: int | None = None,
-    ) -> Iterator[tuple[int, str]]:
+    ) -> Iterator[tuple[int, bytes]]:
         """Split a CSV file into chunks to avoid exceeding the Salesforce bulk 2.0 API limits"""
 
-        max_records = cast(int, max_records or float("-inf"))
+        max_bytes = MAX_INGEST_JOB_FILE_SIZE - 1 * 1024 * 1024
         if filename:
-            import os
-
-            with open(filename, encoding="utf-8", mode="r") as bis:
-                header, *lines = bis.readlines()
-            _max_records = max(max_records, len(lines))
-            _max_bytes = min(
-                os.path.getsize(filename), MAX_INGEST_JOB_FILE_SIZE - 1 * 1024 * 1024
-            )
-            yield from Bulk2SFType.__yield_chunks(
-                header, lines, _max_records, _max_bytes
-            )
+            # Mapped rather than read, only the emitted chunks are ever copied
+            with (
+                open(filename, mode="rb") as bis,
+                mmap.mmap(bis.fileno(), 0, access=mmap.ACCESS_READ) as buffer,
+            ):
+                yield from Bulk2SFType.__yield_chunks(buffer, max_records, max_bytes)
         elif records:
-            import sys
-
-            header, *lines = records.splitlines(True)
-            _max_records = max(max_records, len(lines))
-            _max_bytes = min(
-                sys.getsizeof(records), MAX_INGEST_JOB_FILE_SIZE - 1 * 1024 * 1024
-            )
             yield from Bulk2SFType.__yield_chunks(
-                header, lines, _max_records, _max_bytes
+                records.encode("utf-8"), max_records, max_bytes
             )
         else:
             raise ValueError("Either filename or data must be provided")
 
     @staticmethod
     def __yield_chunks(
-        header: str, lines: list[str], max_records: int, max_bytes: int
-    ) -> Iterator[tuple[int, str]]:
+        buffer: bytes | mmap.mmap, max_records: int | None, max_bytes: int
+    ) -> Iterator[tuple[int, bytes]]:
+        """Group the UTF-8 encoded lines following the header into chunks
+
+        Records are located with `_iter_record_ends` and each chunk is sliced out of\
+            `buffer` once, chunks stay encoded as they are uploaded as is
+        """
+        header_end = buffer.find(b"\n") + 1
+        if not header_end:
+            return
+        header = buffer[:header_end]
+        size = len(buffer)
+        max_records = max_records or size
+
         records_size = 0
-        bytes_size = 0
-        buff: list[str] = []
-        for line in lines:
+        chunk_start = start = header_end
+        for end in _iter_record_ends(buffer, header_end):
             records_size += 1
-            bytes_size += len(line.encode("utf-8"))
-            if records_size > max_records or bytes_size > max_bytes:
-                if buff:
-                    yield records_size - 1, header + "".join(buff)
-                buff = [line]
+            if records_size > max_records or end - chunk_start > max_bytes:
+                if start > chunk_start:
+                    yield records_size - 1, header + buffer[chunk_start:start]
+                chunk_start = start
                 records_size = 1
-                bytes_size = len(line.encode("utf-8"))
-            else:
-                buff.append(line)
-        if buff:
-            yield records_size, header + "".join(buff)
+            start = end
+        if start > chunk_start:
+            yield records_size, header + buffer[chunk_start:start]
+
+    @staticmethod
+    def _split_records(
+        records: list[dict[str, str]],
+        max_records: int | None = None,
+        column_delimiter: ColumnDelimiter = ColumnDelimiter.COMMA,
+        line_ending: LineEnding = "LF",
+    ) -> Iterator[tuple[int, str]]:
+        """Split records into CSV chunks within the Salesforce bulk 2.0 API limits
+
+        The records are chunked before being converted, so the number of records\
+            in each chunk is known without counting the CSV lines
+        """
+        if not records:
+            raise ValueError("Either filename or data must be provided")
+
+        max_bytes = MAX_INGEST_JOB_FILE_SIZE - 1 * 1024 * 1024
+        pending = list(chunked(records, max_records or len(records)))
+        pending.reverse()
+        while pending:
+            chunk = pending.pop()
+            data = cast(
+                str,
+                Bulk2SFType._convert_dict_to_csv(chunk, column_delimiter, line_ending),
+            )
+            # UTF-8 takes at most 4 bytes per character, only encode when it may matter
+            if (
+                len(chunk) > 1
+                and len(data) * 4 > max_bytes
+                and len(data.encode("utf-8")) > max_bytes
+            ):
+                half = len(chunk) // 2
+                pending.extend((chunk[half:], chunk[:half]))
+                continue
+            yield len(chunk), data
 
     @staticmethod
     def _convert_dict_to_csv(
@@ -523,41 +873,67 @@ class Bulk2SFType(CallableSF):
         column_delimiter: ColumnDelimiter = ColumnDelimiter.COMMA,
         line_ending: LineEnding = "LF",
     ) -> str | None:
-        """Convert a list of dictionaries to a CSV like object"""
+        """Convert a list of dictionaries to a CSV like object
+
+        NOTE: Large inputs are written by pyarrow when it is installed,\
+            which quotes every value present in the records
+        """
         if not data:
             return None
 
+        keys = list(dict.fromkeys(key for d in data for key in d))
+        delimiter, eol = _csv_format(column_delimiter, line_ending)
+
+        if pa is not None and len(data) >= ARROW_CSV_MIN_RECORDS:
+            try:
+                table = pa.Table.from_pylist(
+                    data, schema=pa.schema([(key, pa.string()) for key in keys])
+                )
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                pass  # Non string values, let DictWriter stringify them
+            else:
+                sink = pa.BufferOutputStream()
+                pa_csv.write_csv(
+                    table,
+                    sink,
+                    pa_csv.WriteOptions(
+                        include_header=False, delimiter=delimiter, eol=eol
+                    ),
+                )
+                return (
+                    delimiter.join(keys) + eol + sink.getvalue().to_pybytes().decode()
+                )
+
         from csv import DictWriter
         from io import StringIO
 
-        keys = {key for d in data for key in d.keys()}
         file = StringIO()
         writer = DictWriter(
             file,
             fieldnames=keys,
-            delimiter=_delimiter_char[column_delimiter],
-            lineterminator=_line_ending_char[line_ending],
+            delimiter=delimiter,
+            lineterminator=eol,
         )
         writer.writeheader()
         writer.writerows(data)
         return file.getvalue()
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def _get_endpoint(job_id: str | None, is_query: bool) -> str:
-        """Construct bulk 2.0 API request URL"""
+        """Construct bulk 2.0 API request URL, once per job over its polls"""
         url = "query" if is_query else "ingest"
         return f"{url}/{job_id}" if job_id else url
 
     @staticmethod
-    def _get_headers(request_ct: str | None, response_ct: str | None):
-        """Utility function to replicate a common set of headers"""
-        return cast(
-            Headers,
-            {
-                "Content-Type": request_ct or JSON_CONTENT_TYPE,
-                "Accept": response_ct or JSON_CONTENT_TYPE,
-            },
-        )
+    def _get_headers(request_ct: str | None, response_ct: str | None) -> Headers:
+        """Utility function to replicate a common set of headers
+
+        NOTE: The returned headers are shared, copy them before any change
+        """
+        return _HEADERS[
+            (request_ct or JSON_CONTENT_TYPE, response_ct or JSON_CONTENT_TYPE)
+        ]
 
     def create_job(
         self,
@@ -578,33 +954,37 @@ class Bulk2SFType(CallableSF):
             * line_ending: The line ending used for CSV job data
             * external_id_field: The external ID field used for upsert operations
         """
-        payload: dict[str, Any] = {
-            "operation": operation,
-            "columnDelimiter": column_delimiter,
-            "lineEnding": line_ending,
-        }
-        if external_id_field:
-            payload["externalIdFieldName"] = external_id_field
-
         is_query = operation in ("query", "queryAll")
         endpoint = Bulk2SFType._get_endpoint(None, is_query)
         if is_query:
             if not query:
                 raise SalesforceBulkV2ExtractError("Query is required for query jobs")
             headers = self._get_headers(JSON_CONTENT_TYPE, CSV_CONTENT_TYPE)
-            payload["query"] = query
+            payload: dict[str, Any] = {
+                "operation": operation,
+                "columnDelimiter": column_delimiter,
+                "lineEnding": line_ending,
+                "query": query,
+            }
+            if external_id_field:
+                payload["externalIdFieldName"] = external_id_field
+            content = json_dumps(payload)
         else:
-            headers = self._get_headers(CSV_CONTENT_TYPE, JSON_CONTENT_TYPE)
-            payload["object"] = self.object_name
-            payload["contentType"] = "CSV"
+            headers = self._get_headers(JSON_CONTENT_TYPE, JSON_CONTENT_TYPE)
+            content = _ingest_job_body(
+                self.object_name,
+                operation,
+                column_delimiter,
+                line_ending,
+                external_id_field,
+            )
 
-        result = self.call_salesforce(
+        return self.call_salesforce_json(
             "POST",
             endpoint,
             headers=headers,
-            json=payload,
+            content=content,
         )
-        return result.json(object_pairs_hook=self.object_pairs_hook)
 
     def get_job(
         self,
@@ -614,26 +994,59 @@ class Bulk2SFType(CallableSF):
     ):
         """Get job info"""
         endpoint = Bulk2SFType._get_endpoint(job_id, is_query)
-        return self.call_salesforce("GET", endpoint).json(
-            object_pairs_hook=self.object_pairs_hook
-        )
+        return _retry(partial(self.call_salesforce_json, "GET", endpoint))
 
-    @staticmethod
     def upload_job_data(
+        self,
         job_id: str,
-        data: str,
-    ): ...
+        data: str | bytes,
+    ) -> None:
+        """
+        Upload the CSV data of an ingest job
 
-    @staticmethod
-    def close_job(
-        job_id: str,
-    ): ...
+        The data is sent gzip compressed as it is streamed,\
+            unless the host refused compressed uploads before
+        """
+        endpoint = f"{Bulk2SFType._get_endpoint(job_id, False)}/batches"
+        content = data.encode("utf-8") if isinstance(data, str) else data
+
+        if not self.gzip_refused.is_set():
+            try:
+                self.call_salesforce(
+                    "PUT",
+                    endpoint,
+                    headers=_GZIP_CSV_HEADERS,
+                    content=_iter_gzip(content),
+                )
+                return
+            except SalesforceGeneralError as exc:
+                if exc.status != HTTP_415_UNSUPPORTED_MEDIA_TYPE:
+                    raise
+                self.gzip_refused.set()
+
+        self.call_salesforce(
+            "PUT",
+            endpoint,
+            headers=self._get_headers(CSV_CONTENT_TYPE, JSON_CONTENT_TYPE),
+            content=content,
+        )
 
-    @staticmethod
-    def abort_job(
-        job_id: str,
-        wait: bool = True,
-    ): ...
+    def close_job(self, job_id: str) -> Any:
+        """Mark the data of an ingest job as uploaded, so Salesforce starts processing it"""
+        return self._set_job_state(job_id, False, _UPLOAD_COMPLETE_BODY)
+
+    def abort_job(self, job_id: str, is_query: bool = False) -> Any:
+        """Abort a job, the records it already processed are not rolled back"""
+        return self._set_job_state(job_id, is_query, _ABORTED_BODY)
+
+    def _set_job_state(self, job_id: str, is_query: bool, body: bytes) -> Any:
+        """PATCH the state of a job, returning the updated job info"""
+        return self.call_salesforce_json(
+            "PATCH",
+            Bulk2SFType._get_endpoint(job_id, is_query),
+            headers=self._get_headers(JSON_CONTENT_TYPE, JSON_CONTENT_TYPE),
+            content=body,
+        )
 
     def wait_for_job(
         self,
@@ -641,35 +1054,42 @@ class Bulk2SFType(CallableSF):
         is_query: bool,
         wait: float = 0.5,
     ) -> Literal["JobComplete"]:
-        """Wait for job completion or timeout"""
-        from datetime import datetime, timedelta
-        from time import sleep
-        from math import exp
+        """Wait for job completion or timeout
+
+        The poll interval starts at `wait` and grows by half each check,\
+            up to `MAX_CHECK_INTERVAL_SECONDS`, see `_poll_delay`
 
-        expiration_time = datetime.now() + timedelta(seconds=DEFAULT_WAIT_TIMEOUT_SECONDS)  # fmt:skip
+        Environment variables, read once on import:
+            * SF_BULK2_TIMEOUT: Seconds to wait for the job before raising, 24 hours by default
+            * SF_BULK2_POLL_INTERVAL_MAX: Longest pause between two checks, 2 seconds by default
+        """
+        deadline = monotonic() + DEFAULT_WAIT_TIMEOUT_SECONDS
         job_status: JobState = "InProgress" if is_query else "Open"
-        delay_timeout = 0.0
         delay_cnt = 0
         sleep(wait)
-        while datetime.now() < expiration_time:
+        while monotonic() < deadline:
             job_info = self.get_job(job_id, is_query)
             job_status: JobState = job_info["state"]
-            if job_status == "JobComplete":
-                return job_status
-            elif job_status in ("Failed", "Aborted"):
-                error_msg = job_info.get("errorMessage", job_info)
-                raise SalesforceOperationError(
-                    f"Job {job_id} failed with status {job_status}: {error_msg}"
-                )
+            if self._is_job_complete(job_id, job_info):
+                return "JobComplete"
 
-            if delay_timeout < MAX_CHECK_INTERVAL_SECONDS:
-                delay_timeout = wait + exp(delay_cnt) / 1000
-                delay_cnt += 1
-            sleep(delay_timeout)
+            sleep(_poll_delay(wait, delay_cnt))
+            delay_cnt = min(delay_cnt + 1, 16)
         raise SalesforceOperationError(
             f"Job {job_id} did not complete within the timeout period. Current status: {job_status}"
         )
 
+    @staticmethod
+    def _is_job_complete(job_id: str, job_info: Mapping[str, Any]) -> bool:
+        """Whether the job completed, raises if it failed or was aborted"""
+        job_status: JobState = job_info["state"]
+        if job_status in _FAILED_JOB_STATES:
+            error_msg = job_info.get("errorMessage", job_info)
+            raise SalesforceOperationError(
+                f"Job {job_id} failed with status {job_status}: {error_msg}"
+            )
+        return job_status == "JobComplete"
+
     def get_query_results(
         self, job_id: str, locator: str = "", max_records: int = DEFAULT_QUERY_PAGE_SIZE
     ) -> BulkQueryResult:
@@ -696,7 +1116,9 @@ class Bulk2SFType(CallableSF):
         return {
             "locator": locator,
             "number_of_records": record_number,
-            "records": self._filter_null_bytes(result.text),
+            "records": self._filter_null_bytes(result.content).decode(
+                result.encoding or "utf-8", errors="replace"
+            ),
         }
 
     @staticmethod
@@ -705,10 +1127,11 @@ class Bulk2SFType(CallableSF):
         Filter out null bytes from a byte string
         https://github.com/airbytehq/airbyte/issues/8300
         """
-        if isinstance(b, str):
-            return b.replace("\x00", "")
         if isinstance(b, bytes):
-            return b.replace(b"\x00", b"")
+            # Most pages carry no NUL at all, skip the copy for them
+            return b if b.find(b"\x00") == -1 else b.translate(None, b"\x00")
+        if isinstance(b, str):
+            return b if "\x00" not in b else b.replace("\x00", "")
         raise TypeError("Expected str or bytes")
 
     def _upload_file(
@@ -716,29 +1139,34 @@ class Bulk2SFType(CallableSF):
         operation: SFOperation,
         *,
         csv_file: str | None = None,
-        records: str | None = None,
+        records: list[dict[str, str]] | None = None,
         batch_size: int | None = None,
         column_delimiter: ColumnDelimiter = ColumnDelimiter.COMMA,
         line_ending: LineEnding = "LF",
         external_id_field: str | None = None,
         wait: int = 5,
         concurrency: int = 1,
+        await_completion: bool = True,
     ):
-        """Upload CSV file to Salesforce"""
+        """Upload CSV file to Salesforce
+
+        Without `await_completion` the jobs are only closed, their outcome is left\
+            to be checked with `get_job(job_id, False)`
+        """
         if csv_file and records:
             raise SalesforceBulkV2LoadError("Cannot include both file and records")
-        if not records and csv_file:
-            import os
-
-            if not os.path.exists(csv_file):
-                raise SalesforceBulkV2LoadError(f"File not found: {csv_file}")
+        # A single stat, the splitter no longer needs the file size
+        if not records and csv_file and not os.path.isfile(csv_file):
+            raise SalesforceBulkV2LoadError(f"File not found: {csv_file}")
 
         if operation in ("delete", "hardDelete"):
             assert csv_file, "File is required for delete operations"
 
             with open(csv_file, encoding="utf-8", mode="r") as bis:
                 header = (
-                    bis.readline().rstrip().split(_delimiter_char[column_delimiter])
+                    bis.readline()
+                    .rstrip()
+                    .split(_csv_format(column_delimiter, line_ending).delimiter)
                 )
                 if len(header) != 1:
                     raise SalesforceBulkV2LoadError(
@@ -749,10 +1177,15 @@ class Bulk2SFType(CallableSF):
         split_data = (
             self._split_csv(filename=csv_file, max_records=batch_size)
             if csv_file
-            else self._split_csv(records=records, max_records=batch_size)
+            else self._split_records(
+                records,  # type: ignore
+                max_records=batch_size,
+                column_delimiter=column_delimiter,
+                line_ending=line_ending,
+            )
         )
 
-        results: list[dict[str, int]] = []
+        results: list[BulkUploadResult] = []
         if workers == 1:
             results.extend(
                 [
@@ -763,61 +1196,97 @@ class Bulk2SFType(CallableSF):
                         line_ending,
                         external_id_field,
                         wait,
+                        await_completion=await_completion,
                     )
                     for data in split_data
                 ]
             )
         else:
-            # OOM is possible if the file is too large
-            for chunks in chunked(split_data, n=workers):
-                workers = min(workers, len(chunks))
-
-                with ThreadPoolExecutor(max_workers=workers) as pool:
-                    multi_thread_worker = partial(
-                        self._upload_data,
-                        operation,
-                        column_delimiter=column_delimiter,
-                        line_ending=line_ending,
-                        external_id_field=external_id_field,
-                        wait=wait,
-                    )
-                    results.extend(pool.map(multi_thread_worker, chunks))
+            # Only awaited jobs are polled, the others are never registered
+            poller = (
+                _JobPoller(self, is_query=False, wait=wait)
+                if await_completion
+                else None
+            )
+            multi_thread_worker = partial(
+                self._upload_data,
+                operation,
+                column_delimiter=column_delimiter,
+                line_ending=line_ending,
+                external_id_field=external_id_field,
+                wait=wait,
+                poller=poller,
+                await_completion=await_completion,
+            )
+            # Keep `workers` uploads in flight, only as many chunks are held in memory
+            uploads: list[Future[BulkUploadResult]] = []
+            inflight: set[Future[BulkUploadResult]] = set()
+            with (
+                poller or nullcontext(),
+                ThreadPoolExecutor(max_workers=workers) as pool,
+            ):
+                for data in split_data:
+                    if len(inflight) >= workers:
+                        done, inflight = wait_futures(
+                            inflight, return_when=FIRST_COMPLETED
+                        )
+                        for upload in done:
+                            upload.result()  # Fail fast on the first failed job
+                    upload = pool.submit(multi_thread_worker, data)
+                    uploads.append(upload)
+                    inflight.add(upload)
+            results.extend(upload.result() for upload in uploads)
 
         return results
 
     def _upload_data(
         self,
         operation: SFOperation,
-        data: str | tuple[int, str],
+        data: tuple[int, str | bytes],
         column_delimiter: ColumnDelimiter = ColumnDelimiter.COMMA,
         line_ending: LineEnding = "LF",
         external_id_field: str | None = None,
         wait: int = 5,
-    ) -> dict[str, int]:
-        """Upload data to Salesforce"""
-        if isinstance(data, tuple):
-            total, unpacked_data = data
-        else:
-            total = self._count_csv(
-                data=data,
+        poller: "_JobPoller | None" = None,
+        await_completion: bool = True,
+    ) -> BulkUploadResult:
+        """Upload data to Salesforce
+
+        `data` is a `(number of records, CSV)` pair as yielded by the splitters,\
+            strings can be counted beforehand with `_count_csv(...)`
+
+        When a `poller` is given the job completion is awaited through it,\
+            instead of polling the job from the calling thread.
+            Without `await_completion` only the job id and total are returned once it is closed
+        """
+        total, unpacked_data = data
+
+        res = _retry(
+            partial(
+                self.create_job,
+                operation,
+                column_delimiter=column_delimiter,
                 line_ending=line_ending,
-                skip_header=True,
+                external_id_field=external_id_field,
             )
-            unpacked_data = data
-
-        res = self.create_job(
-            operation,
-            column_delimiter=column_delimiter,
-            line_ending=line_ending,
-            external_id_field=external_id_field,
         )
         job_id = res["id"]
         try:
             if res["state"] == "Open":
-                self.upload_job_data(job_id, unpacked_data)
-                self.close_job(job_id)
-                self.wait_for_job(job_id, False, wait)
-                res = self.get_job(job_id, False)
+                _retry(partial(self.upload_job_data, job_id, unpacked_data))
+                _retry(partial(self.close_job, job_id))
+                if self.on_write is not None:
+                    self.on_write()
+                if not await_completion:
+                    return {"numberRecordsTotal": int(total), "job_id": job_id}
+                if poller is None:
+                    self.wait_for_job(job_id, False, wait)
+                    res = self.get_job(job_id, False)
+                else:
+                    res = poller.wait(job_id)
+                if self.on_write is not None:
+                    # Queries run while the job was processing may have been cached
+                    self.on_write()
                 return {
                     "numberRecordsFailed": int(res["numberRecordsFailed"]),
                     "numberRecordsProcessed": int(res["numberRecordsProcessed"]),
@@ -832,3 +1301,88 @@ class Bulk2SFType(CallableSF):
             if res["state"] in ("UploadComplete", "InProgress", "Open"):
                 self.abort_job(job_id, False)
             raise
+
+
+class _JobPoller:
+    """Polls the state of several bulk 2.0 jobs from a single thread
+
+    Parallel uploads block on `wait(...)` instead of each polling its own job,\
+        so at most one status request is in flight at a time
+    """
+
+    def __init__(self, sf_type: Bulk2SFType, is_query: bool, wait: float = 0.5):
+        self.sf_type = sf_type
+        self.is_query = is_query
+        self.wait_seconds = wait
+
+        self._jobs: dict[str, tuple[Event, list[Any], float]] = {}
+        self._lock = Lock()
+        self._wakeup = Event()
+        self._closed = False
+        self._thread = Thread(target=self._run, name="bulk2-job-poller", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "_JobPoller":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop the polling thread once every registered job is settled"""
+        self._closed = True
+        self._wakeup.set()
+        self._thread.join()
+
+    def wait(self, job_id: str) -> Any:
+        """Block until the job completes and return its final info
+
+        Raises `SalesforceOperationError` if the job fails or times out
+        """
+        done = Event()
+        outcome: list[Any] = []
+        with self._lock:
+            self._jobs[job_id] = (
+                done,
+                outcome,
+                monotonic() + DEFAULT_WAIT_TIMEOUT_SECONDS,
+            )
+        self._wakeup.set()
+        done.wait()
+        if isinstance(outcome[0], BaseException):
+            raise outcome[0]
+        return outcome[0]
+
+    def _run(self) -> None:
+        delay_cnt = 0
+        while True:
+            with self._lock:
+                jobs = list(self._jobs.items())
+            if not jobs:
+                if self._closed:
+                    return
+                self._wakeup.wait()
+                self._wakeup.clear()
+                delay_cnt = 0
+                sleep(self.wait_seconds)
+                continue
+
+            for job_id, (done, outcome, deadline) in jobs:
+                try:
+                    job_info = self.sf_type.get_job(job_id, self.is_query)
+                    if self.sf_type._is_job_complete(job_id, job_info):  # pyright: ignore[reportPrivateUsage]
+                        outcome.append(job_info)
+                    elif monotonic() >= deadline:
+                        raise SalesforceOperationError(
+                            f"Job {job_id} did not complete within the timeout period. "
+                            f"Current status: {job_info['state']}"
+                        )
+                except BaseException as exc:
+                    outcome.append(exc)
+                if outcome:
+                    with self._lock:
+                        del self._jobs[job_id]
+                    done.set()
+
+            sleep(_poll_delay(self.wait_seconds, delay_cnt))
+            delay_cnt = min(delay_cnt + 1, 16)
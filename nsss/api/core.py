@@ -1,16 +1,24 @@
 # pyright: reportArgumentType=false
 import html
-import json
 import logging
 import re
+from collections import OrderedDict
 from collections.abc import (
     Callable,
+    Generator,
     Hashable,
+    Iterable,
     Iterator,
     Mapping,
     Sequence,
 )
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from enum import IntFlag, auto
 from functools import partial
+from itertools import chain
+from threading import Lock
+from time import monotonic
 from typing import (
     IO,
     Any,
@@ -22,10 +30,10 @@ from typing import (
     cast,
     overload,
 )
-from urllib.parse import urlparse
+from urllib.parse import quote, urlencode, urlparse
 
-from httpx import Client, HTTPStatusError, Response
-from starlette.status import HTTP_401_UNAUTHORIZED
+from httpx import Client, Headers, Response
+from more_itertools import chunked
 
 from nsss.__version__ import DEFAULT_API_VERSION
 from nsss.api import Bulk2SFHandler, BulkSFHandler, CompositeSFHandler, TypeSF
@@ -36,15 +44,93 @@ from nsss.utils import (
     KwargsAny,
     Proxies,
     URLMethod,
-    exception_handler,
+    json_dumps,
+    iter_json_member_array,
+    json_loads,
     to_url_mount,
 )
+from nsss.utils.base import DEFAULT_LIMITS, DEFAULT_TIMEOUT
+from nsss.utils.exceptions import SalesforceError, SalesforceExpiredSession, _exc_map
 
 K = TypeVar("K", bound=Hashable)
 V = TypeVar("V", bound=Any)
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_REST_CONCURRENCY = 8
+# Subrequests accepted by a single composite/batch request
+COMPOSITE_BATCH_LIMIT = 25
+# Records accepted by a single sObject Collections request
+COLLECTION_LIMIT = 200
+# Selecting more columns than this is logged, only the required fields should be queried
+WIDE_SELECT_WARNING = 50
+
+# Only the Authorization header changes, when the session is refreshed
+_JSON_CONTENT_TYPE = "application/json"
+_BASE_HEADERS = {"Content-Type": _JSON_CONTENT_TYPE, "X-PrettyPrint": "1"}
+# Composite batch requests that only GET, they never change the cached query results
+_READ_ONLY_POSTS = frozenset(("query_many", "get_many_by_custom_id"))
+# Error code of an expired session, found in the content without decoding it
+_INVALID_SESSION = b"INVALID_SESSION_ID"
+# Both usages of the Sforce-Limit-Info header in a single scan
+_LIMIT_INFO_RE = re.compile(
+    r"api-usage=(?P<used>\d+)/(?P<total>\d+)"
+    r"(?:.*?per-app-api-usage=(?P<app_used>\d+)/(?P<app_total>\d+)\(appName=(?P<app_name>.+?)\))?"
+)
+
+# Tokens that delimit the SELECT clause, subqueries are skipped by tracking the depth
+# String literals are matched whole, so the tokens within them are skipped
+_SELECT_TOKENS_RE = re.compile(r"'(?:[^'\\]|\\.)*'|[(),]|\bFROM\b", re.IGNORECASE)
+_FIELDS_FUNCTION_RE = re.compile(r"\bFIELDS\s*\(", re.IGNORECASE)
+
+
+class _AuthArgs(IntFlag):
+    """Login arguments given to `Salesforce`, see `_AUTH_DISPATCH`"""
+
+    USERNAME = auto()
+    PASSWORD = auto()
+    SECURITY_TOKEN = auto()
+    ORGANIZATION_ID = auto()
+    CONSUMER_KEY = auto()
+    CONSUMER_SECRET = auto()
+    PRIVATE_KEY = auto()
+    DOMAIN = auto()
+
+
+AuthType = Literal["password", "ipfilter", "jwt-bearer", "client-credentials"]
+
+# Required arguments, auth type and `SalesforceLogin` kwargs, the first match wins
+_AUTH_DISPATCH: tuple[tuple[_AuthArgs, AuthType, tuple[str, ...]], ...] = (
+    (
+        _AuthArgs.USERNAME | _AuthArgs.PASSWORD | _AuthArgs.SECURITY_TOKEN,
+        "password",
+        ("username", "password", "security_token", "client_id"),
+    ),
+    (
+        _AuthArgs.USERNAME | _AuthArgs.PASSWORD | _AuthArgs.ORGANIZATION_ID,
+        "ipfilter",
+        ("username", "password", "organizationId", "client_id"),
+    ),
+    (
+        _AuthArgs.USERNAME
+        | _AuthArgs.PASSWORD
+        | _AuthArgs.CONSUMER_KEY
+        | _AuthArgs.CONSUMER_SECRET,
+        "password",
+        ("username", "password", "consumer_key", "consumer_secret"),
+    ),
+    (
+        _AuthArgs.USERNAME | _AuthArgs.CONSUMER_KEY | _AuthArgs.PRIVATE_KEY,
+        "jwt-bearer",
+        ("username", "instance_url", "consumer_key", "privatekey_file", "privatekey"),
+    ),
+    (
+        _AuthArgs.CONSUMER_KEY | _AuthArgs.CONSUMER_SECRET | _AuthArgs.DOMAIN,
+        "client-credentials",
+        ("consumer_key", "consumer_secret"),
+    ),
+)
+
 
 class QueryResult[T: Mapping[str, Any]](TypedDict):
     totalSize: int
@@ -53,18 +139,135 @@ class QueryResult[T: Mapping[str, Any]](TypedDict):
     nextRecordsUrl: NotRequired[str]
 
 
+class QueryCursor(Iterator[dict[str, Any]]):
+    """Records of a query, consumed one by one while its pages are fetched"""
+
+    __slots__ = ("total_size", "_pages", "_records")
+
+    def __init__(
+        self, pages: Generator[list[dict[str, Any]], None, None], total_size: int
+    ) -> None:
+        self.total_size = total_size
+        self._pages = pages
+        self._records = chain.from_iterable(pages)
+
+    def __iter__(self) -> "QueryCursor":
+        return self
+
+    def __next__(self) -> dict[str, Any]:
+        return next(self._records)
+
+    def close(self) -> None:
+        """Stops paging, the page being prefetched is waited for and dropped"""
+        self._pages.close()
+
+
+class _QueryCache:
+    """Least recently used query results, each kept for `ttl` seconds"""
+
+    __slots__ = ("ttl", "maxsize", "_entries", "_lock")
+
+    def __init__(self, ttl: float, maxsize: int) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _query_cache_key(
+    kind: str,
+    query: str,
+    include_deleted: bool,
+    fields: Optional[Sequence[str]] = None,
+) -> Hashable:
+    """Whitespace insensitive key, SOQL string literals are case sensitive"""
+    projection = tuple(fields) if fields is not None else None
+    return kind, include_deleted, " ".join(query.split()), projection
+
+
+def _select_clause(query: str) -> tuple[int, int, int] | None:
+    """Returns the start and end of the SELECT clause of `query` and its column count,
+    or None when `query` is not a SELECT ... FROM query
+    """
+    start = query.upper().find("SELECT") + len("SELECT")
+    if start < len("SELECT"):
+        return None
+    depth, columns = 0, 1
+    for token in _SELECT_TOKENS_RE.finditer(query, start):
+        match token[0]:
+            case "(":
+                depth += 1
+            case ")":
+                depth -= 1
+            case "," if depth == 0:
+                columns += 1
+            case literal if literal[0] == "'":
+                pass
+            case _ if depth == 0:
+                return start, token.start(), columns
+    return None
+
+
+def _warn_wide_select(columns: int) -> None:
+    if columns > WIDE_SELECT_WARNING:
+        logger.warning(
+            "Query selects %d columns, only query the required fields", columns
+        )
+
+
+def _project(query: str, fields: Sequence[str]) -> str:
+    """Replaces the SELECT clause of `query` with `fields`.
+    Logs a warning when the resulting query selects more than `WIDE_SELECT_WARNING` columns.
+    """
+    if not fields:
+        raise ValueError("At least one field is required")
+    if (clause := _select_clause(query)) is None:
+        raise ValueError(f"Expected a SELECT ... FROM query, got {query!r}")
+    start, end, _ = clause
+    if _FIELDS_FUNCTION_RE.search(query, start, end):
+        raise ValueError("fields can not be combined with FIELDS(ALL|STANDARD|CUSTOM)")
+    _warn_wide_select(len(fields))
+    return f"{query[:start]} {', '.join(fields)} {query[end:]}"
+
+
 class Salesforce(CallableSF):
     """Salesforce API client.
     An instance of Salesforce is a handy way to wrap a Salesforce session
     for easy use of the Salesforce REST API."""
 
+    _query_cache: _QueryCache | None = None
+    _is_sandbox: Optional[bool] = None
+    _mdapi: Optional[SfdcMetadataApi] = None
+
     # fmt:off
     @overload
     def __init__(self, *, username: str, password: str, security_token: str,
         proxies: Optional[Proxies] = None, session: Optional[Client] = None,
         client_id: Optional[str] = None, domain: str = "login",
         parse_float: Optional[Callable[[str], Any]] = None,
-        object_pairs_hook: Callable[[Sequence[tuple[K, V]]], Mapping[K, V]] = dict[K, V],
+        object_pairs_hook: Callable[[Sequence[tuple[K, V]]], Mapping[K, V]] | None = None,
         version: str = DEFAULT_API_VERSION,
     ) -> None:
         """
@@ -79,7 +282,7 @@ class Salesforce(CallableSF):
 
         Universal kwargs:
             * proxies: The optional map of scheme to proxy server
-            * session: An existing httpx.AsyncClient instance to use for requests.\
+            * session: An existing httpx.Client instance to use for requests.\
                 This enables the use of httpx features not otherwise exposed by the library.
             * client_id: The ID of this client
             * domain: The domain to using for connecting to Salesforce.\
@@ -95,7 +298,7 @@ class Salesforce(CallableSF):
         proxies: Optional[Proxies] = None, session: Optional[Client] = None,
         client_id: Optional[str] = None, domain: str = "login",
         parse_float: Optional[Callable[[str], Any]] = None,
-        object_pairs_hook: Callable[[Sequence[tuple[K, V]]], Mapping[K, V]] = dict[K, V],
+        object_pairs_hook: Callable[[Sequence[tuple[K, V]]], Mapping[K, V]] | None = None,
         version: str = DEFAULT_API_VERSION,
     ) -> None:
         """
@@ -110,7 +313,7 @@ class Salesforce(CallableSF):
 
         Universal kwargs:
             * proxies: The optional map of scheme to proxy server
-            * session: An existing httpx.AsyncClient instance to use for requests.\
+            * session: An existing httpx.Client instance to use for requests.\
                 This enables the use of httpx features not otherwise exposed by the library.
             * client_id: The ID of this client
             * domain: The domain to using for connecting to Salesforce.\
@@ -126,7 +329,7 @@ class Salesforce(CallableSF):
         proxies: Optional[Proxies] = None, session: Optional[Client] = None,
         client_id: Optional[str] = None, domain: str = "login",
         parse_float: Optional[Callable[[str], Any]] = None,
-        object_pairs_hook: Callable[[Sequence[tuple[K, V]]], Mapping[K, V]] = dict[K, V],
+        object_pairs_hook: Callable[[Sequence[tuple[K, V]]], Mapping[K, V]] | None = None,
         version: str = DEFAULT_API_VERSION,
     ) -> None:
         """
@@ -142,7 +345,7 @@ class Salesforce(CallableSF):
 
         Universal kwargs:
             * proxies: The optional map of scheme to proxy server
-            * session: An existing httpx.AsyncClient instance to use for requests.\
+            * session: An existing httpx.Client instance to use for requests.\
                 This enables the use of httpx features not otherwise exposed by the library.
             * client_id: The ID of this client
             * domain: The domain to using for connecting to Salesforce.\
@@ -158,7 +361,7 @@ class Salesforce(CallableSF):
         proxies: Optional[Proxies] = None, session: Optional[Client] = None,
         client_id: Optional[str] = None, domain: str = "login",
         parse_float: Optional[Callable[[str], Any]] = None,
-        object_pairs_hook: Callable[[Sequence[tuple[K, V]]], Mapping[K, V]] = dict[K, V],
+        object_pairs_hook: Callable[[Sequence[tuple[K, V]]], Mapping[K, V]] | None = None,
         version: str = DEFAULT_API_VERSION,
     ) -> None:
         """
@@ -173,7 +376,7 @@ class Salesforce(CallableSF):
 
         Universal kwargs:
             * proxies: The optional map of scheme to proxy server
-            * session: An existing httpx.AsyncClient instance to use for requests.\
+            * session: An existing httpx.Client instance to use for requests.\
                 This enables the use of httpx features not otherwise exposed by the library.
             * client_id: The ID of this client
             * domain: The domain to using for connecting to Salesforce.\
@@ -189,7 +392,7 @@ class Salesforce(CallableSF):
         proxies: Optional[Proxies] = None, session: Optional[Client] = None,
         client_id: Optional[str] = None, domain: str = "login",
         parse_float: Callable[[str], Any] | None = None,
-        object_pairs_hook: Callable[[Sequence[tuple[K, V]]], Mapping[K, V]] = dict[K, V],
+        object_pairs_hook: Callable[[Sequence[tuple[K, V]]], Mapping[K, V]] | None = None,
         version: str = DEFAULT_API_VERSION,
     ) -> None:
         """
@@ -204,7 +407,7 @@ class Salesforce(CallableSF):
 
         Universal kwargs:
             * proxies: The optional map of scheme to proxy server
-            * session: An existing httpx.AsyncClient instance to use for requests.\
+            * session: An existing httpx.Client instance to use for requests.\
                 This enables the use of httpx features not otherwise exposed by the library.
             * domain: The domain to using for connecting to Salesforce.\
                 Use common domains, such as 'login' or 'test', or Salesforce My domain.\
@@ -218,7 +421,7 @@ class Salesforce(CallableSF):
     def __init__(self, *,  consumer_key: str, consumer_secret: str, domain: str = "login",
         proxies: Optional[Proxies] = None, session: Optional[Client] = None, client_id: Optional[str] = None,
         parse_float: Optional[Callable[[str], Any]] = None,
-        object_pairs_hook: Callable[[Sequence[tuple[K, V]]], Mapping[K, V]] = dict[K, V],
+        object_pairs_hook: Callable[[Sequence[tuple[K, V]]], Mapping[K, V]] | None = None,
         version: str = DEFAULT_API_VERSION,
     ) -> None:
         """
@@ -235,7 +438,7 @@ class Salesforce(CallableSF):
 
         Universal kwargs:
             * proxies: The optional map of scheme to proxy server
-            * session: An existing httpx.AsyncClient instance to use for requests.\
+            * session: An existing httpx.Client instance to use for requests.\
                 This enables the use of httpx features not otherwise exposed by the library.
             * parse_float: Function to parse float values with.\
                 It's passed along to https://docs.python.org/3/library/json.html
@@ -247,7 +450,7 @@ class Salesforce(CallableSF):
         proxies: Optional[Proxies] = None, session: Optional[Client] = None,
         client_id: Optional[str] = None, domain: str = "login",
         parse_float: Optional[Callable[[str], Any]] = None,
-        object_pairs_hook: Callable[[Sequence[tuple[K, V]]], Mapping[K, V]] = dict[K, V],
+        object_pairs_hook: Callable[[Sequence[tuple[K, V]]], Mapping[K, V]] | None = None,
         version: str = DEFAULT_API_VERSION,
     ) -> None:
         """
@@ -261,7 +464,7 @@ class Salesforce(CallableSF):
 
         Universal kwargs:
             * proxies: The optional map of scheme to proxy server
-            * session: An existing httpx.AsyncClient instance to use for requests.\
+            * session: An existing httpx.Client instance to use for requests.\
                 This enables the use of httpx features not otherwise exposed by the library.
             * domain: The domain to using for connecting to Salesforce.\
                 Use common domains, such as 'login' or 'test', or Salesforce My domain.\
@@ -276,7 +479,7 @@ class Salesforce(CallableSF):
         proxies: Optional[Proxies] = None, session: Optional[Client] = None,
         client_id: Optional[str] = None, domain: str = "login",
         parse_float: Optional[Callable[[str], Any]] = None,
-        object_pairs_hook: Callable[[Sequence[tuple[K, V]]], Mapping[K, V]] = dict[K, V],
+        object_pairs_hook: Callable[[Sequence[tuple[K, V]]], Mapping[K, V]] | None = None,
         version: str = DEFAULT_API_VERSION,
     ) -> None:
         """
@@ -290,7 +493,7 @@ class Salesforce(CallableSF):
 
         Universal kwargs:
             * proxies: The optional map of scheme to proxy server
-            * session: An existing httpx.AsyncClient instance to use for requests.\
+            * session: An existing httpx.Client instance to use for requests.\
                 This enables the use of httpx features not otherwise exposed by the library.
             * domain: The domain to using for connecting to Salesforce.\
                 Use common domains, such as 'login' or 'test', or Salesforce My domain.\
@@ -310,19 +513,25 @@ class Salesforce(CallableSF):
         proxies: Optional[Proxies] = None, session: Optional[Client] = None,
         client_id: Optional[str] = None, domain: str = "login",
         parse_float: Optional[Callable[[str], Any]] = None,
-        object_pairs_hook: Callable[[Sequence[tuple[K, V]]], Mapping[K, V]] = dict[K, V],
+        object_pairs_hook: Callable[[Sequence[tuple[K, V]]], Mapping[K, V]] | None = None,
     ) -> None:  # fmt:skip
         """Initialize the instance with the given parameters."""
 
         self.sf_version = version
+        self._data_prefix = f"data/v{version}/"
+        self._tooling_prefix = f"{self._data_prefix}tooling/"
+        self._next_records_prefix = f"/services/{self._data_prefix}"
         self.domain = domain
         self.client = session or Client(
+            http2=True,
             follow_redirects=True,
+            limits=DEFAULT_LIMITS,
+            timeout=DEFAULT_TIMEOUT,
             base_url=f"https://{self.sf_instance}/services/",
         )
         _proxies = None
         if proxies:
-            _proxies = to_url_mount(proxies)
+            _proxies = to_url_mount(proxies, http2=True, limits=DEFAULT_LIMITS)
             self.client._mounts.update(_proxies)  # pyright: ignore[reportPrivateUsage]
 
         args = dict(
@@ -363,6 +572,13 @@ class Salesforce(CallableSF):
 
         if self.auth_type != "direct":
             self._salesforce_login_partial = partial(SalesforceLogin, **args)
+        # Encoded once, each request only copies the already normalized headers
+        self.headers = Headers(_BASE_HEADERS)
+        self._handlers: dict[
+            str, BulkSFHandler | Bulk2SFHandler | CompositeSFHandler | TypeSF
+        ] = {}
+        # Guards the session refresh and the handlers built with the session id
+        self._session_lock = Lock()
         self._refresh_session()
         self._generate_headers()
 
@@ -383,72 +599,43 @@ class Salesforce(CallableSF):
         client_id: Optional[str],
         domain: str,
     ):
-        return_: (
-            tuple[
-                dict[str, str | None],
-                Literal["password", "ipfilter", "jwt-bearer", "client-credentials"],
-            ]
-            | tuple[None, None]
-        ) = (None, None)
-        if username and password and security_token:
-            return_ = (
-                {
-                    "username": username,
-                    "password": password,
-                    "security_token": security_token,
-                    "client_id": client_id,
-                },
-                "password",
-            )
-        elif username and password and organizationid:
-            return_ = (
-                {
-                    "username": username,
-                    "password": password,
-                    "organizationId": organizationid,
-                    "client_id": client_id,
-                },
-                "ipfilter",
-            )
-        elif username and password and consumer_key and consumer_secret:
-            return_ = (
-                {
-                    "username": username,
-                    "password": password,
-                    "consumer_key": consumer_key,
-                    "consumer_secret": consumer_secret,
-                },
-                "password",
-            )
-        elif username and consumer_key and (privatekey_file or privatekey):
-            return_ = (
-                {
-                    "username": username,
-                    "instance_url": instance_url,
-                    "consumer_key": consumer_key,
-                    "privatekey_file": privatekey_file,
-                    "privatekey": privatekey,
-                },
-                "jwt-bearer",
-            )
-        elif consumer_key and consumer_secret and domain:
-            return_ = (
-                {
-                    "consumer_key": consumer_key,
-                    "consumer_secret": consumer_secret,
-                },
-                "client-credentials",
-            )
-
-        return return_
+        arguments = {
+            "username": username,
+            "password": password,
+            "security_token": security_token,
+            "organizationId": organizationid,
+            "consumer_key": consumer_key,
+            "consumer_secret": consumer_secret,
+            "privatekey_file": privatekey_file,
+            "privatekey": privatekey,
+            "instance_url": instance_url,
+            "client_id": client_id,
+        }
+        given = _AuthArgs(0)
+        for flag, present in (
+            (_AuthArgs.USERNAME, username),
+            (_AuthArgs.PASSWORD, password),
+            (_AuthArgs.SECURITY_TOKEN, security_token),
+            (_AuthArgs.ORGANIZATION_ID, organizationid),
+            (_AuthArgs.CONSUMER_KEY, consumer_key),
+            (_AuthArgs.CONSUMER_SECRET, consumer_secret),
+            (_AuthArgs.PRIVATE_KEY, privatekey_file or privatekey),
+            (_AuthArgs.DOMAIN, domain),
+        ):
+            if present:
+                given |= flag
+
+        for required, auth_type, keys in _AUTH_DISPATCH:
+            if given & required == required:
+                return {key: arguments[key] for key in keys}, auth_type
+        return None, None
 
     def _generate_headers(self):
-        """Utility to generate headers when refreshing the session"""
-        self.headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self.session_id}",
-            "X-PrettyPrint": "1",
-        }
+        """Utility to update the headers when refreshing the session
+
+        The `httpx.Headers` are updated in place, so references held by e.g. `mdapi` stay current
+        """
+        self.headers["Authorization"] = f"Bearer {self.session_id}"
 
     def _refresh_session(self) -> None:
         """Utility to refresh the session when expired"""
@@ -457,6 +644,24 @@ class Salesforce(CallableSF):
         ), "The simple_salesforce session can not refreshed if a session id has been provided."
 
         self.session_id, self.sf_instance = self._salesforce_login_partial()
+        # The handlers hold the previous session id, their clients are released with them
+        for handler in self._handlers.values():
+            if (close := getattr(handler, "close", None)) is not None:
+                close()
+        self._handlers.clear()
+        if self._mdapi is not None:
+            # Its SOAP envelopes and session header carry the previous session id
+            self._mdapi.close()
+            self._mdapi = None
+
+    def _renew_session(self, expired_session_id: Optional[str]) -> None:
+        """Refresh the expired session once, concurrent calls rejected with the same
+        session id wait for that refresh and retry with its session instead
+        """
+        with self._session_lock:
+            if self.session_id == expired_session_id:
+                self._refresh_session()
+                self._generate_headers()
 
     @staticmethod
     def parse_api_usage(
@@ -481,12 +686,11 @@ class Salesforce(CallableSF):
         api_usage: tuple[int, int] | None = None
         per_app_api_usage: tuple[int, int, str] | None = None
 
-        if match := re.search(r"api-usage=(?P<used>\d+)/(?P<total>\d+)", sforce_limit_info):  # fmt:skip
-            api_usage = tuple[int, int](map(int, match.group("used", "total")))
-
-        if match := re.search(r"per-app-api-usage=(?P<used>\d+)/(?P<total>\d+)\(appName=(?P<name>.+?)\)", sforce_limit_info):  # fmt:skip
-            groups = match.group("used", "used", "used")
-            per_app_api_usage = (int(groups[0]), int(groups[1]), groups[2])  # fmt:skip
+        if match := _LIMIT_INFO_RE.search(sforce_limit_info):
+            used, total, app_used, app_total, app_name = match.groups()
+            api_usage = (int(used), int(total))
+            if app_name is not None:
+                per_app_api_usage = (int(app_used), int(app_total), app_name)
 
         return {
             "api_usage": api_usage,
@@ -497,11 +701,12 @@ class Salesforce(CallableSF):
     def mdapi(self) -> SfdcMetadataApi:
         """Utility to interact with metadata api functionality"""
         if not self._mdapi:
+            # A dedicated client, the metadata API rebinds its base URL
             self._mdapi = SfdcMetadataApi(
-                session=self.session,
+                session=None,
                 session_id=self.session_id,
                 instance=self.sf_instance,
-                metadata_url=self.metadata_url,
+                metadata_url=f"https://{self.sf_instance}/services/Soap/m/{self.sf_version}/",
                 api_version=self.sf_version,
                 headers=self.headers,
             )
@@ -516,26 +721,84 @@ class Salesforce(CallableSF):
         max_retries: int = 3,
         **kwargs: KwargsAny,
     ) -> Response:
-        """Utility method for performing HTTP call to Salesforce."""
-        try:
-            response = self.call_salesforce(method, endpoint, self.headers, **kwargs)
+        """Utility method for performing HTTP call to Salesforce.
+
+        An invalid session is refreshed and the call retried, up to `max_retries` times
+        """
+        for attempt in range(retries, max_retries + 1):
+            session_id = self.session_id
+            try:
+                response = self.call_salesforce(
+                    method, endpoint, self.headers, **kwargs
+                )
+            except SalesforceError as exc:
+                exc.resource_name = name
+                if attempt == max_retries or not self._is_expired_session(exc):
+                    raise
+                self._renew_session(session_id)
+                continue
+
             if sforce_limit_info := response.headers.get("Sforce-Limit-Info"):
                 self.api_usage = self.parse_api_usage(sforce_limit_info)
+            if method != "GET" and name not in _READ_ONLY_POSTS:
+                self._invalidate_query_cache()
             return response
-        except HTTPStatusError as e:
-            response = e.response
-            if (
-                self._salesforce_login_partial
-                and response.status_code == HTTP_401_UNAUTHORIZED
-                and response.json().get("errorCode") == "INVALID_SESSION_ID"
-            ):
-                self._refresh_session()
-                if retries == max_retries:
-                    exception_handler(response, name)
-                return self._call_salesforce(
-                    method, endpoint, name, retries=retries + 1, **kwargs
-                )
-            exception_handler(response, name)
+        raise ValueError(f"Invalid retries for {name}: {retries} > {max_retries}")
+
+    @contextmanager
+    def _stream_salesforce(
+        self,
+        method: URLMethod,
+        endpoint: str,
+        name: str,
+        max_retries: int = 3,
+        **kwargs: KwargsAny,
+    ) -> Iterator[Response]:
+        """Streaming variant of `_call_salesforce(...)`, the body is left for the caller to read.
+
+        An invalid session is refreshed and the request sent again, up to `max_retries` times
+        """
+        for attempt in range(max_retries + 1):
+            session_id = self.session_id
+            with ExitStack() as stack:
+                try:
+                    response = stack.enter_context(
+                        self.stream_salesforce(method, endpoint, self.headers, **kwargs)
+                    )
+                except SalesforceError as exc:
+                    exc.resource_name = name
+                    if attempt == max_retries or not self._is_expired_session(exc):
+                        raise
+                    self._renew_session(session_id)
+                    continue
+
+                if sforce_limit_info := response.headers.get("Sforce-Limit-Info"):
+                    self.api_usage = self.parse_api_usage(sforce_limit_info)
+                yield response
+                return
+
+    def _is_expired_session(self, exc: SalesforceError) -> bool:
+        """Whether `exc` rejected an expired session that a new login can renew"""
+        return (
+            isinstance(exc, SalesforceExpiredSession)
+            and self._salesforce_login_partial is not None
+            and _INVALID_SESSION in exc.content
+        )
+
+    def _decode(self, response: Response) -> JsonType:
+        """Decode a JSON response body, other content types are returned as text
+
+        Bodies that are not labelled as JSON are never parsed
+        """
+        content_type = response.headers.get("Content-Type", "")
+        if not content_type.startswith(_JSON_CONTENT_TYPE):
+            return response.text
+        try:
+            return json_loads(
+                response.content, self.parse_float, self.object_pairs_hook
+            )
+        except ValueError:  # Both json and orjson decode errors
+            return response.text
 
     def toolingexecute(
         self,
@@ -555,22 +818,16 @@ class Salesforce(CallableSF):
             * kwargs: Additional arguments passed to the request
         """
         action = html.escape(action)
-        json_data = json.dumps(data) if data else None
+        json_data = json_dumps(data) if data else None
         response = self._call_salesforce(
-            endpoint=f"data/v{self.sf_version}/tooling/{action}",
+            endpoint=self._tooling_prefix + action,
             method=method,
             name="toolingexecute",
-            data=json_data,
+            content=json_data,
             **kwargs,
         )
 
-        try:
-            return response.json(
-                object_pairs_hook=self.object_pairs_hook,
-                parse_float=self._parse_float,
-            )
-        except json.JSONDecodeError:
-            return response.text
+        return self._decode(response)
 
     def apexexecute(
         self,
@@ -589,22 +846,16 @@ class Salesforce(CallableSF):
             * kwargs: Additional arguments passed to the request
         """
         action = html.escape(action)
-        json_data = json.dumps(data) if data else None
+        json_data = json_dumps(data) if data else None
         response = self._call_salesforce(
             endpoint=f"apexrest/{action}",
             method=method,
             name="apexexecute",
-            data=json_data,
+            content=json_data,
             **kwargs,
         )
 
-        try:
-            return response.json(
-                object_pairs_hook=self.object_pairs_hook,
-                parse_float=self._parse_float,
-            )
-        except json.JSONDecodeError:
-            return response.text
+        return self._decode(response)
 
     def restful(
         self,
@@ -627,20 +878,44 @@ class Salesforce(CallableSF):
                 (e.g., headers, cookies, etc.)
         """
         response = self._call_salesforce(
-            endpoint=f"data/v{self.sf_version}/{path}",
+            endpoint=self._data_prefix + path,
             method=method,
             name=cast(str, kwargs.pop("name", "restful")),
             params=params,
             **kwargs,
         )
 
-        try:
-            return response.json(
-                object_pairs_hook=self.object_pairs_hook,
-                parse_float=self._parse_float,
-            )
-        except json.JSONDecodeError:
-            return response.text
+        return self._decode(response)
+
+    def restful_many(
+        self,
+        paths: Iterable[str],
+        method: URLMethod = "GET",
+        *,
+        concurrency: int = DEFAULT_REST_CONCURRENCY,
+        **kwargs: KwargsAny,
+    ) -> list[JsonType]:
+        """
+        Makes the same HTTP request to several known REST endpoints at once
+        ---
+
+        Arguments:
+            * paths: The paths to the requests, as given to `restful(...)`
+            * method: The HTTP method to use (e.g., "GET", "POST")
+            * concurrency: The maximum number of requests in flight,\
+                they share the connection pool of the client
+            * kwargs: Additional arguments passed to every `restful(...)` call
+
+        NOTE: The responses are returned in the same order as `paths`
+        """
+        request = partial(self.restful, method=method, **kwargs)
+        paths_ = list(paths)
+        if len(paths_) <= 1:
+            return [request(path) for path in paths_]
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(concurrency, len(paths_)))
+        ) as pool:
+            return list(pool.map(request, paths_))
 
     def oauth2(
         self,
@@ -670,15 +945,7 @@ class Salesforce(CallableSF):
             **kwargs,
         )
 
-        try:
-            if response.headers.get("Content-Type") == "application/json":
-                return response.json(
-                    object_pairs_hook=self.object_pairs_hook,
-                    parse_float=self._parse_float,
-                )
-            return response.text
-        except json.JSONDecodeError:
-            return response.text or response.content
+        return self._decode(response)
 
     def describe(self, **kwargs: KwargsAny) -> dict[str, Any] | None:
         """
@@ -698,6 +965,31 @@ class Salesforce(CallableSF):
             ),
         )
 
+    def describe_stream(
+        self, others: Optional[dict[str, Any]] = None, **kwargs: KwargsAny
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Streaming alternative to `describe(...)`.
+        The object descriptions are decoded one at a time as the response is received,\
+            so callers looking for a few objects never hold the whole document.
+        ---
+        Arguments:
+            * others: Filled with the other members of the response\
+                (e.g., encoding, maxBatchSize) once the descriptions are consumed
+            * kwargs: Additional arguments passed to the request supported by httpx request\
+                (e.g., headers, cookies, etc.)
+        """
+        with self.stream_salesforce(
+            "GET", self._data_prefix + "sobjects", self.headers, **kwargs
+        ) as response:
+            yield from iter_json_member_array(
+                response.iter_bytes(),
+                "sobjects",
+                others,
+                self.parse_float,
+                self.object_pairs_hook,
+            )
+
     def search(self, search: str) -> dict[str, Any] | None:
         """
         Returns the result of a SF search as a dictionary.
@@ -746,7 +1038,12 @@ class Salesforce(CallableSF):
         )
 
     def query(
-        self, query: str, include_deleted: bool = False, **kwargs: KwargsAny
+        self,
+        query: str,
+        include_deleted: bool = False,
+        bypass_cache: bool = False,
+        fields: Optional[Sequence[str]] = None,
+        **kwargs: KwargsAny,
     ) -> QueryResult[dict[str, Any]]:
         """
         Returns the result of a SOQL query as a dictionary.
@@ -754,10 +1051,24 @@ class Salesforce(CallableSF):
         Arguments:
             * query: The SOQL query to execute
             * include_deleted: Whether to include deleted records in the query
+            * bypass_cache: Whether to skip the query cache, see `enable_query_cache(...)`
+            * fields: The only fields to select, replacing the SELECT clause of `query`
             * kwargs: Additional arguments passed to the request supported by httpx request\
                 (e.g., headers, cookies, etc.)
+
+        NOTE: Requests with extra `kwargs` are never cached
         """
-        return cast(
+        if fields is not None:
+            query = _project(query, fields)
+        elif (clause := _select_clause(query)) is not None:
+            # Only a hint, queries the scan does not understand are sent as is
+            _warn_wide_select(clause[2])
+        cache = None if bypass_cache or kwargs else self._query_cache
+        key = _query_cache_key("query", query, include_deleted)
+        if cache is not None and (cached := cache.get(key)) is not None:
+            return cached
+
+        result = cast(
             QueryResult[dict[str, Any]],
             self.restful(
                 path="queryAll" if include_deleted else "query",
@@ -767,6 +1078,9 @@ class Salesforce(CallableSF):
                 **kwargs,
             ),
         )
+        if cache is not None:
+            cache.put(key, result)
+        return result
 
     def query_more(
         self,
@@ -787,15 +1101,17 @@ class Salesforce(CallableSF):
 
         NOTE: `nextRecordsUrl` only is returned when there are more records than the batch maximum.
         """
-        if not identifier_is_url:
-            next_records_identifier = next_records_identifier.lstrip(f"/services/data/v{self.sf_version}")  # fmt:skip
-        endpoint = "queryAll" if include_deleted else "query"
-        next_records_url = f"/{endpoint}/{next_records_identifier}"  # fmt:skip
+        if identifier_is_url:
+            # `nextRecordsUrl` is absolute, e.g. /services/data/v59.0/query/01g...-2000
+            path = next_records_identifier.removeprefix(self._next_records_prefix)
+        else:
+            endpoint = "queryAll" if include_deleted else "query"
+            path = f"{endpoint}/{next_records_identifier}"
 
         return cast(
             QueryResult[dict[str, Any]],
             self.restful(
-                path=next_records_url,
+                path=path,
                 method="GET",
                 name="query_more",
                 **kwargs,
@@ -803,32 +1119,88 @@ class Salesforce(CallableSF):
         )
 
     def query_all_iter(
-        self, query: str, include_deleted: bool = False, **kwargs: KwargsAny
-    ) -> Iterator[dict[str, Any]]:
+        self,
+        query: str,
+        include_deleted: bool = False,
+        **kwargs: KwargsAny,
+    ) -> "QueryCursor":
         """
         This is a lazy alternative that returns an iterator.
         It does not construct the whole result set into one container,
         but returns objects from each page it retrieves from the API.
+        The next page is requested in the background while the current one is consumed.
         ---
         Arguments:
             * query: The SOQL query to execute
             * include_deleted: Whether to include deleted records in the query
             * kwargs: Additional arguments passed to the request supported by httpx request\
                 (e.g., headers, cookies, etc.)
+
+        NOTE: The first page is requested right away, so `total_size` is known before iterating
+        NOTE: The query cache is skipped, the next pages must follow a fresh first page
         """
-        result = self.query(query, include_deleted, **kwargs)
-        while True:
-            yield from result["records"]
-            # If there are more records to retrieve, get the next set
-            if not result["done"] and (next_url := result.get("nextRecordsUrl")):
-                result = self.query_more(
-                    next_url,
-                    identifier_is_url=True,
-                    **kwargs,
+        first = self.query(query, include_deleted, bypass_cache=True, **kwargs)
+        return QueryCursor(self._iter_pages(first, **kwargs), first["totalSize"])
+
+    def _iter_pages(
+        self, result: QueryResult[dict[str, Any]], **kwargs: KwargsAny
+    ) -> Generator[list[dict[str, Any]], None, None]:
+        """Yields the records of `result` and of every page after it, page by page"""
+        # The next page is fetched while the records of the current one are consumed
+        pool = ThreadPoolExecutor(max_workers=1)
+        # Bound once, only the next page URL changes between pages
+        fetch = partial(pool.submit, self.query_more, identifier_is_url=True, **kwargs)
+        try:
+            while True:
+                next_url = None if result["done"] else result.get("nextRecordsUrl")
+                upcoming = fetch(next_url) if next_url else None
+                yield result["records"]
+                if upcoming is None:
+                    return
+                result = upcoming.result()
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def query_stream(
+        self, query: str, include_deleted: bool = False, **kwargs: KwargsAny
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Streaming alternative to `query_all_iter(...)`.
+        Records are decoded as each page is received, so only the current record\
+            and network chunk are held in memory, whatever the page size.
+        ---
+        Arguments:
+            * query: The SOQL query to execute
+            * include_deleted: Whether to include deleted records in the query
+            * kwargs: Additional arguments passed to the request supported by httpx request\
+                (e.g., headers, cookies, etc.)
+        """
+        endpoint = self._data_prefix + ("queryAll" if include_deleted else "query")
+        params: dict[str, Any] | None = {"q": query}
+        while endpoint:
+            page: dict[str, Any] = {}
+            with self._stream_salesforce(
+                "GET", endpoint, "query_stream", params=params, **kwargs
+            ) as response:
+                yield from iter_json_member_array(
+                    response.iter_bytes(),
+                    "records",
+                    page,
+                    self.parse_float,
+                    self.object_pairs_hook,
                 )
+            # The next page URL is absolute, the client base URL already ends in /services/
+            next_url = None if page.get("done", True) else page.get("nextRecordsUrl")
+            endpoint = next_url.removeprefix("/services/") if next_url else ""
+            params = None
 
     def query_all(
-        self, query: str, include_deleted: bool = False, **kwargs: KwargsAny
+        self,
+        query: str,
+        include_deleted: bool = False,
+        bypass_cache: bool = False,
+        fields: Optional[Sequence[str]] = None,
+        **kwargs: KwargsAny,
     ) -> QueryResult[dict[str, Any]]:
         """
         Returns the full set of results for the `query`.
@@ -837,31 +1209,296 @@ class Salesforce(CallableSF):
         Arguments:
             * query: The SOQL query to execute
             * include_deleted: Whether to include deleted records in the query
+            * bypass_cache: Whether to skip the query cache, see `enable_query_cache(...)`
+            * fields: The only fields to select, replacing the SELECT clause of `query`
             * kwargs: Additional arguments passed to the request supported by httpx request\
                 (e.g., headers, cookies, etc.)
 
         NOTE: The `nextRecordsUrl` key is removed from the final result.
         NOTE: The `done` key is set to `True` as the full result set is returned.
-        NOTE: The `totalSize` key is the total number of records returned.
+        NOTE: The `totalSize` key is the one reported by the first page, which\
+            also covers `SELECT COUNT()` queries that return no records.
         """
-        all_records = list(self.query_all_iter(query, include_deleted, **kwargs))
-
-        return {
+        cache = None if bypass_cache or kwargs else self._query_cache
+        key = _query_cache_key("query_all", query, include_deleted, fields)
+        if cache is not None and (cached := cache.get(key)) is not None:
+            return cached
+
+        # The assembled result is cached below, a cached first page may be staler than it
+        first = self.query(
+            query, include_deleted, bypass_cache=True, fields=fields, **kwargs
+        )
+        all_records: list[dict[str, Any]] = []
+        for records in self._iter_pages(first, **kwargs):
+            all_records.extend(records)
+        result: QueryResult[dict[str, Any]] = {
             "done": True,
-            "totalSize": len(all_records),
+            "totalSize": first["totalSize"],
             "records": all_records,
         }
+        if cache is not None:
+            cache.put(key, result)
+        return result
+
+    def query_many(
+        self,
+        queries: Iterable[str],
+        include_deleted: bool = False,
+        **kwargs: KwargsAny,
+    ) -> list[QueryResult[dict[str, Any]]]:
+        """
+        Returns the first page of results of several independent SOQL queries.
+        The queries are sent `COMPOSITE_BATCH_LIMIT` at a time through the composite batch API,\
+            so each group costs a single round-trip.
+        ---
+        Arguments:
+            * queries: The SOQL queries to execute
+            * include_deleted: Whether to include deleted records in the queries
+            * kwargs: Additional arguments passed to the request supported by httpx request\
+                (e.g., headers, cookies, etc.)
+
+        NOTE: The results are returned in the same order as `queries`,\
+            use `query_more(...)` with their `nextRecordsUrl` for the following pages
+        NOTE: The first failed query raises the error that `query(...)` would have raised
+        """
+        endpoint = f"v{self.sf_version}/{'queryAll' if include_deleted else 'query'}?"
+        urls = (endpoint + urlencode({"q": query}) for query in queries)
+        return self._get_batch(urls, "query_many", **kwargs)
+
+    def get_many_by_custom_id(
+        self,
+        sobject: str,
+        custom_id_field: str,
+        custom_ids: Iterable[str],
+        **kwargs: KwargsAny,
+    ) -> list[dict[str, Any]]:
+        """
+        Returns several records of the same object by an external id.
+        The records are requested `COMPOSITE_BATCH_LIMIT` at a time through the composite batch API,\
+            so each group costs a single round-trip.
+        ---
+        Arguments:
+            * sobject: The object name (e.g., "Account")
+            * custom_id_field: The external id field the records are matched by
+            * custom_ids: The external ids of the records
+            * kwargs: Additional arguments passed to the request supported by httpx request\
+                (e.g., headers, cookies, etc.)
+
+        NOTE: The records are returned in the same order as `custom_ids`
+        NOTE: The first record that is not found raises `SalesforceResourceNotFound`
+        """
+        endpoint = f"v{self.sf_version}/sobjects/{sobject}/{custom_id_field}/"
+        urls = (endpoint + quote(custom_id, safe="") for custom_id in custom_ids)
+        return self._get_batch(urls, "get_many_by_custom_id", **kwargs)
+
+    def _get_batch(
+        self, urls: Iterable[str], name: str, **kwargs: KwargsAny
+    ) -> list[Any]:
+        """GETs `urls` `COMPOSITE_BATCH_LIMIT` at a time through the composite batch API.
+        The results are returned in the same order, the first failed one raises its error.
+        """
+        results: list[Any] = []
+        for chunk in chunked(urls, COMPOSITE_BATCH_LIMIT):
+            batch = {
+                "batchRequests": [{"method": "GET", "url": url} for url in chunk],
+                "haltOnError": False,
+            }
+            response = cast(
+                dict[str, Any],
+                self.restful(
+                    path="composite/batch",
+                    method="POST",
+                    content=json_dumps(batch),
+                    name=name,
+                    **kwargs,
+                ),
+            )
+            for url, subresult in zip(chunk, response["results"]):
+                status = subresult["statusCode"]
+                if status >= 300:
+                    raise _exc_map(status)(
+                        url, status, name, json_dumps(subresult["result"])
+                    )
+                results.append(subresult["result"])
+        return results
+
+    def _save_many(
+        self,
+        method: URLMethod,
+        path: str,
+        sobject: str,
+        records: Iterable[Mapping[str, Any]],
+        all_or_none: bool,
+        name: str,
+        **kwargs: KwargsAny,
+    ) -> list[dict[str, Any]]:
+        """Sends `records` `COLLECTION_LIMIT` at a time to an sObject Collections endpoint"""
+        attributes = {"type": sobject}
+        results: list[dict[str, Any]] = []
+        for chunk in chunked(records, COLLECTION_LIMIT):
+            body = {
+                "allOrNone": all_or_none,
+                "records": [{"attributes": attributes, **record} for record in chunk],
+            }
+            results.extend(
+                cast(
+                    list[dict[str, Any]],
+                    self.restful(
+                        path=path,
+                        method=method,
+                        content=json_dumps(body),
+                        name=name,
+                        **kwargs,
+                    ),
+                )
+            )
+        return results
+
+    def create_many(
+        self,
+        sobject: str,
+        records: Iterable[Mapping[str, Any]],
+        all_or_none: bool = False,
+        **kwargs: KwargsAny,
+    ) -> list[dict[str, Any]]:
+        """
+        Creates several records of the same object.
+        The records are sent `COLLECTION_LIMIT` at a time through the sObject Collections API,\
+            so each group costs a single round-trip.
+        ---
+        Arguments:
+            * sobject: The object name (e.g., "Account")
+            * records: The fields of each record to create
+            * all_or_none: Whether a failed record rolls back its whole group
+            * kwargs: Additional arguments passed to the request supported by httpx request\
+                (e.g., headers, cookies, etc.)
+
+        NOTE: The results are returned in the same order as `records`,\
+            each one holds the `id`, `success` and `errors` of its record
+        """
+        return self._save_many(
+            "POST", "composite/sobjects", sobject, records, all_or_none, "create_many", **kwargs
+        )  # fmt:skip
+
+    def update_many(
+        self,
+        sobject: str,
+        records: Iterable[Mapping[str, Any]],
+        all_or_none: bool = False,
+        **kwargs: KwargsAny,
+    ) -> list[dict[str, Any]]:
+        """
+        Updates several records of the same object, see `create_many(...)`
+        ---
+        Arguments:
+            * sobject: The object name (e.g., "Account")
+            * records: The fields to update of each record, including its `Id`
+            * all_or_none: Whether a failed record rolls back its whole group
+            * kwargs: Additional arguments passed to the request supported by httpx request\
+                (e.g., headers, cookies, etc.)
+        """
+        return self._save_many(
+            "PATCH", "composite/sobjects", sobject, records, all_or_none, "update_many", **kwargs
+        )  # fmt:skip
+
+    def upsert_many(
+        self,
+        sobject: str,
+        external_id_field: str,
+        records: Iterable[Mapping[str, Any]],
+        all_or_none: bool = False,
+        **kwargs: KwargsAny,
+    ) -> list[dict[str, Any]]:
+        """
+        Upserts several records of the same object by an external id, see `create_many(...)`
+        ---
+        Arguments:
+            * sobject: The object name (e.g., "Account")
+            * external_id_field: The external id field the records are matched by
+            * records: The fields of each record, including its `external_id_field`
+            * all_or_none: Whether a failed record rolls back its whole group
+            * kwargs: Additional arguments passed to the request supported by httpx request\
+                (e.g., headers, cookies, etc.)
+        """
+        path = f"composite/sobjects/{sobject}/{external_id_field}"
+        return self._save_many(
+            "PATCH", path, sobject, records, all_or_none, "upsert_many", **kwargs
+        )
+
+    def delete_many(
+        self,
+        ids: Iterable[str],
+        all_or_none: bool = False,
+        **kwargs: KwargsAny,
+    ) -> list[dict[str, Any]]:
+        """
+        Deletes several records, of any object, `COLLECTION_LIMIT` at a time
+        ---
+        Arguments:
+            * ids: The ids of the records to delete
+            * all_or_none: Whether a failed record rolls back its whole group
+            * kwargs: Additional arguments passed to the request supported by httpx request\
+                (e.g., headers, cookies, etc.)
+
+        NOTE: The results are returned in the same order as `ids`
+        """
+        results: list[dict[str, Any]] = []
+        for chunk in chunked(ids, COLLECTION_LIMIT):
+            params = {"ids": ",".join(chunk), "allOrNone": str(all_or_none).lower()}
+            results.extend(
+                cast(
+                    list[dict[str, Any]],
+                    self.restful(
+                        path="composite/sobjects",
+                        method="DELETE",
+                        params=params,
+                        name="delete_many",
+                        **kwargs,
+                    ),
+                )
+            )
+        return results
+
+    def enable_query_cache(self, ttl: float = 60.0, maxsize: int = 128) -> None:
+        """
+        Cache the results of `query(...)` and `query_all(...)` in memory
+        ---
+        Arguments:
+            * ttl: The number of seconds a result is reused for
+            * maxsize: The maximum number of results kept, least recently used first out
+
+        NOTE: Queries are matched ignoring whitespace, but not case, as string literals are\
+            case sensitive. Any request other than a GET empties the cache, except the\
+            read-only composite batches of `query_many(...)` and `get_many_by_custom_id(...)`.
+        NOTE: Bulk and Bulk 2.0 writes through `bulk`/`bulk2` empty the cache when their\
+            data is submitted and, if awaited, once the job completes. Queries run while\
+            a job is still processing may cache its partial results, use `bypass_cache`.
+        NOTE: Cached results are shared, copy them before any change
+        """
+        self._query_cache = _QueryCache(ttl, maxsize)
+
+    def disable_query_cache(self) -> None:
+        """Stop caching query results and drop the cached ones"""
+        self._query_cache = None
+
+    def _invalidate_query_cache(self) -> None:
+        """Drop the cached query results, any write may change them"""
+        if self._query_cache is not None:
+            self._query_cache.clear()
 
     def is_sandbox(self) -> Literal[True, False, None]:
-        """After connection returns is the organization in a sandbox"""
-        is_sandbox = None
-        if self.session_id:
-            is_sandbox = (
+        """
+        After connection returns is the organization in a sandbox
+
+        NOTE: The organization is queried once, the answer is kept by the instance
+        """
+        if self._is_sandbox is None and self.session_id:
+            self._is_sandbox = (
                 self.query_all("SELECT IsSandbox FROM Organization LIMIT 1")
                 .get("records", [{"IsSandbox": None}])[0]
                 .get("IsSandbox")
             )
-        return is_sandbox
+        return self._is_sandbox
 
     def set_password(self, user: str, password: str):
         """
@@ -871,7 +1508,7 @@ class Salesforce(CallableSF):
         return self.restful(
             path=f"sobjects/User/{user}/password",
             method="POST",
-            data=json.dumps(dict(NewPassword=password)),
+            content=json_dumps({"NewPassword": password}),
             name="set_password",
         )
 
@@ -936,33 +1573,49 @@ class Salesforce(CallableSF):
         for the REST API.
         """
 
-    def __getattr__(self, name: str) -> Any | BulkSFHandler | Bulk2SFHandler | CompositeSFHandler | TypeSF:  # fmt:skip
+    def __getattr__(self, name: str) -> BulkSFHandler | Bulk2SFHandler | CompositeSFHandler | TypeSF:  # fmt:skip
         """
         Returns the appropriate handler for the given attribute.
+        Handlers are built once per session and reused on later lookups.
 
         Arguments:
             * name: The name of the attribute to retrieve
 
         Returns:
-            * Any: If the attribute starts with '__'
             * BulkSFHandler: If the attribute is 'bulk'
             * Bulk2SFHandler: If the attribute is 'bulk2'
             * CompositeSFHandler: If the attribute is 'composite'
             * TypeSF: If the attribute is a Salesforce object type
+
+        Raises:
+            * AttributeError: If the attribute starts with '_'
         """
-        if name.startswith("__"):
-            return_: Any = super().__getattr__(name)  # pyright: ignore[reportAttributeAccessIssue,reportUnknownMemberType]
-        elif name == "bulk":
+        if name.startswith("_"):
+            # Private and dunder lookups (copy, pickle, ...) are never SObjects
+            raise AttributeError(name)
+
+        if (return_ := self._handlers.get(name)) is not None:
+            return return_
+        with self._session_lock:
+            return self._handlers.get(name) or self._build_handler(name)
+
+    def _build_handler(
+        self, name: str
+    ) -> BulkSFHandler | Bulk2SFHandler | CompositeSFHandler | TypeSF:
+        """Builds and keeps the handler of `name`, called with the session lock held"""
+        if name == "bulk":
             # Deal with bulk API functions
             return_ = BulkSFHandler(
                 session_id=self.session_id,
                 bulk_url=f"https://{self.sf_instance}/services/async/{self.sf_version}/",
+                on_write=self._invalidate_query_cache,
             )
         elif name == "bulk2":
             # Deal with bulk v2 API functions
             return_ = Bulk2SFHandler(
                 session_id=self.session_id,
                 bulk2_url=f"https://{self.sf_instance}/services/data/v{self.sf_version}/jobs/",
+                on_write=self._invalidate_query_cache,
             )
         elif name == "composite":
             # Deal with composite API functions
@@ -976,4 +1629,5 @@ class Salesforce(CallableSF):
                 session_id=self.session_id,
                 object_url=f"https://{self.sf_instance}/services/data/v{self.sf_version}/sobjects/{name}/",
             )
+        self._handlers[name] = return_
         return return_
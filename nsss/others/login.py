@@ -2,23 +2,82 @@ import base64
 import html
 import json
 import logging
+from collections import OrderedDict
 from datetime import UTC, datetime, timedelta
+from functools import lru_cache
+from hashlib import blake2b
 from pathlib import Path
+from threading import Lock
 from typing import Any, Literal, Optional, cast
 
 import httpx
 import jwt
+from cryptography.hazmat.primitives.asymmetric.types import PrivateKeyTypes
+from cryptography.hazmat.primitives.serialization import load_pem_private_key
 
 from nsss.__version__ import DEFAULT_CLIENT_ID_PREFIX
 from nsss.utils import (
     Proxies,
     SalesforceAuthenticationFailed,
-    fetch_unique_xml_element_value,
+    fetch_xml_element_values,
     to_mount,
 )
+from nsss.utils.base import DEFAULT_LIMITS, DEFAULT_TIMEOUT
 
 logger = logging.getLogger(__name__)
 
+# Shared by the logins made without a session, one per proxy configuration
+_LOGIN_CLIENTS: dict[tuple[tuple[str, str], ...], httpx.Client] = {}
+_LOGIN_CLIENTS_LOCK = Lock()
+# JWT bearer signing keys, least recently used first
+_SIGNING_KEYS: OrderedDict[bytes, PrivateKeyTypes] = OrderedDict()
+_SIGNING_KEYS_LOCK = Lock()
+_SIGNING_KEYS_SIZE = 8
+
+
+@lru_cache(maxsize=32)
+def _basic_auth(consumer_key: str, consumer_secret: str) -> str:
+    """Basic Authorization header value of a connected app"""
+    credentials = base64.b64encode(f"{consumer_key}:{consumer_secret}".encode())
+    return f"Basic {credentials.decode()}"
+
+
+def _signing_key(pem: bytes) -> PrivateKeyTypes:
+    """Loaded private key of `pem`, parsing an RSA key costs milliseconds per login.
+    Keyed by digest so the PEM itself is not kept in memory.
+    """
+    digest = blake2b(pem).digest()
+    with _SIGNING_KEYS_LOCK:
+        key = _SIGNING_KEYS.get(digest)
+        if key is not None:
+            _SIGNING_KEYS.move_to_end(digest)
+            return key
+    key = load_pem_private_key(pem, password=None)
+    with _SIGNING_KEYS_LOCK:
+        _SIGNING_KEYS[digest] = key
+        if len(_SIGNING_KEYS) > _SIGNING_KEYS_SIZE:
+            _SIGNING_KEYS.popitem(last=False)
+    return key
+
+
+def _login_client(proxies: Optional[Proxies]) -> httpx.Client:
+    """Pooled client for logins, kept open so repeated logins reuse its connections"""
+    key = tuple(sorted(proxies.items())) if proxies else ()
+    with _LOGIN_CLIENTS_LOCK:
+        client = _LOGIN_CLIENTS.get(key)
+        if client is None:
+            client = _LOGIN_CLIENTS[key] = httpx.Client(
+                http2=True,
+                limits=DEFAULT_LIMITS,
+                timeout=DEFAULT_TIMEOUT,
+                mounts=(
+                    to_mount(proxies, http2=True, limits=DEFAULT_LIMITS)
+                    if proxies
+                    else None
+                ),
+            )
+        return client
+
 
 def SalesforceLogin(**kwargs: Any) -> tuple[str, str]:  # NOSONAR
     """
@@ -73,9 +132,6 @@ def SalesforceLogin(**kwargs: Any) -> tuple[str, str]:  # NOSONAR
         else DEFAULT_CLIENT_ID_PREFIX
     )
 
-    username = html.escape(username) if username else None
-    password = html.escape(password) if password else None
-
     if security_token:
         # Security Token Soap request body
         login_soap_request_body = f"""<?xml version="1.0" encoding="utf-8" ?>
@@ -92,8 +148,8 @@ def SalesforceLogin(**kwargs: Any) -> tuple[str, str]:  # NOSONAR
     </env:Header>
     <env:Body>
         <n1:login xmlns:n1="urn:partner.soap.sforce.com">
-            <n1:username>{username}</n1:username>
-            <n1:password>{password}{security_token}</n1:password>
+            <n1:username>{html.escape(username or "")}</n1:username>
+            <n1:password>{html.escape(password or "")}{security_token}</n1:password>
         </n1:login>
     </env:Body>
 </env:Envelope>"""
@@ -114,8 +170,8 @@ def SalesforceLogin(**kwargs: Any) -> tuple[str, str]:  # NOSONAR
     </soapenv:Header>
     <soapenv:Body>
         <urn:login>
-            <urn:username>{username}</urn:username>
-            <urn:password>{password}</urn:password>
+            <urn:username>{html.escape(username or "")}</urn:username>
+            <urn:password>{html.escape(password or "")}</urn:password>
         </urn:login>
     </soapenv:Body>
 </soapenv:Envelope>"""
@@ -126,8 +182,8 @@ def SalesforceLogin(**kwargs: Any) -> tuple[str, str]:  # NOSONAR
                 "grant_type": "client_credentials",
                 "client_id": consumer_key,
                 "client_secret": consumer_secret,
-                "username": html.unescape(username),
-                "password": html.unescape(password) if password else None,
+                "username": username,
+                "password": password,
             },
             domain,
             consumer_key,
@@ -149,8 +205,8 @@ def SalesforceLogin(**kwargs: Any) -> tuple[str, str]:  # NOSONAR
     </soapenv:Header>
     <soapenv:Body>
         <urn:login>
-            <urn:username>{username}</urn:username>
-            <urn:password>{password}</urn:password>
+            <urn:username>{html.escape(username or "")}</urn:username>
+            <urn:password>{html.escape(password or "")}</urn:password>
         </urn:login>
     </soapenv:Body>
 </soapenv:Envelope>"""
@@ -159,11 +215,11 @@ def SalesforceLogin(**kwargs: Any) -> tuple[str, str]:  # NOSONAR
         expiration = datetime.now(UTC) + timedelta(minutes=3)
         payload = {
             "iss": consumer_key,
-            "sub": html.unescape(username),
+            "sub": username,
             "aud": f"https://{domain}.salesforce.com",
             "exp": f"{expiration.timestamp():.0f}",
         }
-        key = (
+        key = _signing_key(
             Path(privatekey_file).read_bytes()
             if privatekey_file
             else cast(str, privatekey).encode("utf-8")
@@ -182,10 +238,7 @@ def SalesforceLogin(**kwargs: Any) -> tuple[str, str]:  # NOSONAR
             session,
         )
     elif consumer_key and consumer_secret and domain not in ("login", "test", None):
-        authorization = base64.b64encode(
-            f"{consumer_key}:{consumer_secret}".encode()
-        ).decode()
-        headers = {"Authorization": f"Basic {authorization}"}
+        headers = {"Authorization": _basic_auth(consumer_key, consumer_secret)}
         return token_login(
             f"https://{domain}.salesforce.com/services/oauth2/token",
             {"grant_type": "client_credentials"},
@@ -227,10 +280,8 @@ def token_login(
     session: Optional[httpx.Client] = None,
 ) -> tuple[str, str]:
     """Process OAuth 2.0 JWT Bearer Token Flow."""
-    with session or httpx.Client(
-        headers=headers, mounts=to_mount(proxies) if proxies else None
-    ) as client:
-        response = client.post(token_url, data=token_data)
+    client = session or _login_client(proxies)
+    response = client.post(token_url, data=token_data, headers=headers)
 
     json_response: dict[str, str]
     try:
@@ -279,40 +330,33 @@ def soap_login(
         * session: An existing httpx.Client instance to use for requests.\
                 This enables the use of httpx features not otherwise exposed by the library.
     """
-    with session or httpx.Client(
-        mounts=to_mount(proxies) if proxies else None
-    ) as client:
-        response = client.post(
-            soap_url,
-            data=json.loads(request_body),
-            headers=login_soap_request_headers,
-        )
+    client = session or _login_client(proxies)
+    response = client.post(
+        soap_url,
+        content=request_body.encode("utf-8"),
+        headers=login_soap_request_headers,
+    )
 
     try:
-        response.raise_for_status()
-    except httpx.HTTPStatusError:
-        except_code = (
-            fetch_unique_xml_element_value(response.content, "sf:exceptionCode")
-            or response.status_code
+        session_id, server_url, except_code, except_message = fetch_xml_element_values(
+            response.content,
+            "sessionId",
+            "serverUrl",
+            "sf:exceptionCode",
+            "sf:exceptionMessage",
         )
-        except_message = (
-            fetch_unique_xml_element_value(response.content, "sf:exceptionMessage")
-            or response.text
+    except ValueError:  # Not XML, e.g. a proxy or gateway error page
+        session_id = server_url = except_code = except_message = None
+
+    if response.is_error:
+        raise SalesforceAuthenticationFailed(
+            except_code or response.status_code, except_message or response.text
         )
-        raise SalesforceAuthenticationFailed(except_code, except_message)
 
-    if (
-        (session_id := fetch_unique_xml_element_value(response.content, "sessionId"))
-    and (server_url := fetch_unique_xml_element_value(response.content, "serverUrl"))
-    ):  # fmt:skip
+    if session_id and server_url:
         return session_id, server_url.split("/")[2].replace("-api", "")
 
-    except_code = (
-        fetch_unique_xml_element_value(response.content, "sf:exceptionCode")
-        or "UNKNOWN_EXCEPTION_CODE"
-    )
-    except_message = (
-        fetch_unique_xml_element_value(response.content, "sf:exceptionMessage")
-        or "UNKNOWN_EXCEPTION_MESSAGE"
+    raise SalesforceAuthenticationFailed(
+        except_code or "UNKNOWN_EXCEPTION_CODE",
+        except_message or "UNKNOWN_EXCEPTION_MESSAGE",
     )
-    raise SalesforceAuthenticationFailed(except_code, except_message)
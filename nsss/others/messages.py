@@ -1,5 +1,42 @@
 """Salesforce API message templates"""
 
+from collections.abc import Callable
+from functools import lru_cache
+from string import Formatter
+from typing import Any
+
+
+def _compile(template: str, **fixed: Any) -> Callable[..., str]:
+    """Split a ``str.format`` template once into literal segments and field names.
+
+    The returned callable renders the same output as ``template.format(**kwargs)``
+    without re-parsing the format string on every call.
+    The fields given in ``fixed`` are rendered into the literal segments right away.
+    """
+    parts: list[tuple[str, str | None]] = []
+    pending = ""
+    for literal, field, _, _ in Formatter().parse(template):
+        pending += literal
+        if field is not None and field in fixed:
+            pending += str(fixed[field])
+        elif field is not None or pending:
+            parts.append((pending, field))
+            pending = ""
+    if pending:
+        parts.append((pending, None))
+
+    def render(**kwargs: Any) -> str:
+        out: list[str] = []
+        append = out.append
+        for literal, field in parts:
+            append(literal)
+            if field is not None:
+                append(str(kwargs[field]))
+        return "".join(out)
+
+    return render
+
+
 DEPLOY_MSG = """<soapenv:Envelope
         xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/"
         xmlns:met="http://soap.sforce.com/2006/04/metadata">
@@ -89,3 +126,16 @@ xmlns:met="http://soap.sforce.com/2006/04/metadata">
       </met:checkRetrieveStatus>
    </soapenv:Body>
 </soapenv:Envelope>"""
+
+DEPLOY_MSG_FMT = _compile(DEPLOY_MSG)
+CHECK_DEPLOY_STATUS_MSG_FMT = _compile(CHECK_DEPLOY_STATUS_MSG)
+RETRIEVE_MSG_FMT = _compile(RETRIEVE_MSG)
+CHECK_RETRIEVE_STATUS_MSG_FMT = _compile(CHECK_RETRIEVE_STATUS_MSG)
+
+
+@lru_cache(maxsize=8)
+def check_deploy_status_msg_fmt(client: str) -> Callable[..., str]:
+    """`CHECK_DEPLOY_STATUS_MSG_FMT` with `client` and the details flag pre-rendered,
+    only the ``sessionId`` and ``asyncProcessId`` that change between polls are left
+    """
+    return _compile(CHECK_DEPLOY_STATUS_MSG, client=client, includeDetails="true")
@@ -1,8 +1,11 @@
-from base64 import b64decode, b64encode
-from collections.abc import Mapping
+import mmap
+import os
+from collections.abc import Callable, Mapping
+from functools import cache
 from pathlib import Path
+from types import MappingProxyType
 from typing import IO, Any, Optional, cast
-from xml.etree.ElementTree import XML as fromstring, Element, tostring
+from xml.sax.saxutils import escape
 
 import httpx
 from zeep import Client, Settings
@@ -10,17 +13,156 @@ from zeep.proxy import ServiceProxy
 from zeep.xsd import AnySimpleType, ComplexType, CompoundValue
 
 from nsss.others.messages import (
-    CHECK_DEPLOY_STATUS_MSG,
-    CHECK_RETRIEVE_STATUS_MSG,
-    DEPLOY_MSG,
-    RETRIEVE_MSG,
+    CHECK_RETRIEVE_STATUS_MSG_FMT,
+    DEPLOY_MSG_FMT,
+    RETRIEVE_MSG_FMT,
+    check_deploy_status_msg_fmt,
 )
 from nsss.utils import CallableSF, KwargsAny
+from nsss.utils.base import DEFAULT_TIMEOUT
+
+try:
+    # SIMD base64, the deploy and retrieve zips are the largest payloads
+    from pybase64 import b64decode, b64encode
+except ImportError:  # pragma: no cover - optional speedup
+    from base64 import b64decode, b64encode
+
+try:
+    from lxml.etree import XPath, _Element as Element, fromstring, tostring
+except ImportError:  # pragma: no cover - lxml normally comes with zeep
+    from xml.etree.ElementTree import XML as fromstring, Element, tostring  # type: ignore[assignment]
+
+    XPath = None
 
 TEXTXML = "text/xml"
-MTSTATUS = "mt:status"
-MTFILENAME = "mt:fileName"
-MTPROBLEM = "mt:problem"
+DEFAULT_METADATA_POOL_SIZE = 100
+# Status polls are seconds apart, connections are kept alive in between
+METADATA_KEEPALIVE_EXPIRY = 60.0
+_XML_NAMESPACES = {
+    "soapenv": "http://schemas.xmlsoap.org/soap/envelope/",
+    "mt": "http://soap.sforce.com/2006/04/metadata",
+}
+
+
+def _clark(path: str) -> str:
+    """`path` with its prefixes spelled out in Clark notation, `mt:id` -> `{...}id`"""
+    steps = (step.partition(":") for step in path.split("/"))
+    return "/".join(
+        f"{{{_XML_NAMESPACES[prefix]}}}{name}" if colon else prefix
+        for prefix, colon, name in steps
+    )
+
+
+def _find_all(path: str) -> Callable[[Element], list[Element]]:
+    """`element.findall(path)`, compiled once into an XPath when lxml is installed"""
+    if XPath is None:
+        # Expanded once, ElementTree would resolve the prefixes on every call
+        clark_path = _clark(path)
+        return lambda element: element.findall(clark_path)
+    return XPath(path, namespaces=_XML_NAMESPACES)  # type: ignore[return-value]
+
+
+def _find(path: str) -> Callable[[Element], Optional[Element]]:
+    """`element.find(path)`, see `_find_all(...)`"""
+    find_all = _find_all(path)
+    return lambda element: next(iter(find_all(element)), None)
+
+
+def _find_text(path: str) -> Callable[[Element], Optional[str]]:
+    """`element.findtext(path)`, see `_find_all(...)`"""
+    find = _find(path)
+
+    def find_text(element: Element) -> Optional[str]:
+        found = find(element)
+        return None if found is None else found.text or ""
+
+    return find_text
+
+
+_DEPLOY_ID = _find_text("soapenv:Body/mt:deployResponse/mt:result/mt:id")
+_DEPLOY_STATE = _find_text("soapenv:Body/mt:deployResponse/mt:result/mt:state")
+_DEPLOY_RESULT = _find("soapenv:Body/mt:checkDeployStatusResponse/mt:result")
+_RETRIEVE_ID = _find_text("soapenv:Body/mt:retrieveResponse/mt:result/mt:id")
+_RETRIEVE_STATE = _find_text("soapenv:Body/mt:retrieveResponse/mt:result/mt:state")
+_RETRIEVE_RESULT = _find("soapenv:Body/mt:checkRetrieveStatusResponse/mt:result")
+
+
+def _local_name(element: Element) -> str:
+    return cast(str, element.tag).rpartition("}")[2]
+
+
+def _child_texts(element: Element) -> dict[str, str]:
+    """Text of the children of `element` by local name, the first one wins as in `findtext`"""
+    texts: dict[str, str] = {}
+    for child in element:
+        texts.setdefault(_local_name(child), child.text or "")
+    return texts
+
+
+_B64_BLOCK_SIZE = 3 * 16384
+
+
+@cache
+def _wsdl_client() -> Client:
+    """zeep client of the bundled metadata WSDL, parsing it is the slowest part of startup"""
+    wsdl_path = Path(__file__).parent / "metadata.wsdl"
+    return Client(
+        wsdl_path.absolute().as_uri(),
+        settings=Settings(strict=False, xsd_ignore_sequence_order=True),  # pyright: ignore[reportCallIssue]
+    )
+
+
+def _b64encode_stream(file: IO[bytes]) -> str:
+    """Base64 of `file`, read block by block"""
+    encoded = bytearray()
+    pending = b""
+    while block := file.read(_B64_BLOCK_SIZE):
+        # Only whole 3 byte groups are encoded, so no padding lands mid-stream,
+        # even when a raw stream returns a short read
+        block = pending + block
+        cut = len(block) - len(block) % 3
+        encoded += b64encode(block[:cut])
+        pending = block[cut:]
+    encoded += b64encode(pending)
+    return encoded.decode("ascii")
+
+
+def _b64decode_to(text: str, sink: IO[bytes]) -> None:
+    """Decodes the base64 `text` into `sink` block by block"""
+    step = _B64_BLOCK_SIZE // 3 * 4
+    pending = ""
+    for start in range(0, len(text), step):
+        # Whitespace is dropped and only whole 4 character groups are decoded
+        block = pending + "".join(text[start : start + step].split())
+        cut = len(block) - len(block) % 4
+        sink.write(b64decode(block[:cut]))
+        pending = block[cut:]
+    if pending:
+        sink.write(b64decode(pending))
+
+
+def _read_retrieve_result(
+    result: Element,
+) -> tuple[dict[str, str], list[dict[str, Optional[str]]]]:
+    """Fields and messages of a checkRetrieveStatus result, read in a single pass.
+    Messages are children of the result, older code looked for them under details.
+    """
+    fields: dict[str, str] = {}
+    messages: list[dict[str, Optional[str]]] = []
+    for child in result:
+        match _local_name(child):
+            case "messages":
+                found = [child]
+            case "details":
+                found = [item for item in child if _local_name(item) == "messages"]
+            case name:
+                fields.setdefault(name, child.text or "")
+                continue
+        messages.extend(
+            {"file": message.get("fileName"), "message": message.get("problem")}
+            for message in map(_child_texts, found)
+        )
+    return fields, messages
 
 
 class MetadataType:
@@ -103,21 +245,48 @@ class MetadataType:
 
 class SfdcMetadataApi(CallableSF):
     _METADATA_API_BASE_URI = "/services/Soap/m/{version}"
-    _XML_NAMESPACES = {
-        "soapenv": "http://schemas.xmlsoap.org/soap/envelope/",
-        "mt": "http://soap.sforce.com/2006/04/metadata",
-    }
+    # Read-only, shared by every request, `_merge_headers` copies before merging
+    _HDR_DEPLOY = MappingProxyType({"Content-Type": TEXTXML, "SOAPAction": "deploy"})
+    _HDR_CHECK_DEPLOY = MappingProxyType(
+        {"Content-Type": TEXTXML, "SOAPAction": "checkDeployStatus"}
+    )
+    _HDR_RETRIEVE = MappingProxyType(
+        {"Content-Type": TEXTXML, "SOAPAction": "retrieve"}
+    )
+    _HDR_CHECK_RETRIEVE = MappingProxyType(
+        {"Content-Type": TEXTXML, "SOAPAction": "checkRetrieveStatus"}
+    )
 
     def __init__(
         self,
-        session: httpx.Client,
+        session: Optional[httpx.Client],
         session_id: str,
         instance: str,
         metadata_url: str,
         headers: httpx.Headers,
         api_version: str,
+        pool_size: int = DEFAULT_METADATA_POOL_SIZE,
     ):
-        self.session = session
+        """
+        Arguments:
+            * session: The client to send the SOAP requests with, when None a dedicated\
+                HTTP/2 client is created with a pool of `pool_size` kept-alive connections,\
+                so status polling reuses them instead of opening new ones
+            * pool_size: The connection pool size of the client created without a `session`
+        """
+        self.session = session or httpx.Client(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=pool_size,
+                keepalive_expiry=METADATA_KEEPALIVE_EXPIRY,
+            ),
+            timeout=DEFAULT_TIMEOUT,
+        )
+        # A client passed in belongs to the caller, it is never closed here
+        self._owns_session = session is None
+        # `call_salesforce` sends with `client`
+        self.client = self.session
         self.session.headers.update(headers)
         self.session.base_url = metadata_url
         self._session_id = session_id
@@ -126,24 +295,33 @@ class SfdcMetadataApi(CallableSF):
         self.headers = headers
         self._api_version = api_version
         self._deploy_zip = None
-        wsdl_path = Path(__file__).parent / "metadata.wsdl"
-        self._client = Client(
-            wsdl_path.absolute().as_uri(),
-            settings=Settings(strict=False, xsd_ignore_sequence_order=True),  # pyright: ignore[reportCallIssue]
-        )
+        self._client = _wsdl_client()
         self._service = self._client.create_service(
             "{http://soap.sforce.com/2006/04/metadata}MetadataBinding",
             self.metadata_url,
         )
         self._session_header = cast(CompoundValue, self._client.get_element("ns0:SessionHeader")(sessionId=self._session_id))  # fmt:skip
+        self._types: dict[str, MetadataType] = {}
+
+    def close(self) -> None:
+        """Close the client created by the instance and release its pooled connections"""
+        if self._owns_session:
+            self.session.close()
 
     def __getattr__(self, item: str) -> MetadataType:
-        return MetadataType(
-            item,
-            self._service,
-            self._client.get_type(f"ns0:{item}"),  # type: ignore
-            self._session_header,
-        )
+        if item.startswith("_"):
+            # Private and dunder lookups (copy, pickle, ...) are never metadata types
+            raise AttributeError(item)
+
+        type_ = self._types.get(item)
+        if type_ is None:
+            type_ = self._types[item] = MetadataType(
+                item,
+                self._service,
+                self._client.get_type(f"ns0:{item}"),  # type: ignore
+                self._session_header,
+            )
+        return type_
 
     def describe_metadata(self) -> Any:
         return self._service.describeMetadata(
@@ -189,60 +367,53 @@ class SfdcMetadataApi(CallableSF):
                 for test in attributes["tests"]
             )  # fmt:skip
 
-        request = DEPLOY_MSG.format(**attributes)
-        headers = {"Content-Type": TEXTXML, "SOAPAction": "deploy"}
+        request = DEPLOY_MSG_FMT(**attributes)
         result = self.call_salesforce(
             method="POST",
             endpoint="deployRequest",
             headers=self.headers,
-            additional_headers=headers,
+            additional_headers=self._HDR_DEPLOY,
             data=request,
         )
 
-        async_process_id = fromstring(result.text).findtext(
-            path="soapenv:Body/mt:deployResponse/mt:result/mt:id",
-            namespaces=self._XML_NAMESPACES,
-            default=None,
-        )
-        state = fromstring(result.text).findtext(
-            path="soapenv:Body/mt:deployResponse/mt:result/mt:state",
-            namespaces=self._XML_NAMESPACES,
-            default=None,
-        )
+        root = fromstring(result.content)
+        async_process_id = _DEPLOY_ID(root)
+        state = _DEPLOY_STATE(root)
 
         return async_process_id, state
 
     @staticmethod
     def _read_deploy_zip(zipfile: str | IO[bytes]) -> str:
+        """Base64 of the zip, the raw zip is never held whole.
+        Files are memory mapped, streams are encoded block by block.
+        """
         if hasattr(zipfile, "read") and hasattr(zipfile, "seek"):
             zipfile = cast(IO[bytes], zipfile)
             zipfile.seek(0)
-            raw = zipfile.read()
-        else:
-            zipfile = cast(str, zipfile)
-            raw = Path(zipfile).read_bytes()
-        return b64encode(raw).decode()
+            return _b64encode_stream(zipfile)
+        with Path(cast(str, zipfile)).open("rb") as file:
+            if not os.fstat(file.fileno()).st_size:  # Empty files can not be mapped
+                return ""
+            # Encoded straight from the page cache, without copying the zip into memory
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return b64encode(mapped).decode("ascii")
 
     def _retrieve_deploy_result(self, async_process_id: str, **kwargs: Any) -> Element:
-        attributes: dict[str, Any] = {
-            "client": kwargs.get("client", "simple_salesforce_metahelper"),
-            "sessionId": self._session_id,
-            "asyncProcessId": async_process_id,
-            "includeDetails": "true",
-        }
-        request = CHECK_DEPLOY_STATUS_MSG.format(**attributes)
-        headers = {"Content-type": TEXTXML, "SOAPAction": "checkDeployStatus"}
-
+        # Rendered on every poll, so a refreshed session id is always the one sent.
+        # The rest of the envelope is the same for every poll, so it is rendered once
+        render = check_deploy_status_msg_fmt(
+            kwargs.get("client", "simple_salesforce_metahelper")
+        )
+        request = render(sessionId=self._session_id, asyncProcessId=async_process_id)
         res = self.call_salesforce(
             endpoint=f"deployRequest/{async_process_id}",
             method="POST",
             headers=self.headers,
-            additional_headers=headers,
+            additional_headers=self._HDR_CHECK_DEPLOY,
             data=request,
         )
-        result = fromstring(res.text).find(
-            "soapenv:Body/mt:checkDeployStatusResponse/mt:result", self._XML_NAMESPACES
-        )
+
+        result = _DEPLOY_RESULT(fromstring(res.content))
         assert result is not None, f"Result node could not be found: {res.text}"
 
         return result
@@ -264,65 +435,62 @@ class SfdcMetadataApi(CallableSF):
     ]:
         result = self._retrieve_deploy_result(async_process_id, **kwargs)
 
-        state = result.findtext(MTSTATUS, None, self._XML_NAMESPACES)
-        state_detail = result.findtext("mt:stateDetail", None, self._XML_NAMESPACES)
-
-        deployment_errors = [
-            {
-                "type": failure.findtext(
-                    "mt:componentType", None, self._XML_NAMESPACES
-                ),
-                "file": failure.findtext(MTFILENAME, None, self._XML_NAMESPACES),
-                "status": failure.findtext(
-                    "mt:problemType", None, self._XML_NAMESPACES
-                ),
-                "message": failure.findtext(MTPROBLEM, None, self._XML_NAMESPACES),
-            }
-            for failure in result.findall(
-                "mt:details/mt:componentFailures", self._XML_NAMESPACES
-            )
-        ]
-
-        unit_test_errors = [
-            {
-                "class": failure.findtext("mt:name", None, self._XML_NAMESPACES),
-                "method": failure.findtext("mt:methodName", None, self._XML_NAMESPACES),
-                "message": failure.findtext("mt:message", None, self._XML_NAMESPACES),
-                "stack_trace": failure.findtext(
-                    "mt:stackTrace", None, self._XML_NAMESPACES
-                ),
-            }
-            for failure in result.findall(
-                "mt:details/mt:runTestResult/mt:failures", self._XML_NAMESPACES
-            )
-        ]
+        # A single pass over the result, the failures are listed in its details
+        fields: dict[str, str] = {}
+        deployment_errors: list[dict[str, Optional[str]]] = []
+        unit_test_errors: list[dict[str, Optional[str]]] = []
+        for child in result:
+            name = _local_name(child)
+            if name != "details":
+                fields.setdefault(name, child.text or "")
+                continue
+            for detail in child:
+                match _local_name(detail):
+                    case "componentFailures":
+                        failure = _child_texts(detail)
+                        deployment_errors.append(
+                            {
+                                "type": failure.get("componentType"),
+                                "file": failure.get("fileName"),
+                                "status": failure.get("problemType"),
+                                "message": failure.get("problem"),
+                            }
+                        )
+                    case "runTestResult":
+                        for test in detail:
+                            if _local_name(test) != "failures":
+                                continue
+                            failure = _child_texts(test)
+                            unit_test_errors.append(
+                                {
+                                    "class": failure.get("name"),
+                                    "method": failure.get("methodName"),
+                                    "message": failure.get("message"),
+                                    "stack_trace": failure.get("stackTrace"),
+                                }
+                            )
+                    case _:
+                        pass
 
         deployment_detail: dict[str, Any] = {
-            "total_count": result.findtext(
-                "mt:numberComponentsTotal", None, self._XML_NAMESPACES
-            ),
-            "failed_count": result.findtext(
-                "mt:numberComponentErrors", None, self._XML_NAMESPACES
-            ),
-            "deployed_count": result.findtext(
-                "mt:numberComponentsDeployed", None, self._XML_NAMESPACES
-            ),
+            "total_count": fields.get("numberComponentsTotal"),
+            "failed_count": fields.get("numberComponentErrors"),
+            "deployed_count": fields.get("numberComponentsDeployed"),
             "errors": deployment_errors,
         }
         unit_test_detail: dict[str, Any] = {
-            "total_count": result.findtext(
-                "mt:numberTestsTotal", None, self._XML_NAMESPACES
-            ),
-            "failed_count": result.findtext(
-                "mt:numberTestErrors", None, self._XML_NAMESPACES
-            ),
-            "completed_count": result.findtext(
-                "mt:numberTestsCompleted", None, self._XML_NAMESPACES
-            ),
+            "total_count": fields.get("numberTestsTotal"),
+            "failed_count": fields.get("numberTestErrors"),
+            "completed_count": fields.get("numberTestsCompleted"),
             "errors": unit_test_errors,
         }
 
-        return state, state_detail, deployment_detail, unit_test_detail
+        return (
+            fields.get("status"),
+            fields.get("stateDetail"),
+            deployment_detail,
+            unit_test_detail,
+        )
 
     def download_unit_test_logs(self, async_process_id: str) -> None:
         result = self._retrieve_deploy_result(async_process_id)
@@ -336,10 +504,15 @@ class SfdcMetadataApi(CallableSF):
 
         assert isinstance(single_package, bool), "single_package must be bool"
 
-        unpackaged = "".join(
-            f"<types>{''.join(f'<members>{member}</members>' for member in members)}<name>{metadata_type}</name></types>"
-            for metadata_type, members in kwargs.get("unpackaged", {}).items()
-        )
+        # Built in a single list, names are escaped as they are XML text
+        parts: list[str] = []
+        append = parts.append
+        for metadata_type, members in kwargs.get("unpackaged", {}).items():
+            append("<types>")
+            for member in members:
+                append(f"<members>{escape(member)}</members>")
+            append(f"<name>{escape(metadata_type)}</name></types>")
+        unpackaged = "".join(parts)
 
         attributes: dict[str, Any] = {
             "client": client,
@@ -348,27 +521,18 @@ class SfdcMetadataApi(CallableSF):
             "singlePackage": single_package,
             "unpackaged": unpackaged,
         }
-        request = RETRIEVE_MSG.format(**attributes)
-        headers = {"Content-type": TEXTXML, "SOAPAction": "retrieve"}
-
+        request = RETRIEVE_MSG_FMT(**attributes)
         res = self.call_salesforce(
             endpoint=f"deployRequest/{async_process_id}",
             method="POST",
             headers=self.headers,
-            additional_headers=headers,
+            additional_headers=self._HDR_RETRIEVE,
             data=request,
         )
 
-        async_process_id_ = fromstring(res.text).findtext(
-            "soapenv:Body/mt:retrieveResponse/mt:result/mt:id",
-            None,
-            self._XML_NAMESPACES,
-        )
-        state = fromstring(res.text).findtext(
-            "soapenv:Body/mt:retrieveResponse/mt:result/mt:state",
-            None,
-            self._XML_NAMESPACES,
-        )
+        root = fromstring(res.content)
+        async_process_id_ = _RETRIEVE_ID(root)
+        state = _RETRIEVE_STATE(root)
 
         return async_process_id_, state
 
@@ -381,61 +545,47 @@ class SfdcMetadataApi(CallableSF):
             "asyncProcessId": async_process_id,
             "includeZip": include_zip,
         }
-        request = CHECK_RETRIEVE_STATUS_MSG.format(**attributes)
-        headers = {"Content-type": TEXTXML, "SOAPAction": "checkRetrieveStatus"}
+        request = CHECK_RETRIEVE_STATUS_MSG_FMT(**attributes)
         res = self.call_salesforce(
             endpoint=f"deployRequest/{async_process_id}",
             method="POST",
             headers=self.headers,
-            additional_headers=headers,
+            additional_headers=self._HDR_CHECK_RETRIEVE,
             data=request,
         )
 
-        result = fromstring(res.text).find(
-            "soapenv:Body/mt:checkRetrieveStatusResponse/mt:result",
-            self._XML_NAMESPACES,
-        )
+        result = _RETRIEVE_RESULT(fromstring(res.content))
         assert result is not None, f"Result node could not be found: {res.text}"
 
         return result
 
     def retrieve_zip(
-        self, async_process_id: str, **kwargs: Any
+        self,
+        async_process_id: str,
+        sink: Optional[IO[bytes]] = None,
+        **kwargs: Any,
     ) -> tuple[Optional[str], Optional[str], list[dict[str, Any]], bytes]:
+        """
+        Returns the state, error message, messages and zip of a retrieve.
+        With a `sink`, e.g. an open file, the zip is decoded into it block by block
+        and the returned zip is empty, so the decoded zip is never held in memory.
+        """
         result = self.retrieve_retrieve_result(async_process_id, "true", **kwargs)
-        state = result.findtext(MTSTATUS, None, self._XML_NAMESPACES)
-        error_message = result.findtext("mt:errorMessage", None, self._XML_NAMESPACES)
-
-        messages = [
-            {
-                "file": message.findtext(MTFILENAME, None, self._XML_NAMESPACES),
-                "message": message.findtext(MTPROBLEM, None, self._XML_NAMESPACES),
-            }
-            for message in result.findall(
-                "mt:details/mt:messages", self._XML_NAMESPACES
-            )
-        ]
+        fields, messages = _read_retrieve_result(result)
 
-        zipfile_base64 = result.findtext("mt:zipFile", None, self._XML_NAMESPACES)
-        zipfile = b64decode(zipfile_base64) if zipfile_base64 else b""
+        zipfile_base64 = fields.get("zipFile")
+        zipfile = b""
+        if zipfile_base64 and sink is not None:
+            _b64decode_to(zipfile_base64, sink)
+        elif zipfile_base64:
+            zipfile = b64decode(zipfile_base64)
 
-        return state, error_message, messages, zipfile
+        return fields.get("status"), fields.get("errorMessage"), messages, zipfile
 
     def check_retrieve_status(
         self, async_process_id: str, **kwargs: KwargsAny
     ) -> tuple[Optional[str], Optional[str], list[dict[str, Optional[str]]]]:
         result = self.retrieve_retrieve_result(async_process_id, "false", **kwargs)
-        state = result.findtext(MTSTATUS, None, self._XML_NAMESPACES)
-        error_message = result.findtext("mt:errorMessage", None, self._XML_NAMESPACES)
-
-        messages = [
-            {
-                "file": message.findtext(MTFILENAME, None, self._XML_NAMESPACES),
-                "message": message.findtext(MTPROBLEM, None, self._XML_NAMESPACES),
-            }
-            for message in result.findall(
-                "mt:details/mt:messages", self._XML_NAMESPACES
-            )
-        ]
+        fields, messages = _read_retrieve_result(result)
 
-        return state, error_message, messages
+        return fields.get("status"), fields.get("errorMessage"), messages
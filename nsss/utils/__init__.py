@@ -3,11 +3,17 @@ from .base import (
     ColumnDelimiter,
     JsonType,
     KwargsAny,
+    LazyResponse,
     LineEnding,
     Proxies,
     SFOperation,
     URLMethod,
     fetch_unique_xml_element_value,
+    fetch_xml_element_values,
+    iter_json_array,
+    iter_json_member_array,
+    json_dumps,
+    json_loads,
     list_from_generator,
     to_mount,
     to_url_mount,
@@ -29,11 +35,17 @@ __all__ = [
     "ColumnDelimiter",
     "JsonType",
     "KwargsAny",
+    "LazyResponse",
     "LineEnding",
     "Proxies",
     "SFOperation",
     "URLMethod",
     "fetch_unique_xml_element_value",
+    "fetch_xml_element_values",
+    "iter_json_array",
+    "iter_json_member_array",
+    "json_dumps",
+    "json_loads",
     "list_from_generator",
     "to_mount",
     "to_url_mount",
@@ -1,4 +1,6 @@
 # pyright: reportArgumentType=false
+import codecs
+import json
 from collections.abc import (
     Callable,
     Hashable,
@@ -7,8 +9,11 @@ from collections.abc import (
     Mapping,
     Sequence,
 )
+from contextlib import contextmanager
 from datetime import date as date_, datetime
 from enum import StrEnum
+from itertools import chain
+from math import isfinite
 from numbers import Number
 from typing import Any, Literal, Optional, TypedDict
 from urllib.parse import quote
@@ -19,6 +24,15 @@ from httpx._utils import URLPattern
 
 from .exceptions import exception_handler
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+DEFAULT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+DEFAULT_TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+
 
 class Proxies(TypedDict, total=False):
     http: str
@@ -27,17 +41,27 @@ class Proxies(TypedDict, total=False):
     socks5: str
 
 
-def to_mount(proxies: Proxies) -> dict[str, httpx.HTTPTransport]:
+def to_mount(
+    proxies: Proxies, **transport_options: Any
+) -> dict[str, httpx.HTTPTransport]:
+    """Maps each proxied scheme to the `mounts` pattern httpx expects, e.g. `http://`
+
+    Every call builds new transports, as a client closes its mounted transports with it.
+    httpx does not apply the client settings to mounted transports, pass the ones\
+        to keep as `transport_options` (e.g. `http2`, `limits`, `retries`).
+    """
     return {
-        protocol: httpx.HTTPTransport(proxy=proxy)  # pyright: ignore[reportArgumentType]
+        f"{protocol}://": httpx.HTTPTransport(proxy=proxy, **transport_options)  # pyright: ignore[reportArgumentType]
         for protocol, proxy in proxies.items()
     }
 
 
-def to_url_mount(proxies: Proxies) -> dict[URLPattern, httpx.HTTPTransport]:
+def to_url_mount(
+    proxies: Proxies, **transport_options: Any
+) -> dict[URLPattern, httpx.HTTPTransport]:
     return {
-        URLPattern(protocol): httpx.HTTPTransport(proxy=proxy)
-        for protocol, proxy in proxies.items()
+        URLPattern(pattern): transport
+        for pattern, transport in to_mount(proxies, **transport_options).items()
     }
 
 
@@ -60,11 +84,13 @@ class ColumnDelimiter(StrEnum):
 
 
 class CallableSF:
+    __slots__ = ()
+
     client: httpx.Client
-    parse_float: Optional[Callable[[str], Any]]
-    object_pairs_hook: Callable[
-        [Sequence[tuple[Hashable, Any]]], Mapping[Hashable, Any]
-    ] = dict[Hashable, Any]
+    parse_float: Optional[Callable[[str], Any]] = None
+    object_pairs_hook: Optional[
+        Callable[[Sequence[tuple[Hashable, Any]]], Mapping[Hashable, Any]]
+    ] = None
 
     def call_salesforce(
         self,
@@ -94,9 +120,7 @@ class CallableSF:
             200
         """
 
-        headers = headers or httpx.Headers()
-        headers.update(kwargs.pop("headers", {}))
-        headers.update(kwargs.pop("additional_headers", {}))
+        headers = self._merge_headers(headers, kwargs)
 
         response = self.client.request(method, endpoint, headers=headers, **kwargs)
 
@@ -107,6 +131,374 @@ class CallableSF:
 
         return response
 
+    def call_salesforce_json(
+        self,
+        method: URLMethod,
+        endpoint: str,
+        headers: httpx.Headers | None = None,
+        **kwargs: KwargsAny,
+    ) -> Any:
+        """Same as `call_salesforce(...)`, but returns the decoded JSON body.
+
+        The body is decoded with the instance `parse_float` and `object_pairs_hook`.
+
+        Examples:
+            >>> call_salesforce_json("GET", "job/750x0000000005LAAQ")["state"]
+            'Closed'
+        """
+
+        response = self.call_salesforce(method, endpoint, headers, **kwargs)
+        return json_loads(response.content, self.parse_float, self.object_pairs_hook)
+
+    @contextmanager
+    def stream_salesforce(
+        self,
+        method: URLMethod,
+        endpoint: str,
+        headers: httpx.Headers | None = None,
+        **kwargs: KwargsAny,
+    ) -> Iterator[httpx.Response]:
+        """Streaming variant of `call_salesforce(...)`.
+
+        The response body is not loaded up front, consume it through
+        `response.iter_bytes()` before leaving the context.
+
+        Examples:
+            >>> with stream_salesforce("GET", "https://example.com") as response:
+            ...     for chunk in response.iter_bytes():
+            ...         ...
+        """
+
+        headers = self._merge_headers(headers, kwargs)
+
+        with self.client.stream(
+            method, endpoint, headers=headers, **kwargs
+        ) as response:
+            if not response.is_success:
+                response.read()
+                exception_handler(response)
+            yield response
+
+    @staticmethod
+    def _merge_headers(
+        headers: httpx.Headers | None, kwargs: dict[str, Any]
+    ) -> httpx.Headers | None:
+        extra_headers = kwargs.pop("headers", None)
+        additional_headers = kwargs.pop("additional_headers", None)
+        if not extra_headers and not additional_headers:
+            # httpx merges these into new headers per request, they are never mutated
+            return headers
+        # Copied before merging, callers may pass shared header constants
+        headers = httpx.Headers(headers)
+        headers.update(extra_headers or {})
+        headers.update(additional_headers or {})
+        return headers
+
+
+# Built once, `json.dumps` with any non-default option creates a new encoder per call
+_JSON_ENCODER = json.JSONEncoder(allow_nan=False, separators=(",", ":"))
+
+
+def _check_finite(obj: Any) -> None:
+    """Raises `ValueError` on the first NaN or Infinity found in `obj`, like `allow_nan=False`"""
+    if isinstance(obj, float):
+        if not isfinite(obj):
+            raise ValueError(
+                f"Out of range float values are not JSON compliant: {obj!r}"
+            )
+    elif isinstance(obj, dict):
+        for value in obj.values():
+            _check_finite(value)
+    elif isinstance(obj, (list, tuple)):
+        for value in obj:
+            _check_finite(value)
+
+
+def json_dumps(obj: Any) -> bytes:
+    """Serializes `obj` into a UTF-8 encoded JSON document.
+
+    Uses `orjson` when it is installed, falling back to the standard library.
+    NaN and Infinity raise `ValueError` on both paths, rather than blanking fields as `null`.
+    """
+    if orjson is not None:
+        content = orjson.dumps(obj)
+        # orjson writes non-finite floats as null, only documents holding one need the walk
+        if b"null" in content:
+            _check_finite(obj)
+        return content
+    return _JSON_ENCODER.encode(obj).encode()
+
+
+def json_loads(
+    content: str | bytes,
+    parse_float: Optional[Callable[[str], Any]] = None,
+    object_pairs_hook: Optional[
+        Callable[[Sequence[tuple[Hashable, Any]]], Mapping[Hashable, Any]]
+    ] = None,
+) -> Any:
+    """Deserializes a JSON document.
+
+    `orjson` is only used when no custom hook is given, as it cannot honour them.
+    The `dict` and `float` defaults are treated as no hook, keeping the fast scanners.
+
+    Parameters:
+        content (str | bytes): The JSON document, usually `response.content`.
+        parse_float (Callable): Function to parse float values with.
+        object_pairs_hook (Callable): Function to parse ordered list of pairs with.
+
+    Examples:
+        >>> json_loads(b'{"id": "750x0000000005LAAQ"}')
+        {'id': '750x0000000005LAAQ'}
+    """
+    if object_pairs_hook is dict:
+        object_pairs_hook = None
+    if parse_float is float:
+        parse_float = None
+    if orjson is not None and parse_float is None and object_pairs_hook is None:
+        return orjson.loads(content)
+    return json.loads(
+        content, parse_float=parse_float, object_pairs_hook=object_pairs_hook
+    )
+
+
+class LazyResponse(Mapping[str, Any]):
+    """Read-only view of a JSON object response, decoded on first access.
+
+    Callers that ignore the response, e.g. when closing a job, never pay for decoding it.
+
+    Examples:
+        >>> job = LazyResponse(b'{"id": "750x0000000005LAAQ", "state": "Open"}')
+        >>> job["id"]
+        '750x0000000005LAAQ'
+    """
+
+    __slots__ = ("content", "parse_float", "object_pairs_hook", "_value")
+
+    _UNSET: Any = object()
+
+    def __init__(
+        self,
+        content: bytes,
+        parse_float: Optional[Callable[[str], Any]] = None,
+        object_pairs_hook: Optional[
+            Callable[[Sequence[tuple[Hashable, Any]]], Mapping[Hashable, Any]]
+        ] = None,
+    ) -> None:
+        self.content = content
+        self.parse_float = parse_float
+        self.object_pairs_hook = object_pairs_hook
+        self._value: Any = LazyResponse._UNSET
+
+    @property
+    def value(self) -> Any:
+        """The decoded document, parsed once and cached."""
+        if self._value is LazyResponse._UNSET:
+            self._value = json_loads(
+                self.content, self.parse_float, self.object_pairs_hook
+            )
+        return self._value
+
+    def __getitem__(self, key: str) -> Any:
+        return self.value[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.value)
+
+    def __len__(self) -> int:
+        return len(self.value)
+
+    def __repr__(self) -> str:
+        if self._value is LazyResponse._UNSET:
+            return f"{type(self).__name__}(<{len(self.content)} bytes>)"
+        return f"{type(self).__name__}({self._value!r})"
+
+
+def iter_json_array(
+    chunks: Iterable[bytes],
+    parse_float: Optional[Callable[[str], Any]] = None,
+    object_pairs_hook: Optional[
+        Callable[[Sequence[tuple[Hashable, Any]]], Mapping[Hashable, Any]]
+    ] = None,
+) -> Iterator[Any]:
+    """Incrementally decodes the items of a top-level JSON array.
+
+    Only the item being decoded and the current chunk are held in memory,
+    which keeps large result sets from being materialized all at once.
+
+    Parameters:
+        chunks (Iterable[bytes]): The raw document, e.g. `response.iter_bytes()`.
+        parse_float (Callable): Function to parse float values with.
+        object_pairs_hook (Callable): Function to parse ordered list of pairs with.
+
+    Raises:
+        ValueError: If the document is not a well-formed JSON array.
+
+    Examples:
+        >>> list(iter_json_array([b'[{"Id": 1}, {"I', b'd": 2}]']))
+        [{'Id': 1}, {'Id': 2}]
+    """
+    decoder = json.JSONDecoder(
+        parse_float=None if parse_float is float else parse_float,
+        object_pairs_hook=None if object_pairs_hook is dict else object_pairs_hook,
+    )
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    started = closed = False
+
+    def drain(final: bool) -> Iterator[Any]:
+        nonlocal buffer, started, closed
+        pos = 0
+        size = len(buffer)
+        while True:
+            while pos < size and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos == size:
+                break
+            if not started:
+                if buffer[pos] != "[":
+                    raise ValueError("Expected a JSON array")
+                started = True
+                pos += 1
+                continue
+            if buffer[pos] == "]":
+                closed = True
+                return
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if final:
+                    raise
+                break
+            # A number may continue in the next chunk
+            if end == size and not final:
+                break
+            yield item
+            pos = end
+        buffer = buffer[pos:]
+
+    for chunk in chunks:
+        buffer += text_decoder.decode(chunk)
+        yield from drain(False)
+        if closed:
+            return
+    buffer += text_decoder.decode(b"", final=True)
+    yield from drain(True)
+    if not closed:
+        raise ValueError("Unterminated JSON array")
+
+
+def iter_json_member_array(
+    chunks: Iterable[bytes],
+    member: str,
+    others: Optional[dict[str, Any]] = None,
+    parse_float: Optional[Callable[[str], Any]] = None,
+    object_pairs_hook: Optional[
+        Callable[[Sequence[tuple[Hashable, Any]]], Mapping[Hashable, Any]]
+    ] = None,
+) -> Iterator[Any]:
+    """Incrementally decodes the items of an array member of a top-level JSON object.
+
+    Same as `iter_json_array(...)` for e.g. the `records` of a query result,
+    the other members are decoded whole into `others` as they are reached.
+
+    Parameters:
+        chunks (Iterable[bytes]): The raw document, e.g. `response.iter_bytes()`.
+        member (str): The name of the array member whose items are yielded.
+        others (dict): Filled with the other members of the object.
+        parse_float (Callable): Function to parse float values with.
+        object_pairs_hook (Callable): Function to parse ordered list of pairs with.
+
+    Raises:
+        ValueError: If the document is not a well-formed JSON object.
+
+    Examples:
+        >>> page = {}
+        >>> list(
+        ...     iter_json_member_array(
+        ...         [b'{"done": true, "records": [{"Id": 1}, {"I', b'd": 2}]}'],
+        ...         "records",
+        ...         page,
+        ...     )
+        ... )
+        [{'Id': 1}, {'Id': 2}]
+        >>> page
+        {'done': True}
+    """
+    decoder = json.JSONDecoder(
+        parse_float=None if parse_float is float else parse_float,
+        object_pairs_hook=None if object_pairs_hook is dict else object_pairs_hook,
+    )
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    # "start" before the object, then "key", "colon" and "value" for each member,
+    # "items" within the `member` array and "end" once the object is closed
+    state = "start"
+    key = ""
+
+    def drain(final: bool) -> Iterator[Any]:
+        nonlocal buffer, state, key
+        pos = 0
+        size = len(buffer)
+        while True:
+            while pos < size and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos == size:
+                break
+            char = buffer[pos]
+            if state == "start":
+                if char != "{":
+                    raise ValueError("Expected a JSON object")
+                state = "key"
+                pos += 1
+                continue
+            if state == "colon":
+                if char != ":":
+                    raise ValueError(f"Expected ':' after {key!r}")
+                state = "value"
+                pos += 1
+                continue
+            if state == "key" and char == "}":
+                state = "end"
+                return
+            if state == "value" and key == member and char == "[":
+                state = "items"
+                pos += 1
+                continue
+            if state == "items" and char == "]":
+                state = "key"
+                pos += 1
+                continue
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if final:
+                    raise
+                break
+            # A number may continue in the next chunk
+            if end == size and not final:
+                break
+            pos = end
+            if state == "items":
+                yield value
+            elif state == "key":
+                key = value
+                state = "colon"
+            else:
+                if others is not None:
+                    others[key] = value
+                state = "key"
+        buffer = buffer[pos:]
+
+    for chunk in chunks:
+        buffer += text_decoder.decode(chunk)
+        yield from drain(False)
+        if state == "end":
+            return
+    buffer += text_decoder.decode(b"", final=True)
+    yield from drain(True)
+    if state != "end":
+        raise ValueError("Unterminated JSON object")
+
 
 def fetch_unique_xml_element_value(
     xml_string: str | bytes, element_name: str
@@ -139,15 +531,44 @@ def fetch_unique_xml_element_value(
         >>> fetch_unique_xml_element_value("<foo><bar>baz</bar></foo>", "nonexistent")
         None
     """
+    return fetch_xml_element_values(xml_string, element_name)[0]
+
+
+def fetch_xml_element_values(
+    xml_string: str | bytes, *element_names: str
+) -> tuple[Optional[str], ...]:
+    """
+    Extracts the text content of several XML elements with a single parse.
+
+    Elements are matched on their local name, so namespaced SOAP payloads
+    (``sf:exceptionCode``, default ``xmlns``) resolve anywhere in the document.
+
+    Parameters:
+        xml_string (str | bytes): The XML content as a string or bytes.
+        *element_names (str): The names of the elements whose values are to be extracted.
+
+    Returns:
+        tuple[Optional[str], ...]: The text of the first match for each name, in order,
+            with None where there is no match.
+
+    Raises:
+        ValueError: If the XML string cannot be parsed.
+    """
     try:
         # Parse the XML safely using ElementTree
         root = fromstring(xml_string)
     except Exception as e:
         raise ValueError(f"Failed to parse XML: {e}")
 
-    # Find the first matching element
-    element = root.find(element_name)
-    return element.text if element is not None else None
+    wanted = {name.rpartition(":")[2]: i for i, name in enumerate(element_names)}
+    values: list[Optional[str]] = [None] * len(element_names)
+    for element in root.iter():
+        index = wanted.pop(element.tag.rpartition("}")[2], None)
+        if index is not None:
+            values[index] = element.text
+            if not wanted:
+                break
+    return tuple(values)
 
 
 def date_to_iso8601(date: date_ | datetime) -> str:
@@ -158,11 +579,11 @@ def date_to_iso8601(date: date_ | datetime) -> str:
     return quote(iso_string, safe="")
 
 
-def list_from_generator[T](generator_function: Iterator[Iterator[T]]) -> list[T]:
+def list_from_generator[T](generator_function: Iterable[Iterable[T]]) -> list[T]:
     """Flattens a nested iterable into a single list.
 
     Parameters:
-        generator_function (Iterator[Iterator[T]]): A generator or iterable of iterables.
+        generator_function (Iterable[Iterable[T]]): A generator or iterable of iterables.
 
     Returns:
         list[T]: A flattened list containing all items from the nested iterables.
@@ -172,4 +593,4 @@ def list_from_generator[T](generator_function: Iterator[Iterator[T]]) -> list[T]
         >>> list_from_generator(gen)
         [1, 2, 3, 4, 5]
     """
-    return [item for sublist in generator_function for item in sublist]
+    return list(chain.from_iterable(generator_function))
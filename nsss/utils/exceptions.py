@@ -125,25 +125,23 @@ class SalesforceBulkV2ExtractError(SalesforceOperationError):
     """Error occurred during bulk 2.0 extract"""
 
 
+_EXC_MAP: dict[int, type[SalesforceError]] = {
+    HTTP_300_MULTIPLE_CHOICES: SalesforceMoreThanOneRecord,
+    HTTP_400_BAD_REQUEST: SalesforceMalformedRequest,
+    HTTP_401_UNAUTHORIZED: SalesforceExpiredSession,
+    HTTP_403_FORBIDDEN: SalesforceRefusedRequest,
+    HTTP_404_NOT_FOUND: SalesforceResourceNotFound,
+}
+
+
 def _exc_map(status_code: int) -> type[SalesforceError]:
-    exc_map: dict[int, type[SalesforceError]] = {
-        HTTP_300_MULTIPLE_CHOICES: SalesforceMoreThanOneRecord,
-        HTTP_400_BAD_REQUEST: SalesforceMalformedRequest,
-        HTTP_401_UNAUTHORIZED: SalesforceExpiredSession,
-        HTTP_403_FORBIDDEN: SalesforceRefusedRequest,
-        HTTP_404_NOT_FOUND: SalesforceResourceNotFound,
-    }
-    return exc_map.get(status_code, SalesforceGeneralError)
+    return _EXC_MAP.get(status_code, SalesforceGeneralError)
 
 
 def exception_handler(result: Response, name: str = "") -> NoReturn:
     """Exception router. Determines which error to raise for bad results"""
 
-    try:
-        response_content = str(result.json()).encode()
-    except ValueError:
-        response_content = result.text.encode()
-
+    # The body as received, decoding it only to re-encode it would be wasted on errors
     exc_cls = _exc_map(result.status_code)
 
-    raise exc_cls(str(result.url), result.status_code, name, response_content)
+    raise exc_cls(str(result.url), result.status_code, name, result.content)
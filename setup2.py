@@ -28,6 +28,12 @@ setup(
         "starlette",
     ],
     extras_require={
+        "speedups": [
+            "orjson",
+            "pyarrow",
+            "pybase64",
+            "lxml",
+        ],
         "dev": [
             "pytest",
             "pytest-asyncio",
@@ -0,0 +1,58 @@
+from collections.abc import Callable
+
+import httpx
+import pytest
+
+from nsss.api.core import Salesforce
+
+INSTANCE_URL = "https://example.my.salesforce.com/services/"
+LOGIN_RESPONSE = (
+    '<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/">'
+    "<soapenv:Body><loginResponse><result>"
+    "<serverUrl>https://example-api.my.salesforce.com/services/Soap/u/59.0</serverUrl>"
+    "<sessionId>{session_id}</sessionId>"
+    "</result></loginResponse></soapenv:Body></soapenv:Envelope>"
+)
+
+Handler = Callable[[httpx.Request], httpx.Response]
+
+
+@pytest.fixture
+def sent() -> list[httpx.Request]:
+    return []
+
+
+@pytest.fixture
+def logins() -> list[httpx.Request]:
+    return []
+
+
+@pytest.fixture
+def make_salesforce(
+    sent: list[httpx.Request], logins: list[httpx.Request]
+) -> Callable[[Handler], Salesforce]:
+    """Builds a `Salesforce` logged in through a mocked SOAP login.
+    The n-th login returns the session id "SESSION<n>" and is recorded in `logins`.
+    Every other request is recorded in `sent` and answered by the given handler.
+    """
+
+    def make(handler: Handler) -> Salesforce:
+        def route(request: httpx.Request) -> httpx.Response:
+            if request.url.path.startswith("/services/Soap/u/"):
+                logins.append(request)
+                content = LOGIN_RESPONSE.format(session_id=f"SESSION{len(logins)}")
+                return httpx.Response(200, text=content)
+            sent.append(request)
+            return handler(request)
+
+        client = httpx.Client(
+            transport=httpx.MockTransport(route), base_url=INSTANCE_URL
+        )
+        return Salesforce(
+            username="user@example.com",
+            password="password",
+            security_token="token",
+            session=client,
+        )
+
+    return make
@@ -0,0 +1,48 @@
+import json
+
+import httpx
+import pytest
+
+from nsss.api.bulk import BulkSFType
+
+
+@pytest.fixture
+def bulk_type(sent: list[httpx.Request]) -> BulkSFType:
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(request)
+        return httpx.Response(200, json={"id": "750x0000000005LAAQ", "state": "Open"})
+
+    client = httpx.Client(
+        transport=httpx.MockTransport(handler),
+        base_url="https://example.my.salesforce.com/services/async/59.0/",
+    )
+    return BulkSFType(client, object_name="Account")
+
+
+@pytest.mark.parametrize(
+    ("use_serial", "concurrency_mode"), [(True, "Serial"), (False, "Parallel")]
+)
+def test_create_job_concurrency_mode(
+    bulk_type: BulkSFType,
+    sent: list[httpx.Request],
+    use_serial: bool,
+    concurrency_mode: str,
+) -> None:
+    job = bulk_type._create_job("insert", use_serial=use_serial)
+
+    assert job["id"] == "750x0000000005LAAQ"
+    assert sent[0].url.path.endswith("/job")
+    assert json.loads(sent[0].content) == {
+        "operation": "insert",
+        "object": "Account",
+        "concurrencyMode": concurrency_mode,
+        "contentType": "JSON",
+    }
+
+
+def test_create_upsert_job_external_id(
+    bulk_type: BulkSFType, sent: list[httpx.Request]
+) -> None:
+    bulk_type._create_job("upsert", use_serial=False, external_id_field="Ext__c")
+
+    assert json.loads(sent[0].content)["externalIdFieldName"] == "Ext__c"
@@ -0,0 +1,353 @@
+import gzip
+from collections import Counter
+from collections.abc import Callable
+from itertools import count
+
+import httpx
+import pytest
+
+from nsss.api import bulk2
+from nsss.api.bulk2 import (
+    Bulk2SFHandler,
+    Bulk2SFType,
+    _env_seconds,
+    _iter_record_ends,
+    _retry,
+)
+from nsss.utils.exceptions import (
+    SalesforceGeneralError,
+    SalesforceMalformedRequest,
+    SalesforceOperationError,
+)
+
+
+BULK2_URL = "https://example.my.salesforce.com/services/data/v59.0/jobs/"
+
+Handler = Callable[[httpx.Request], httpx.Response]
+
+
+@pytest.fixture
+def make_handler(sent: list[httpx.Request]) -> Callable[[Handler], Bulk2SFHandler]:
+    """Builds a `Bulk2SFHandler` whose requests are recorded in `sent`"""
+
+    def make(handler: Handler) -> Bulk2SFHandler:
+        def record(request: httpx.Request) -> httpx.Response:
+            sent.append(request)
+            return handler(request)
+
+        client = httpx.Client(transport=httpx.MockTransport(record), base_url=BULK2_URL)
+        return Bulk2SFHandler("SID", BULK2_URL, session=client)
+
+    return make
+
+
+class TestIterRecordEnds:
+    def test_unquoted(self) -> None:
+        buffer = b"h\na,b\nc,d\n"
+        assert list(_iter_record_ends(buffer, 2)) == [6, 10]
+
+    def test_unterminated_last_record(self) -> None:
+        buffer = b"h\na,b\nc,d"
+        assert list(_iter_record_ends(buffer, 2)) == [6, 9]
+
+    def test_newline_within_quotes(self) -> None:
+        buffer = b'h\na,"x\ny"\nb,c\n'
+        assert list(_iter_record_ends(buffer, 2)) == [10, 14]
+
+    def test_escaped_quotes(self) -> None:
+        buffer = b'h\nb,"q""\n"""\nc'
+        assert list(_iter_record_ends(buffer, 2)) == [13, 14]
+
+
+class TestSplitCsv:
+    def test_max_records(self) -> None:
+        records = 'h\na,"x\ny"\nb,c\nd,e\n'
+        assert list(Bulk2SFType._split_csv(records=records, max_records=2)) == [
+            (2, b'h\na,"x\ny"\nb,c\n'),
+            (1, b"h\nd,e\n"),
+        ]
+
+    def test_header_only(self) -> None:
+        assert list(Bulk2SFType._split_csv(records="h\n")) == []
+
+    def test_requires_data(self) -> None:
+        with pytest.raises(ValueError):
+            list(Bulk2SFType._split_csv())
+
+
+class TestSplitRecords:
+    def test_max_records(self) -> None:
+        records = [{"Name": str(i)} for i in range(5)]
+        chunks = list(Bulk2SFType._split_records(records, max_records=2))
+
+        assert [total for total, _ in chunks] == [2, 2, 1]
+        assert chunks[0][1] == "Name\n0\n1\n"
+
+    def test_halves_chunks_over_the_size_limit(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        # Leaves 100 bytes per chunk
+        monkeypatch.setattr(bulk2, "MAX_INGEST_JOB_FILE_SIZE", 1024 * 1024 + 100)
+        records = [{"Name": f"{i:020}"} for i in range(16)]
+        chunks = list(Bulk2SFType._split_records(records))
+
+        assert sum(total for total, _ in chunks) == len(records)
+        assert all(len(data.encode()) <= 100 for _, data in chunks)
+        names = [line for _, data in chunks for line in data.splitlines()[1:]]
+        assert names == [record["Name"] for record in records]
+
+    def test_requires_records(self) -> None:
+        with pytest.raises(ValueError):
+            list(Bulk2SFType._split_records([]))
+
+
+class TestCountCsv:
+    def test_data(self) -> None:
+        assert Bulk2SFType._count_csv(data="h\na\nb\n", skip_header=True) == 2
+
+    def test_file_without_trailing_newline(self, tmp_path) -> None:
+        path = tmp_path / "data.csv"
+        path.write_bytes(b"h\r\na\r\nb")
+        assert Bulk2SFType._count_csv(filename=str(path)) == 3
+
+
+class TestRetry:
+    @pytest.fixture(autouse=True)
+    def no_sleep(self, monkeypatch: pytest.MonkeyPatch) -> list[float]:
+        delays: list[float] = []
+        monkeypatch.setattr(bulk2, "sleep", delays.append)
+        return delays
+
+    @staticmethod
+    def _failing(errors: list[Exception]):
+        def fn() -> str:
+            if errors:
+                raise errors.pop(0)
+            return "ok"
+
+        return fn
+
+    def test_retries_rate_limited(self, no_sleep: list[float]) -> None:
+        errors: list[Exception] = [
+            SalesforceGeneralError("job", 429, "", b""),
+            SalesforceGeneralError("job", 403, "", b"REQUEST_LIMIT_EXCEEDED"),
+        ]
+        assert _retry(self._failing(errors), base=1.0) == "ok"
+        assert no_sleep == [1.0, 2.0]
+
+    def test_raises_other_errors(self, no_sleep: list[float]) -> None:
+        errors: list[Exception] = [SalesforceMalformedRequest("job", 400, "", b"")]
+        with pytest.raises(SalesforceMalformedRequest):
+            _retry(self._failing(errors))
+        assert no_sleep == []
+
+    def test_raises_last_rate_limited(self, no_sleep: list[float]) -> None:
+        errors: list[Exception] = [
+            SalesforceGeneralError("job", 429, "", b"") for _ in range(3)
+        ]
+        with pytest.raises(SalesforceGeneralError):
+            _retry(self._failing(errors), max_attempts=3)
+        assert len(no_sleep) == 2
+
+
+class TestUploadJobData:
+    @staticmethod
+    def _uploads(refuse_gzip: bool) -> Handler:
+        def handler(request: httpx.Request) -> httpx.Response:
+            encoded = request.headers.get("Content-Encoding") == "gzip"
+            if encoded and refuse_gzip:
+                return httpx.Response(415, text="Unsupported Media Type")
+            body = gzip.decompress(request.content) if encoded else request.content
+            assert body == b"Id\n1\n"
+            return httpx.Response(201)
+
+        return handler
+
+    def test_compressed(self, make_handler, sent: list[httpx.Request]) -> None:
+        make_handler(self._uploads(False)).Account.upload_job_data("750x", "Id\n1\n")
+
+        assert sent[0].method == "PUT"
+        assert sent[0].url.path.endswith("/jobs/ingest/750x/batches")
+        assert sent[0].headers["Content-Encoding"] == "gzip"
+
+    def test_falls_back_once_refused(
+        self, make_handler, sent: list[httpx.Request]
+    ) -> None:
+        handler = make_handler(self._uploads(True))
+        handler.Account.upload_job_data("750x", "Id\n1\n")
+        handler.Contact.upload_job_data("750y", "Id\n1\n")
+
+        encodings = [request.headers.get("Content-Encoding") for request in sent]
+        assert encodings == ["gzip", None, None]
+
+    def test_refusal_is_kept_per_handler(
+        self, make_handler, sent: list[httpx.Request]
+    ) -> None:
+        make_handler(self._uploads(True)).Account.upload_job_data("750x", "Id\n1\n")
+        make_handler(self._uploads(False)).Account.upload_job_data("750y", "Id\n1\n")
+
+        assert sent[-1].headers["Content-Encoding"] == "gzip"
+
+
+class TestDownload:
+    @pytest.fixture(autouse=True)
+    def no_sleep(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(bulk2, "sleep", lambda _: None)
+
+    @staticmethod
+    def _query_job(pages: dict[str, httpx.Response]) -> Handler:
+        """Answers a query job whose result pages are keyed by their locator"""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.method == "POST":
+                return httpx.Response(
+                    200, json={"id": "750q", "state": "UploadComplete"}
+                )
+            if request.url.path.endswith("/results"):
+                return pages[request.url.params.get("locator", "")]
+            return httpx.Response(200, json={"id": "750q", "state": "JobComplete"})
+
+        return handler
+
+    def test_pages_are_written_to_files(self, make_handler, tmp_path) -> None:
+        pages = {
+            "": httpx.Response(
+                200,
+                content=b"Id\n1\n2\n",
+                headers={"Sforce-Locator": "MTAw", "Sforce-NumberOfRecords": "2"},
+            ),
+            "MTAw": httpx.Response(
+                200,
+                content=b"Id\n3\x00\n",
+                headers={"Sforce-Locator": "null", "Sforce-NumberOfRecords": "1"},
+            ),
+        }
+        handler = make_handler(self._query_job(pages))
+        results = handler.Account.download(
+            query="SELECT Id FROM Account", path=str(tmp_path), max_records=2
+        )
+
+        assert [result["number_of_records"] for result in results] == [2, 1]
+        assert [result["locator"] for result in results] == ["MTAw", ""]
+        assert (tmp_path / "750q_0.csv").read_bytes() == b"Id\n1\n2\n"
+        assert (tmp_path / "750q_1.csv").read_bytes() == b"Id\n3\n"
+
+    def test_missing_record_count(self, make_handler, tmp_path) -> None:
+        pages = {"": httpx.Response(200, content=b"Id\n")}
+        handler = make_handler(self._query_job(pages))
+        results = handler.Account.download(
+            query="SELECT Id FROM Account", path=str(tmp_path)
+        )
+
+        assert results == [
+            {
+                "locator": "",
+                "number_of_records": 0,
+                "file": str(tmp_path / "750q_0.csv"),
+            }
+        ]
+
+    def test_failed_page_raises(self, make_handler, tmp_path) -> None:
+        pages = {"": httpx.Response(400, json=[{"errorCode": "INVALIDJOB"}])}
+        handler = make_handler(self._query_job(pages))
+
+        with pytest.raises(SalesforceMalformedRequest):
+            handler.Account.download(query="SELECT Id FROM Account", path=str(tmp_path))
+
+
+def _ingest_jobs(states: dict[str, list[str]]) -> Handler:
+    """Answers ingest jobs "750x0", "750x1"..., each polled through its `states`"""
+    ids = count()
+    polls: Counter[str] = Counter()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "POST":
+            return httpx.Response(200, json={"id": f"750x{next(ids)}", "state": "Open"})
+        if request.method == "PUT":
+            return httpx.Response(201)
+        if request.method == "PATCH":
+            return httpx.Response(200, json={"state": "UploadComplete"})
+        job_id = request.url.path.rsplit("/", 1)[-1]
+        job_states = states.get(job_id, ["JobComplete"])
+        state = job_states[min(polls[job_id], len(job_states) - 1)]
+        polls[job_id] += 1
+        return httpx.Response(
+            200,
+            json={
+                "id": job_id,
+                "state": state,
+                "numberRecordsProcessed": 1,
+                "numberRecordsFailed": 0,
+            },
+        )
+
+    return handler
+
+
+class TestJobPoller:
+    @pytest.fixture(autouse=True)
+    def no_sleep(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(bulk2, "sleep", lambda _: None)
+
+    def test_waits_for_every_job(self, make_handler) -> None:
+        states = {
+            "750a": ["InProgress", "InProgress", "JobComplete"],
+            "750b": ["JobComplete"],
+        }
+        sf_type = make_handler(_ingest_jobs(states)).Account
+
+        with bulk2._JobPoller(sf_type, is_query=False) as poller:
+            assert poller.wait("750a")["state"] == "JobComplete"
+            assert poller.wait("750b")["state"] == "JobComplete"
+
+    def test_failed_job_raises(self, make_handler) -> None:
+        sf_type = make_handler(_ingest_jobs({"750a": ["Failed"]})).Account
+
+        with bulk2._JobPoller(sf_type, is_query=False) as poller:
+            with pytest.raises(SalesforceOperationError):
+                poller.wait("750a")
+
+    def test_parallel_uploads_are_awaited(
+        self, make_handler, sent: list[httpx.Request]
+    ) -> None:
+        handler = make_handler(_ingest_jobs({"750x0": ["InProgress", "JobComplete"]}))
+        results = handler.Account.insert(
+            records=[{"Name": "a"}, {"Name": "b"}], batch_size=1, concurrency=2
+        )
+
+        assert sorted(result["job_id"] for result in results) == ["750x0", "750x1"]
+        assert all(result["numberRecordsProcessed"] == 1 for result in results)
+
+    def test_not_started_without_await_completion(
+        self, make_handler, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        def no_poller(*args, **kwargs):
+            raise AssertionError("No job is awaited")
+
+        monkeypatch.setattr(bulk2, "_JobPoller", no_poller)
+        sf_type = make_handler(_ingest_jobs({})).Account
+        results = sf_type.insert(
+            records=[{"Name": "a"}, {"Name": "b"}],
+            batch_size=1,
+            concurrency=2,
+            await_completion=False,
+        )
+
+        assert [result["numberRecordsTotal"] for result in results] == [1, 1]
+
+
+class TestEnvSeconds:
+    def test_unset(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.delenv("SF_BULK2_TIMEOUT", raising=False)
+        assert _env_seconds("SF_BULK2_TIMEOUT", 60) == 60
+
+    def test_parsed(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("SF_BULK2_TIMEOUT", "1.5")
+        assert _env_seconds("SF_BULK2_TIMEOUT", 60) == 1.5
+
+    @pytest.mark.parametrize("value", ["", "2s", "0", "-1", "nan"])
+    def test_malformed_falls_back(
+        self, monkeypatch: pytest.MonkeyPatch, value: str
+    ) -> None:
+        monkeypatch.setenv("SF_BULK2_TIMEOUT", value)
+        assert _env_seconds("SF_BULK2_TIMEOUT", 60) == 60
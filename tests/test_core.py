@@ -0,0 +1,316 @@
+import json
+import logging
+from collections.abc import Callable
+from threading import Barrier
+
+import httpx
+import pytest
+
+from nsss.api import core
+from nsss.api.core import _project, _query_cache_key, _QueryCache
+from nsss.utils.exceptions import (
+    SalesforceMalformedRequest,
+    SalesforceResourceNotFound,
+)
+
+
+def _empty_page(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json={"totalSize": 0, "done": True, "records": []})
+
+
+class TestQueryCache:
+    def test_expires_after_ttl(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        now = [100.0]
+        monkeypatch.setattr(core, "monotonic", lambda: now[0])
+        cache = _QueryCache(ttl=10, maxsize=4)
+        cache.put("a", 1)
+
+        now[0] = 110.0
+        assert cache.get("a") == 1
+        now[0] = 110.1
+        assert cache.get("a") is None
+
+    def test_evicts_least_recently_used(self) -> None:
+        cache = _QueryCache(ttl=60, maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1  # "b" is now the least recently used
+
+        cache.put("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_clear(self) -> None:
+        cache = _QueryCache(ttl=60, maxsize=2)
+        cache.put("a", 1)
+        cache.clear()
+        assert cache.get("a") is None
+
+
+class TestQueryCaching:
+    def test_query_is_cached(self, make_salesforce, sent: list[httpx.Request]) -> None:
+        sf = make_salesforce(_empty_page)
+        sf.enable_query_cache()
+        sf.query("SELECT Id FROM Account")
+        sf.query("SELECT Id FROM Account")
+        assert len(sent) == 1
+
+    def test_query_all_iter_fetches_a_fresh_first_page(
+        self, make_salesforce, sent: list[httpx.Request]
+    ) -> None:
+        sf = make_salesforce(_empty_page)
+        sf.enable_query_cache()
+        sf.query("SELECT Id FROM Account")
+        assert list(sf.query_all_iter("SELECT Id FROM Account")) == []
+        assert len(sent) == 2
+
+
+def test_query_cache_key_ignores_whitespace_only() -> None:
+    key = _query_cache_key("query", "SELECT Id FROM Account", False)
+    assert _query_cache_key("query", " SELECT  Id\nFROM Account ", False) == key
+    assert _query_cache_key("query", "select id from account", False) != key
+    assert _query_cache_key("query", "SELECT Id FROM Account", True) != key
+
+
+class TestProject:
+    def test_replaces_select_clause(self) -> None:
+        projected = _project("SELECT Id, Name FROM Account WHERE Name = 'x'", ["Id"])
+        assert projected.split() == "SELECT Id FROM Account WHERE Name = 'x'".split()
+
+    def test_skips_string_literals(self) -> None:
+        query = "SELECT Id, Name FROM Account WHERE Name = 'a) FROM b, \\' c'"
+        projected = _project(query, ["Id"])
+        assert projected.split() == (
+            "SELECT Id FROM Account WHERE Name = 'a) FROM b, \\' c'".split()
+        )
+
+    def test_skips_subqueries(self) -> None:
+        query = "SELECT Id, (SELECT Id FROM Contacts) FROM Account"
+        projected = _project(query, ["Name", "Industry"])
+        assert projected.split() == "SELECT Name, Industry FROM Account".split()
+
+    def test_rejects_fields_function(self) -> None:
+        with pytest.raises(ValueError):
+            _project("SELECT FIELDS(ALL) FROM Account LIMIT 200", ["Id"])
+
+    def test_rejects_empty_fields(self) -> None:
+        with pytest.raises(ValueError):
+            _project("SELECT Id FROM Account", [])
+
+    def test_rejects_non_select(self) -> None:
+        with pytest.raises(ValueError):
+            _project("FIND {Acme}", ["Id"])
+
+    def test_warns_on_wide_select(self, caplog: pytest.LogCaptureFixture) -> None:
+        fields = [f"Field{i}__c" for i in range(core.WIDE_SELECT_WARNING + 1)]
+        with caplog.at_level(logging.WARNING, logger=core.logger.name):
+            _project("SELECT Id FROM Account", fields)
+        assert "selects" in caplog.text
+
+
+class TestQueryProjection:
+    def test_unprojected_query_is_sent_as_is(
+        self, make_salesforce, sent: list[httpx.Request]
+    ) -> None:
+        sf = make_salesforce(_empty_page)
+        query = "SELECT Id, (SELECT Id FROM Contacts WHERE Name = ':)') FROM Account"
+
+        assert sf.query(query)["done"]
+        assert sent[0].url.params["q"] == query
+
+    def test_unparsed_query_is_sent_as_is(
+        self, make_salesforce, sent: list[httpx.Request]
+    ) -> None:
+        sf = make_salesforce(_empty_page)
+        sf.query("FIND {Acme}")
+        assert sent[0].url.params["q"] == "FIND {Acme}"
+
+    def test_projected_query(self, make_salesforce, sent: list[httpx.Request]) -> None:
+        sf = make_salesforce(_empty_page)
+        sf.query("SELECT Id, Name FROM Account", fields=["Name"])
+        assert sent[0].url.params["q"].split() == "SELECT Name FROM Account".split()
+
+
+class TestSessionRefresh:
+    def test_concurrent_expired_calls_log_in_once(
+        self, make_salesforce, sent: list[httpx.Request], logins: list[httpx.Request]
+    ) -> None:
+        paths = [f"sobjects/Account/001x{i}" for i in range(4)]
+        # Every call is rejected with the first session before any refresh happens
+        rejected = Barrier(len(paths))
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.headers["Authorization"] == "Bearer SESSION1":
+                rejected.wait(timeout=5)
+                return httpx.Response(
+                    401, json=[{"errorCode": "INVALID_SESSION_ID", "message": "x"}]
+                )
+            return httpx.Response(200, json={"Id": request.url.path[-5:]})
+
+        sf = make_salesforce(handler)
+        results = sf.restful_many(paths, concurrency=len(paths))
+
+        assert [result["Id"] for result in results] == [p[-5:] for p in paths]
+        assert len(logins) == 2
+        assert sf.session_id == "SESSION2"
+
+    def test_query_stream_renews_the_session(
+        self, make_salesforce, sent: list[httpx.Request], logins: list[httpx.Request]
+    ) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.headers["Authorization"] == "Bearer SESSION1":
+                return httpx.Response(
+                    401, json=[{"errorCode": "INVALID_SESSION_ID", "message": "x"}]
+                )
+            if "q" in request.url.params:
+                page = {
+                    "done": False,
+                    "nextRecordsUrl": "/services/data/v59.0/query/01gx-1",
+                    "records": [{"Id": "1"}],
+                }
+            else:
+                page = {"done": True, "records": [{"Id": "2"}]}
+            return httpx.Response(
+                200, json=page, headers={"Sforce-Limit-Info": "api-usage=7/15000"}
+            )
+
+        sf = make_salesforce(handler)
+        records = list(sf.query_stream("SELECT Id FROM Account"))
+
+        assert records == [{"Id": "1"}, {"Id": "2"}]
+        assert len(logins) == 2
+        assert sent[-1].url.path == "/services/data/v59.0/query/01gx-1"
+        assert sf.api_usage["api_usage"] == (7, 15000)
+
+
+def _composite_batch(
+    failing: str = "", status: int = 400
+) -> Callable[[httpx.Request], httpx.Response]:
+    """Answers every subrequest of a composite batch with its URL as the result.
+    Subrequests whose URL contains `failing` are answered with `status`.
+    """
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/services/data/v59.0/composite/batch"
+        results = [
+            {"statusCode": status, "result": [{"errorCode": "ERROR"}]}
+            if failing and failing in subrequest["url"]
+            else {"statusCode": 200, "result": {"url": subrequest["url"]}}
+            for subrequest in json.loads(request.content)["batchRequests"]
+        ]
+        return httpx.Response(200, json={"hasErrors": False, "results": results})
+
+    return handler
+
+
+class TestQueryMany:
+    def test_batches_keep_the_query_order(
+        self, make_salesforce, sent: list[httpx.Request]
+    ) -> None:
+        sf = make_salesforce(_composite_batch())
+        queries = [f"SELECT Id FROM Account WHERE Name = '{i}'" for i in range(30)]
+        results = sf.query_many(queries, include_deleted=True)
+
+        assert len(sent) == 2  # COMPOSITE_BATCH_LIMIT subrequests per batch
+        assert [len(json.loads(r.content)["batchRequests"]) for r in sent] == [25, 5]
+        urls = [httpx.URL(result["url"]) for result in results]
+        assert [url.params["q"] for url in urls] == queries
+        assert all(url.path == "v59.0/queryAll" for url in urls)
+
+    def test_keeps_the_query_cache(
+        self, make_salesforce, sent: list[httpx.Request]
+    ) -> None:
+        sf = make_salesforce(_composite_batch())
+        sf.enable_query_cache()
+        sf._query_cache.put("key", {"done": True})
+        sf.query_many(["SELECT Id FROM Account"])
+
+        assert sf._query_cache.get("key") == {"done": True}
+
+    def test_first_failed_query_raises(self, make_salesforce) -> None:
+        sf = make_salesforce(_composite_batch(failing="Contact"))
+
+        with pytest.raises(SalesforceMalformedRequest) as info:
+            sf.query_many(["SELECT Id FROM Account", "SELECT Id FROM Contact"])
+        assert info.value.resource_name == "query_many"
+
+
+class TestGetManyByCustomId:
+    def test_ids_are_quoted(self, make_salesforce) -> None:
+        sf = make_salesforce(_composite_batch())
+        records = sf.get_many_by_custom_id("Account", "Ext__c", ["a/1", "b c"])
+
+        assert [record["url"] for record in records] == [
+            "v59.0/sobjects/Account/Ext__c/a%2F1",
+            "v59.0/sobjects/Account/Ext__c/b%20c",
+        ]
+
+    def test_missing_record_raises(self, make_salesforce) -> None:
+        sf = make_salesforce(_composite_batch(failing="missing", status=404))
+
+        with pytest.raises(SalesforceResourceNotFound):
+            sf.get_many_by_custom_id("Account", "Ext__c", ["found", "missing"])
+
+
+def _collection(request: httpx.Request) -> httpx.Response:
+    """Answers an sObject Collections request with one result per record"""
+    if request.method == "DELETE":
+        ids = request.url.params["ids"].split(",")
+    else:
+        ids = [r.get("Id", "new") for r in json.loads(request.content)["records"]]
+    return httpx.Response(
+        200, json=[{"id": id_, "success": True, "errors": []} for id_ in ids]
+    )
+
+
+class TestCollections:
+    def test_create_many(self, make_salesforce, sent: list[httpx.Request]) -> None:
+        sf = make_salesforce(_collection)
+        results = sf.create_many("Account", [{"Name": str(i)} for i in range(201)])
+
+        assert len(results) == 201
+        assert [r.method for r in sent] == ["POST", "POST"]
+        bodies = [json.loads(r.content) for r in sent]
+        assert [len(body["records"]) for body in bodies] == [200, 1]
+        assert bodies[0]["allOrNone"] is False
+        assert bodies[0]["records"][0] == {
+            "attributes": {"type": "Account"},
+            "Name": "0",
+        }
+
+    def test_update_many(self, make_salesforce, sent: list[httpx.Request]) -> None:
+        sf = make_salesforce(_collection)
+        results = sf.update_many("Account", [{"Id": "001x"}], all_or_none=True)
+
+        assert results[0]["id"] == "001x"
+        assert sent[0].method == "PATCH"
+        assert sent[0].url.path == "/services/data/v59.0/composite/sobjects"
+        assert json.loads(sent[0].content)["allOrNone"] is True
+
+    def test_upsert_many(self, make_salesforce, sent: list[httpx.Request]) -> None:
+        sf = make_salesforce(_collection)
+        sf.upsert_many("Account", "Ext__c", [{"Ext__c": "a"}])
+
+        assert sent[0].method == "PATCH"
+        assert sent[0].url.path == (
+            "/services/data/v59.0/composite/sobjects/Account/Ext__c"
+        )
+
+    def test_delete_many(self, make_salesforce, sent: list[httpx.Request]) -> None:
+        sf = make_salesforce(_collection)
+        ids = [f"001x{i}" for i in range(201)]
+        results = sf.delete_many(ids)
+
+        assert [result["id"] for result in results] == ids
+        assert [r.method for r in sent] == ["DELETE", "DELETE"]
+        assert sent[1].url.params["ids"] == "001x200"
+        assert sent[1].url.params["allOrNone"] == "false"
+
+    def test_writes_empty_the_query_cache(self, make_salesforce) -> None:
+        sf = make_salesforce(_collection)
+        sf.enable_query_cache()
+        sf._query_cache.put("key", {"done": True})
+        sf.create_many("Account", [{"Name": "a"}])
+
+        assert sf._query_cache.get("key") is None
@@ -0,0 +1,55 @@
+import httpx
+import pytest
+
+from nsss.others.login import soap_login
+from nsss.utils import SalesforceAuthenticationFailed
+
+SOAP_URL = "https://login.salesforce.com/services/Soap/u/59.0"
+LOGIN_RESPONSE = (
+    b'<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/">'
+    b"<soapenv:Body><loginResponse><result>"
+    b"<serverUrl>https://example-api.my.salesforce.com/services/Soap/u/59.0</serverUrl>"
+    b"<sessionId>00Dx0000000001!SESSION</sessionId>"
+    b"</result></loginResponse></soapenv:Body></soapenv:Envelope>"
+)
+LOGIN_FAULT = (
+    b'<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/"'
+    b' xmlns:sf="urn:fault.partner.soap.sforce.com"><soapenv:Body><soapenv:Fault>'
+    b"<faultcode>sf:INVALID_LOGIN</faultcode><detail><sf:LoginFault>"
+    b"<sf:exceptionCode>INVALID_LOGIN</sf:exceptionCode>"
+    b"<sf:exceptionMessage>Invalid username</sf:exceptionMessage>"
+    b"</sf:LoginFault></detail></soapenv:Fault></soapenv:Body></soapenv:Envelope>"
+)
+
+
+def _login(response: httpx.Response) -> tuple[str, str]:
+    client = httpx.Client(transport=httpx.MockTransport(lambda request: response))
+    return soap_login(SOAP_URL, "<login/>", {"SOAPAction": "login"}, None, client)
+
+
+def test_success() -> None:
+    assert _login(httpx.Response(200, content=LOGIN_RESPONSE)) == (
+        "00Dx0000000001!SESSION",
+        "example.my.salesforce.com",
+    )
+
+
+def test_login_fault() -> None:
+    with pytest.raises(SalesforceAuthenticationFailed) as info:
+        _login(httpx.Response(500, content=LOGIN_FAULT))
+    assert (info.value.code, info.value.message) == (
+        "INVALID_LOGIN",
+        "Invalid username",
+    )
+
+
+def test_error_page_that_is_not_xml() -> None:
+    with pytest.raises(SalesforceAuthenticationFailed) as info:
+        _login(httpx.Response(502, text="<html>Bad Gateway"))
+    assert (info.value.code, info.value.message) == (502, "<html>Bad Gateway")
+
+
+def test_success_without_session() -> None:
+    with pytest.raises(SalesforceAuthenticationFailed) as info:
+        _login(httpx.Response(200, content=b"<result/>"))
+    assert info.value.code == "UNKNOWN_EXCEPTION_CODE"
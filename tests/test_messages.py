@@ -0,0 +1,24 @@
+from nsss.others import messages
+from nsss.others.messages import _compile, check_deploy_status_msg_fmt
+
+
+def test_compile_matches_format() -> None:
+    fields = {"client": "c", "sessionId": "{s}", "asyncProcessId": "0Af"}
+    fields["includeZip"] = "true"
+    assert _compile(messages.CHECK_RETRIEVE_STATUS_MSG)(**fields) == (
+        messages.CHECK_RETRIEVE_STATUS_MSG.format(**fields)
+    )
+
+
+def test_check_deploy_status_is_pre_rendered() -> None:
+    render = check_deploy_status_msg_fmt("my{client}")
+
+    assert render(sessionId="SID", asyncProcessId="0Af") == (
+        messages.CHECK_DEPLOY_STATUS_MSG.format(
+            client="my{client}",
+            sessionId="SID",
+            asyncProcessId="0Af",
+            includeDetails="true",
+        )
+    )
+    assert check_deploy_status_msg_fmt("my{client}") is render
@@ -0,0 +1,211 @@
+import base64
+import io
+from collections.abc import Callable
+
+import httpx
+import pytest
+
+from nsss.others import metadata
+from nsss.others.metadata import SfdcMetadataApi, _b64decode_to, _b64encode_stream
+
+METADATA_URL = "https://example.my.salesforce.com/services/Soap/m/59.0/"
+ENVELOPE = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/"'
+    ' xmlns="http://soap.sforce.com/2006/04/metadata">'
+    "<soapenv:Body>{body}</soapenv:Body></soapenv:Envelope>"
+)
+
+
+@pytest.fixture
+def sent() -> list[httpx.Request]:
+    return []
+
+
+@pytest.fixture
+def make_mdapi(sent: list[httpx.Request]) -> Callable[[str], SfdcMetadataApi]:
+    """Builds a `SfdcMetadataApi` answering every request with the SOAP `body`"""
+
+    def make(body: str) -> SfdcMetadataApi:
+        def handler(request: httpx.Request) -> httpx.Response:
+            sent.append(request)
+            return httpx.Response(200, text=ENVELOPE.format(body=body))
+
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        return SfdcMetadataApi(
+            client,
+            "SID",
+            "example.my.salesforce.com",
+            METADATA_URL,
+            httpx.Headers({"Authorization": "Bearer SID"}),
+            "59.0",
+        )
+
+    return make
+
+
+class _ShortReads(io.RawIOBase):
+    """Raw stream returning at most `size` bytes per read, as pipes and sockets may"""
+
+    def __init__(self, data: bytes, size: int) -> None:
+        self._data = io.BytesIO(data)
+        self._size = size
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        chunk = self._data.read(min(len(buffer), self._size))
+        buffer[: len(chunk)] = chunk
+        return len(chunk)
+
+
+@pytest.mark.parametrize("length", [0, 1, 2, 3, 4, 100, 3 * 16384 + 1, 100_000])
+def test_b64encode_stream(length: int) -> None:
+    data = (bytes(range(256)) * (length // 256 + 1))[:length]
+    assert _b64encode_stream(io.BytesIO(data)) == base64.b64encode(data).decode()
+
+
+@pytest.mark.parametrize("size", [1, 2, 1000])
+def test_b64encode_stream_short_reads(size: int) -> None:
+    data = bytes(range(256)) * 40
+    encoded = _b64encode_stream(_ShortReads(data, size))
+    assert encoded == base64.b64encode(data).decode()
+
+
+def test_b64encode_stream_small_blocks(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(metadata, "_B64_BLOCK_SIZE", 4)
+    data = b"0123456789"
+    assert _b64encode_stream(io.BytesIO(data)) == base64.b64encode(data).decode()
+
+
+@pytest.mark.parametrize("length", [0, 1, 2, 3, 100, 100_000])
+def test_b64decode_to(length: int) -> None:
+    data = (bytes(range(256)) * (length // 256 + 1))[:length]
+    sink = io.BytesIO()
+    _b64decode_to(base64.b64encode(data).decode(), sink)
+    assert sink.getvalue() == data
+
+
+def test_b64decode_to_skips_whitespace(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(metadata, "_B64_BLOCK_SIZE", 3)
+    data = b"0123456789"
+    encoded = base64.encodebytes(data).decode().replace("M", "M\r\n ")
+    sink = io.BytesIO()
+    _b64decode_to(encoded, sink)
+    assert sink.getvalue() == data
+
+
+class TestCheckDeployStatus:
+    RESULT = (
+        "<checkDeployStatusResponse><result>"
+        "<status>Failed</status><stateDetail>Done</stateDetail>"
+        "<numberComponentsTotal>2</numberComponentsTotal>"
+        "<numberComponentErrors>1</numberComponentErrors>"
+        "<numberComponentsDeployed>1</numberComponentsDeployed>"
+        "<numberTestsTotal>3</numberTestsTotal>"
+        "<numberTestErrors>1</numberTestErrors>"
+        "<numberTestsCompleted>2</numberTestsCompleted>"
+        "<details>"
+        "<componentFailures><componentType>ApexClass</componentType>"
+        "<fileName>classes/A.cls</fileName><problemType>Error</problemType>"
+        "<problem>Unexpected token</problem></componentFailures>"
+        "<componentSuccesses><fileName>classes/B.cls</fileName></componentSuccesses>"
+        "<runTestResult><numFailures>1</numFailures><failures><name>ATest</name>"
+        "<methodName>testA</methodName><message>Assertion failed</message>"
+        "<stackTrace>Class.ATest.testA: line 3</stackTrace></failures>"
+        "</runTestResult>"
+        "</details></result></checkDeployStatusResponse>"
+    )
+
+    def test_single_pass(self, make_mdapi, sent: list[httpx.Request]) -> None:
+        mdapi = make_mdapi(self.RESULT)
+        status, state_detail, deployment, unit_tests = mdapi.check_deploy_status("0Af")
+
+        assert (status, state_detail) == ("Failed", "Done")
+        assert deployment == {
+            "total_count": "2",
+            "failed_count": "1",
+            "deployed_count": "1",
+            "errors": [
+                {
+                    "type": "ApexClass",
+                    "file": "classes/A.cls",
+                    "status": "Error",
+                    "message": "Unexpected token",
+                }
+            ],
+        }
+        assert unit_tests == {
+            "total_count": "3",
+            "failed_count": "1",
+            "completed_count": "2",
+            "errors": [
+                {
+                    "class": "ATest",
+                    "method": "testA",
+                    "message": "Assertion failed",
+                    "stack_trace": "Class.ATest.testA: line 3",
+                }
+            ],
+        }
+        assert sent[0].headers["SOAPAction"] == "checkDeployStatus"
+        assert b"<met:sessionId>SID</met:sessionId>" in sent[0].content
+
+    def test_without_details(self, make_mdapi) -> None:
+        mdapi = make_mdapi(
+            "<checkDeployStatusResponse><result><status>InProgress</status>"
+            "</result></checkDeployStatusResponse>"
+        )
+        status, _, deployment, unit_tests = mdapi.check_deploy_status("0Af")
+
+        assert status == "InProgress"
+        assert deployment["errors"] == unit_tests["errors"] == []
+
+
+def _retrieve_result(zip_file: bytes = b"") -> str:
+    zip_element = f"<zipFile>{base64.b64encode(zip_file).decode()}</zipFile>"
+    return (
+        "<checkRetrieveStatusResponse><result><done>true</done>"
+        "<messages><fileName>a</fileName><problem>Not found</problem></messages>"
+        "<details><messages><fileName>b</fileName><problem>Stale</problem>"
+        "</messages></details>"
+        "<status>Succeeded</status><errorMessage>None</errorMessage>"
+        f"{zip_element if zip_file else ''}"
+        "</result></checkRetrieveStatusResponse>"
+    )
+
+
+class TestRetrieveResult:
+    MESSAGES = [
+        {"file": "a", "message": "Not found"},
+        {"file": "b", "message": "Stale"},
+    ]
+
+    def test_check_retrieve_status(self, make_mdapi, sent: list[httpx.Request]) -> None:
+        mdapi = make_mdapi(_retrieve_result())
+
+        assert mdapi.check_retrieve_status("09S") == (
+            "Succeeded",
+            "None",
+            self.MESSAGES,
+        )
+        assert sent[0].headers["SOAPAction"] == "checkRetrieveStatus"
+        assert b"<met:includeZip>false</met:includeZip>" in sent[0].content
+
+    def test_retrieve_zip(self, make_mdapi) -> None:
+        mdapi = make_mdapi(_retrieve_result(b"PK\x03\x04zip"))
+
+        assert mdapi.retrieve_zip("09S") == (
+            "Succeeded",
+            "None",
+            self.MESSAGES,
+            b"PK\x03\x04zip",
+        )
+
+    def test_retrieve_zip_into_sink(self, make_mdapi) -> None:
+        mdapi = make_mdapi(_retrieve_result(b"PK\x03\x04zip" * 10_000))
+        sink = io.BytesIO()
+
+        assert mdapi.retrieve_zip("09S", sink=sink)[3] == b""
+        assert sink.getvalue() == b"PK\x03\x04zip" * 10_000
@@ -0,0 +1,105 @@
+import pytest
+
+from nsss.utils import (
+    fetch_xml_element_values,
+    iter_json_array,
+    iter_json_member_array,
+    json_dumps,
+)
+from nsss.utils import base
+
+
+def _split(document: bytes, size: int) -> list[bytes]:
+    return [document[i : i + size] for i in range(0, len(document), size)]
+
+
+class TestIterJsonArray:
+    @pytest.mark.parametrize("size", [1, 2, 7, 1024])
+    def test_chunk_borders(self, size: int) -> None:
+        document = '[{"Name": "Ñandú", "n": [1, 2.5]}, "a,]", null, {"x": {"y": []}}]'
+        items = list(iter_json_array(_split(document.encode(), size)))
+        assert items == [
+            {"Name": "Ñandú", "n": [1, 2.5]},
+            "a,]",
+            None,
+            {"x": {"y": []}},
+        ]
+
+    def test_empty(self) -> None:
+        assert list(iter_json_array([b" [ ] "])) == []
+
+    def test_parse_float(self) -> None:
+        assert list(iter_json_array([b"[1.5]"], parse_float=str)) == ["1.5"]
+
+    @pytest.mark.parametrize("document", [b"{}", b"[1,", b'[{"a": 1}'])
+    def test_malformed(self, document: bytes) -> None:
+        with pytest.raises(ValueError):
+            list(iter_json_array([document]))
+
+
+class TestIterJsonMemberArray:
+    @pytest.mark.parametrize("size", [1, 5, 1024])
+    def test_collects_other_members(self, size: int) -> None:
+        document = (
+            b'{"totalSize": 2, "records": [{"Id": "1"}, {"Id": "2"}],'
+            b' "done": false, "nextRecordsUrl": "/q/01g-2"}'
+        )
+        others: dict = {}
+        records = list(
+            iter_json_member_array(_split(document, size), "records", others)
+        )
+
+        assert records == [{"Id": "1"}, {"Id": "2"}]
+        assert others == {"totalSize": 2, "done": False, "nextRecordsUrl": "/q/01g-2"}
+
+    def test_missing_member(self) -> None:
+        others: dict = {}
+        assert (
+            list(iter_json_member_array([b'{"done": true}'], "records", others)) == []
+        )
+        assert others == {"done": True}
+
+    def test_not_an_object(self) -> None:
+        with pytest.raises(ValueError):
+            list(iter_json_member_array([b"[]"], "records"))
+
+
+class TestFetchXmlElementValues:
+    SOAP_FAULT = (
+        b'<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/"'
+        b' xmlns:sf="urn:fault.partner.soap.sforce.com"><soapenv:Body><soapenv:Fault>'
+        b"<faultcode>sf:INVALID_LOGIN</faultcode><detail><sf:LoginFault>"
+        b"<sf:exceptionCode>INVALID_LOGIN</sf:exceptionCode>"
+        b"<sf:exceptionMessage>Invalid username</sf:exceptionMessage>"
+        b"</sf:LoginFault></detail></soapenv:Fault></soapenv:Body></soapenv:Envelope>"
+    )
+
+    def test_matches_local_names(self) -> None:
+        values = fetch_xml_element_values(
+            self.SOAP_FAULT, "sf:exceptionCode", "exceptionMessage", "sessionId"
+        )
+        assert values == ("INVALID_LOGIN", "Invalid username", None)
+
+    def test_first_match_wins(self) -> None:
+        assert fetch_xml_element_values("<a><b>1</b><b>2</b></a>", "b") == ("1",)
+
+    def test_malformed(self) -> None:
+        with pytest.raises(ValueError):
+            fetch_xml_element_values("not xml", "b")
+
+
+class TestJsonDumps:
+    def test_compact(self) -> None:
+        assert json_dumps({"Name": "Ñandú", "Amount__c": None}) == (
+            '{"Name":"Ñandú","Amount__c":null}'.encode()
+        )
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    @pytest.mark.parametrize("value", [float("nan"), float("inf"), float("-inf")])
+    def test_rejects_non_finite_floats(
+        self, monkeypatch: pytest.MonkeyPatch, use_orjson: bool, value: float
+    ) -> None:
+        if not use_orjson:
+            monkeypatch.setattr(base, "orjson", None)
+        with pytest.raises(ValueError):
+            json_dumps([{"Amount__c": value}])